@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Measure cold import time of eeee in fresh interpreters.
+
+Run from repository root::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --limit 50
+
+With ``--limit`` script exits with status 1 when median time of any
+statement exceeds given number of milliseconds, so it can guard CI
+against import time regressions.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+ROUNDS = 20
+
+STATEMENTS = (
+    'pass',
+    'import eeee',
+    'import eeee.event',
+    'from eeee import Event',
+    'from eeee import EventBus, AsyncEmitter',
+)
+
+TIMER = (
+    'import time; start = time.perf_counter(); {}; '
+    'print((time.perf_counter() - start) * 1000)'
+)
+
+
+def measure(statement: str, rounds: int) -> list:
+    """Run statement in fresh interpreters and return times in milliseconds."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        os.environ.get('PYTHONPATH'),
+    ])))
+    return [float(subprocess.check_output([sys.executable, '-c', TIMER.format(statement)],
+                                          env=env))
+            for _ in range(rounds)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rounds', type=int, default=ROUNDS, help='interpreters per statement')
+    parser.add_argument('--limit', type=float, help='maximal median time in milliseconds')
+    args = parser.parse_args()
+
+    slow = []
+    for statement in STATEMENTS:
+        median = statistics.median(measure(statement, args.rounds))
+        print('{:<45} {:7.2f} ms'.format(statement, median))
+        if args.limit is not None and median > args.limit:
+            slow.append(statement)
+    if slow:
+        sys.exit('Import time above {} ms: {}'.format(args.limit, ', '.join(slow)))
+
+
+if __name__ == '__main__':
+    main()
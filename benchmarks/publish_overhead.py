@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Measure per-publish overhead of Event for small fan-outs.
+
+Run from repository root::
+
+    python benchmarks/publish_overhead.py
+"""
+import asyncio
+import time
+
+from eeee import Event
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+ROUNDS = 100000
+
+
+# noinspection PyUnusedLocal
+async def noop_handler(message, publisher, event):
+    return message
+
+
+async def measure(event: Event, rounds: int) -> float:
+    """Publish rounds of messages and return mean time per publish in microseconds."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await event.publish('message', 'bench')
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    for fan_out in (0, 1, 4):
+        event = Event('fan out {}'.format(fan_out))
+        for _ in range(fan_out):
+            event.subscribe()(noop_handler)
+        usec = loop.run_until_complete(measure(event, ROUNDS))
+        print('{:>2} subscribers: {:7.2f} us/publish'.format(fan_out, usec))
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
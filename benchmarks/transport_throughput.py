@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Measure relayed publish throughput between two nodes of single host.
+
+Run from repository root::
+
+    python benchmarks/transport_throughput.py
+    python benchmarks/transport_throughput.py --messages 50000 --pool-size 4
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from eeee import Event
+from eeee.transport import (BrokerServer, LoopbackBroker, LoopbackTransport, Relay,
+                            StreamTransport, Transport)
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+MESSAGES = 20000
+PAYLOAD = 100
+
+
+async def measure(sender: Transport, receiver: Transport, messages: int, payload: int) -> float:
+    """Publish messages on sending node and return messages per second received."""
+    source, target = Event('bench'), Event('bench')
+    sending, receiving = Relay(sender, [source]), Relay(receiver, [target])
+    received = asyncio.Event()
+    counter = {'count': 0}
+
+    # noinspection PyUnusedLocal
+    @target.subscribe()
+    async def count(message, publisher, event):
+        counter['count'] += 1
+        if counter['count'] == messages:
+            received.set()
+
+    await receiving.start()
+    await sending.start()
+    await receiver.flush()
+    await asyncio.sleep(0.05)
+    message = 'x' * payload
+    start = time.perf_counter()
+    for _ in range(messages):
+        await source.publish(message)
+    await received.wait()
+    elapsed = time.perf_counter() - start
+    await sending.close()
+    await receiving.close()
+    return messages / elapsed
+
+
+async def loopback(args) -> float:
+    broker = LoopbackBroker()
+    return await measure(LoopbackTransport(broker), LoopbackTransport(broker),
+                         args.messages, args.payload)
+
+
+async def stream(args, **address) -> float:
+    server = BrokerServer(**address)
+    await server.start()
+    if 'port' in address:
+        address['port'] = server.port
+    rate = await measure(StreamTransport(pool_size=args.pool_size, **address),
+                         StreamTransport(**address), args.messages, args.payload)
+    await server.close()
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--messages', type=int, default=MESSAGES, help='messages per transport')
+    parser.add_argument('--payload', type=int, default=PAYLOAD, help='message size in bytes')
+    parser.add_argument('--pool-size', type=int, default=1, help='connections of sender')
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    with tempfile.TemporaryDirectory() as directory:
+        cases = (
+            ('loopback', loopback(args)),
+            ('tcp', stream(args, host='127.0.0.1', port=0)),
+            ('unix', stream(args, path=os.path.join(directory, 'broker.sock'))),
+        )
+        for name, case in cases:
+            print('{:<10} {:10.0f} messages/s'.format(name, loop.run_until_complete(case)))
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
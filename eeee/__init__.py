@@ -1,9 +1,62 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from eeee.event import Event, Publisher, subscribe
-from cl import Loop
+import importlib
+import sys
 
 __author__ = 'Paweł Zadrożny'
 __copyright__ = 'Copyright (c) 2017, Pawelzny'
 __version__ = '0.1.1'
-__all__ = ['Event', 'Loop', 'Publisher', 'subscribe']
+__all__ = ['AsyncEmitter', 'Coalescer', 'Event', 'EventBus', 'Loop', 'Metrics', 'ProcessBridge',
+           'Publisher', 'PublisherPattern', 'RateLimit', 'Reducer', 'Subscription', 'subscribe']
+
+# Top-level names are imported on first access,
+# so importing eeee does not load submodules nor context-loop.
+_LAZY = {
+    'AsyncEmitter': 'eeee.emitter',
+    'Coalescer': 'eeee.event',
+    'Event': 'eeee.event',
+    'EventBus': 'eeee.bus',
+    'Loop': 'cl',
+    'Metrics': 'eeee.metrics',
+    'ProcessBridge': 'eeee.bridge',
+    'Publisher': 'eeee.event',
+    'PublisherPattern': 'eeee.event',
+    'RateLimit': 'eeee.event',
+    'Reducer': 'eeee.event',
+    'Subscription': 'eeee.event',
+    'subscribe': 'eeee.event',
+}
+
+
+def __getattr__(name: str):
+    """Import top-level name on first access.
+
+    :param name: Attribute name
+    :type name: str
+    :raises AttributeError: Unknown attribute
+    :raises ImportError: Loop accessed without context-loop installed
+    :return: Imported object
+    """
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError("module 'eeee' has no attribute '{}'".format(name))
+    value = globals()[name] = getattr(importlib.import_module(module), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def _import_eagerly():
+    """Import all top-level names, skipping Loop if context-loop is not installed."""
+    for name in _LAZY:
+        try:
+            __getattr__(name)
+        except ImportError:
+            pass
+
+
+if sys.version_info < (3, 7):  # pragma: no cover, module __getattr__ requires PEP 562
+    _import_eagerly()
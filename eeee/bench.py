@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark suite of publish throughput, fan-out scaling and subscription churn.
+
+Run from command line, results are written as JSON so runs can be compared::
+
+    python -m eeee.bench --output before.json
+    python -m eeee.bench --quick --scenario fan_out
+
+Every case reports number of measured operations, operations per second
+and latency percentiles in microseconds. Operation is single publish,
+or subscribe and unsubscribe pair in churn scenario.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+
+import eeee
+from eeee.event import Event, PublisherPattern
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+BUDGET = 200000
+"""Approximate number of handler calls per case."""
+
+MIN_OPERATIONS = 20
+"""Minimal number of measured operations per case."""
+
+PERCENTILES = (50, 90, 99)
+"""Reported latency percentiles."""
+
+MATRIX = {
+    'fan_out': (1, 10, 100, 1000, 10000),
+    'publishers': (1, 10, 100, 1000, 10000),
+    'payload': (0, 100, 1000, 10000),
+    'churn': (10, 100, 1000),
+}
+"""Parameters of every scenario."""
+
+QUICK_MATRIX = {
+    'fan_out': (1, 100),
+    'publishers': (1, 100),
+    'payload': (0, 1000),
+    'churn': (10, 100),
+}
+"""Reduced matrix for smoke runs."""
+
+
+class Handler:
+    """Async handler doing fixed amount of work.
+
+    :param name: Unique subscriber name
+    :type name: str
+    :param cost: Number of loop iterations per call
+    :type cost: int
+    """
+
+    def __init__(self, name: str, cost: int = 0):
+        self.__name__ = name
+        self.cost = cost
+
+    # noinspection PyUnusedLocal
+    async def __call__(self, message, publisher, event):
+        return sum(range(self.cost))
+
+
+async def fan_out(subscribers: int, budget: int = BUDGET) -> dict:
+    """Publish to growing number of subscribers.
+
+    :param subscribers: Number of subscribers
+    :type subscribers: int
+    :param budget: Approximate number of handler calls
+    :type budget: int
+    :return: Case result
+    :rtype: dict
+    """
+    event = _event(subscribers)
+    latencies = await _publish(event, [None], _operations(budget, subscribers))
+    return _result('fan_out', {'subscribers': subscribers}, latencies)
+
+
+async def publishers(cardinality: int, budget: int = BUDGET) -> dict:
+    """Publish from many distinct publishers, matched by wildcard and pattern.
+
+    Cardinality above ``Event.PLAN_CACHE_SIZE`` measures plan cache misses.
+
+    :param cardinality: Number of distinct publishers
+    :type cardinality: int
+    :param budget: Approximate number of handler calls
+    :type budget: int
+    :return: Case result
+    :rtype: dict
+    """
+    event = _event(1)
+    event.subscribe(PublisherPattern('tenant-*'))(Handler('pattern'))
+    names = ['tenant-{}'.format(index) for index in range(cardinality)]
+    latencies = await _publish(event, names, _operations(budget, 2))
+    return _result('publishers', {'publishers': cardinality}, latencies)
+
+
+async def payload(cost: int, budget: int = BUDGET) -> dict:
+    """Publish to four subscribers doing work of given cost.
+
+    Each hundred iterations of work counts as handler call against budget.
+
+    :param cost: Number of loop iterations per handler call
+    :type cost: int
+    :param budget: Approximate number of handler calls
+    :type budget: int
+    :return: Case result
+    :rtype: dict
+    """
+    event = _event(4, cost)
+    latencies = await _publish(event, [None], _operations(budget, 4 * (1 + cost // 100)))
+    return _result('payload', {'subscribers': 4, 'cost': cost}, latencies)
+
+
+async def churn(subscribers: int, budget: int = BUDGET) -> dict:
+    """Subscribe and unsubscribe handler next to existing subscribers.
+
+    Event is published between subscribe and unsubscribe,
+    so each change invalidates compiled dispatch plan. Only subscribe
+    and unsubscribe are measured.
+
+    :param subscribers: Number of existing subscribers
+    :type subscribers: int
+    :param budget: Approximate number of handler calls
+    :type budget: int
+    :return: Case result
+    :rtype: dict
+    """
+    event = _event(subscribers)
+    latencies = []
+    for index in range(_operations(budget, subscribers)):
+        handler = Handler('churn {}'.format(index))
+        start = time.perf_counter()
+        event.subscribe()(handler)
+        subscribed = time.perf_counter()
+        await event.publish(index)
+        unsubscribing = time.perf_counter()
+        event.unsubscribe(handler)
+        latencies.append(subscribed - start + time.perf_counter() - unsubscribing)
+    return _result('churn', {'subscribers': subscribers}, latencies)
+
+
+SCENARIOS = {
+    'fan_out': fan_out,
+    'publishers': publishers,
+    'payload': payload,
+    'churn': churn,
+}
+"""Scenario functions by name."""
+
+
+def run(scenarios: list = None, quick: bool = False, budget: int = BUDGET) -> dict:
+    """Run benchmark matrix in new event loop.
+
+    :param scenarios: Names of scenarios, all if None
+    :type scenarios: list
+    :param quick: Use reduced matrix
+    :type quick: bool
+    :param budget: Approximate number of handler calls per case
+    :type budget: int
+    :return: Report with environment and list of case results
+    :rtype: dict
+    """
+    matrix = QUICK_MATRIX if quick else MATRIX
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        results = [loop.run_until_complete(SCENARIOS[name](parameter, budget))
+                   for name in scenarios or sorted(SCENARIOS) for parameter in matrix[name]]
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    return {
+        'eeee': eeee.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'budget': budget,
+        'results': results,
+    }
+
+
+def main(argv: list = None):
+    """Command line entry point.
+
+    :param argv: Command line arguments, sys.argv if None
+    :type argv: list
+    """
+    parser = argparse.ArgumentParser(prog='python -m eeee.bench',
+                                     description=__doc__.split('\n')[0])
+    parser.add_argument('-o', '--output', default='-', help='JSON file, stdout by default')
+    parser.add_argument('-s', '--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='scenario to run, may be repeated, all by default')
+    parser.add_argument('-b', '--budget', type=int, default=BUDGET,
+                        help='approximate number of handler calls per case')
+    parser.add_argument('-q', '--quick', action='store_true', help='run reduced matrix')
+    args = parser.parse_args(argv)
+
+    report = run(args.scenario, args.quick, args.budget)
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+
+
+def _event(subscribers: int, cost: int = 0) -> Event:
+    """Create event with subscribers subscribed to any publisher.
+
+    :param subscribers: Number of subscribers
+    :type subscribers: int
+    :param cost: Number of loop iterations per handler call
+    :type cost: int
+    :return: Event
+    :rtype: eeee.event.Event
+    """
+    event = Event('bench')
+    for index in range(subscribers):
+        event.subscribe()(Handler('handler {}'.format(index), cost))
+    return event
+
+
+async def _publish(event: Event, names: list, operations: int) -> list:
+    """Publish messages cycling through publishers, measuring each publish.
+
+    :param event: Event
+    :type event: eeee.event.Event
+    :param names: Publisher names, None for anonymous publisher
+    :type names: list
+    :param operations: Number of publishes
+    :type operations: int
+    :return: Latencies in seconds
+    :rtype: list
+    """
+    latencies = []
+    size = len(names)
+    for index in range(operations):
+        start = time.perf_counter()
+        await event.publish(index, names[index % size])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _operations(budget: int, calls: int) -> int:
+    """Number of operations fitting into budget.
+
+    :param budget: Approximate number of handler calls
+    :type budget: int
+    :param calls: Handler calls per operation
+    :type calls: int
+    :return: Number of operations
+    :rtype: int
+    """
+    return max(MIN_OPERATIONS, budget // calls)
+
+
+def _result(scenario: str, params: dict, latencies: list) -> dict:
+    """Summarize latencies of case.
+
+    :param scenario: Scenario name
+    :type scenario: str
+    :param params: Case parameters
+    :type params: dict
+    :param latencies: Latencies in seconds
+    :type latencies: list
+    :return: Case result
+    :rtype: dict
+    """
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    latency = {'p{}'.format(p): _percentile(ordered, p) * 1e6 for p in PERCENTILES}
+    latency['mean'] = total / len(ordered) * 1e6
+    latency['max'] = ordered[-1] * 1e6
+    return {
+        'scenario': scenario,
+        'params': params,
+        'operations': len(ordered),
+        'seconds': total,
+        'ops_per_sec': len(ordered) / total if total else None,
+        'latency_us': latency,
+    }
+
+
+def _percentile(ordered: list, percent: float) -> float:
+    """Nearest rank percentile.
+
+    :param ordered: Sorted values
+    :type ordered: list
+    :param percent: Percentile from 0 to 100
+    :type percent: float
+    :return: Value
+    :rtype: float
+    """
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+if __name__ == '__main__':
+    main()
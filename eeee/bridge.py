@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import glob
+import os
+import struct
+from collections import namedtuple
+from typing import Any, Iterable
+
+from eeee import codec
+from eeee.event import Event
+from eeee.tracing import Hook, Span
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class ProcessBridge(Hook):
+    """Mirror publishes of selected events to other processes on the same host.
+
+    Every process, like worker of pre-forking server, starts its own bridge
+    after fork. Bridges listen on Unix domain socket named after process id
+    in shared directory and connect to sockets of each other, so no broker
+    process is needed. New peers are discovered when bridge starts and then
+    at most once per ``DISCOVERY_INTERVAL`` while publishing.
+
+    Bridge is a tracing hook of bridged events. Message is serialized once
+    with ``CODEC`` when publish starts and all messages published in single
+    loop iteration are sent to every peer with single write, large bytes-like
+    objects are written without being copied into frame. Received messages are published
+    to local event of the same name, but never sent back. Publishes with strategy
+    and batches of :meth:`eeee.event.Event.publish_many` are mirrored as plain
+    publishes of every message, and results of handlers in other processes are not returned.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> my_event = Event('MyEvent')
+        >>> bridge = ProcessBridge('/run/my-app', [my_event])
+        >>> await bridge.start()
+        >>> await my_event.publish({'message': 'to every worker'})
+        >>> await bridge.close()
+
+    Messages must be serializable, otherwise publish raises error of codec,
+    like :class:`pickle.PicklingError`.
+
+    :param directory: Directory of sockets shared by all processes
+    :type directory: str
+    :param events: Events to mirror
+    :type events: Iterable
+    :param name: Socket name, process id by default
+    :type name: str
+    """
+
+    SUFFIX = '.sock'
+    """Suffix of socket file names."""
+
+    DISCOVERY_INTERVAL = 1.0
+    """Minimal number of seconds between discoveries of new peers."""
+
+    CODEC = codec.PickleCodec()
+    """Instance of :class:`eeee.codec.Codec` serializing mirrored messages."""
+
+    _Header = struct.Struct('!I')
+    _Stats = namedtuple('BridgeStats', ['peers', 'pending', 'sent', 'received', 'failed'])
+
+    def __init__(self, directory: str, events: Iterable[Event] = (), name: str = None):
+        self.directory = directory
+        self.name = name
+        self.path = None
+        self.sent = 0
+        self.received = 0
+        self.failed = 0
+        self._events = {}
+        self._peers = {}
+        self._pending = []
+        self._server = None
+        self._writer = None
+        self._wake = None
+        self._discovery = 0.0
+        self._tasks = set()
+        for event in events:
+            self.attach(event)
+
+    @property
+    def is_running(self) -> bool:
+        """Check if bridge has been started and not closed yet.
+
+        :return: Boolean
+        """
+        return self._server is not None
+
+    def stats(self):
+        """Report bridge counters.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> bridge.stats()
+            BridgeStats(peers=3, pending=0, sent=1200, received=3600, failed=0)
+
+        :return: Named tuple with peers, pending, sent, received and failed
+        :rtype: tuple
+        """
+        return self._Stats(peers=len(self._peers), pending=len(self._pending), sent=self.sent,
+                           received=self.received, failed=self.failed)
+
+    def attach(self, event: Event):
+        """Mirror publishes of event.
+
+        Messages received from other processes are published
+        only to events attached to bridge.
+
+        :param event: Event to mirror
+        :type event: eeee.event.Event
+        """
+        self._events[event.name] = event
+        event.HOOKS = event.HOOKS + (self,)
+
+    def detach(self, event: Event):
+        """Stop mirroring publishes of event.
+
+        :param event: Mirrored event
+        :type event: eeee.event.Event
+        """
+        if self._events.get(event.name) is event:
+            del self._events[event.name]
+        event.HOOKS = tuple(hook for hook in event.HOOKS if hook is not self)
+
+    async def start(self):
+        """Listen on socket and connect to peers.
+
+        Stale socket left by previous process of the same id is replaced.
+        """
+        self.path = os.path.join(self.directory, '{}{}'.format(self.name or os.getpid(),
+                                                               self.SUFFIX))
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._accept, path=self.path)
+        self._wake = asyncio.Event()
+        self._writer = asyncio.ensure_future(self._write())
+        await self.discover()
+
+    async def discover(self) -> int:
+        """Connect to new peers found in directory.
+
+        Sockets which refuse connection, left by processes which
+        did not close bridge, are skipped.
+
+        :return: Number of connected peers
+        :rtype: int
+        """
+        self._discovery = asyncio.get_event_loop().time() + self.DISCOVERY_INTERVAL
+        for path in glob.glob(os.path.join(glob.escape(self.directory), '*' + self.SUFFIX)):
+            if path != self.path and path not in self._peers:
+                await self._connect(path)
+        return len(self._peers)
+
+    async def flush(self):
+        """Send pending messages to peers without waiting for writer."""
+        if asyncio.get_event_loop().time() >= self._discovery:
+            await self.discover()
+        frames, self._pending = self._pending, []
+        if not frames:
+            return
+        self._forget_closed()
+        chunks = [chunk for frame in frames for chunk in frame]
+        for writer in self._peers.values():
+            writer.writelines(chunks)
+        await asyncio.gather(*[self._drain(path, writer)
+                               for path, writer in list(self._peers.items())])
+        self.sent += len(frames)
+
+    async def close(self):
+        """Send pending messages, detach events and close all connections.
+
+        Socket file is removed.
+        """
+        if not self.is_running:
+            return
+        for event in list(self._events.values()):
+            self.detach(event)
+        await self.flush()
+        await self._shutdown()
+        os.unlink(self.path)
+
+    def before(self, span: Span):
+        """Queue published message, or every message of batch, to be sent to peers.
+
+        :param span: Started span
+        :type span: eeee.tracing.Span
+        """
+        if span.kind != Span.PUBLISH or span.origin is self or self._wake is None:
+            return
+        publisher = None if span.publisher is None else span.publisher.name
+        for message in span.message if span.batch else (span.message,):
+            chunks = self.CODEC.encode((span.event, message, publisher))
+            self._pending.append([self._Header.pack(codec.size(chunks))] + chunks)
+        self._wake.set()
+
+    async def _shutdown(self):
+        """Stop server, writer and receivers and close connections to peers."""
+        self._server.close()
+        for writer in self._peers.values():
+            writer.close()
+        tasks = [self._writer] + list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._server = self._writer = self._wake = None
+        self._peers.clear()
+
+    async def _write(self):
+        """Flush pending messages once per loop iteration until cancelled."""
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            await self.flush()
+
+    async def _connect(self, path: str):
+        """Open connection to peer.
+
+        :param path: Socket path of peer
+        :type path: str
+        """
+        try:
+            _, writer = await asyncio.open_unix_connection(path)
+        except OSError:
+            return
+        self._peers[path] = writer
+
+    async def _drain(self, path: str, writer: asyncio.StreamWriter):
+        """Wait until data is sent to peer, forgetting peer if connection is lost.
+
+        :param path: Socket path of peer
+        :type path: str
+        :param writer: Stream of peer
+        :type writer: asyncio.StreamWriter
+        """
+        try:
+            await writer.drain()
+        except OSError:
+            writer.close()
+            self._peers.pop(path, None)
+
+    def _forget_closed(self):
+        """Forget peers whose connection has been closed."""
+        for path in [path for path, writer in self._peers.items()
+                     if writer.transport.is_closing()]:
+            del self._peers[path]
+
+    def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Start receiving messages from connected peer.
+
+        :param reader: Stream of peer
+        :type reader: asyncio.StreamReader
+        :param writer: Stream of peer
+        :type writer: asyncio.StreamWriter
+        """
+        task = asyncio.ensure_future(self._receive(reader, writer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _receive(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Publish messages from peer in order until connection is closed.
+
+        :param reader: Stream of peer
+        :type reader: asyncio.StreamReader
+        :param writer: Stream of peer
+        :type writer: asyncio.StreamWriter
+        """
+        try:
+            while True:
+                size, = self._Header.unpack(await reader.readexactly(self._Header.size))
+                await self._deliver(await reader.readexactly(size))
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _deliver(self, frame: bytes):
+        """Publish received message to local event.
+
+        Exceptions raised by handlers are counted as failed.
+
+        :param frame: Serialized event name, message and publisher name
+        :type frame: bytes
+        """
+        try:
+            name, message, publisher = self.CODEC.decode(frame)
+            event = self._events.get(name)
+            if event is not None:
+                await self._publish(event, message, publisher)
+        except Exception:
+            self.failed += 1
+
+    async def _publish(self, event: Event, message: Any, publisher: str):
+        """Publish received message, so it is not sent back.
+
+        This bridge is origin of publish, also when message is coalesced
+        and delivered later.
+
+        :param event: Local event
+        :type event: eeee.event.Event
+        :param message: Received message
+        :type message: Any
+        :param publisher: Optional publisher name
+        :type publisher: str
+        """
+        self.received += 1
+        # noinspection PyProtectedMember
+        await event._publish(message, publisher, origin=self)
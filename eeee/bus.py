@@ -0,0 +1,464 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import itertools
+from typing import Any, Union
+
+from eeee import exceptions
+from eeee.event import (Event, Publisher, PublisherPattern, RateLimit, Reducer, Subscriber,
+                        _is_callable, _parse_handler, _parse_publisher)
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class EventBus:
+    """Registry of events addressed by dotted topic names.
+
+    Bus owns Event instances, creating them on first use, and allows
+    to subscribe to groups of topics with wildcard patterns:
+
+    * ``*`` matches exactly one segment, e.g. ``orders.*`` matches ``orders.created``,
+    * ``#`` matches zero or more segments, e.g. ``orders.#`` matches ``orders``
+      and ``orders.eu.created``.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> bus = EventBus()
+        >>> @bus.subscribe('orders.*')
+        ... async def orders_handler(message, publisher, event):
+        ...     pass # do something
+        ...
+        >>> result = await bus.publish('orders.created', {'id': 1})
+
+    Wildcard patterns are resolved with topic trie once per concrete topic,
+    when its Event is created or when pattern is subscribed. Matching
+    subscriptions are registered on Event itself, so publish cost does not
+    depend on number of patterns.
+    """
+
+    EVENT_CLASS = Event
+    """Class of events created by bus."""
+
+    SEPARATOR = '.'
+    """Topic segments separator."""
+
+    ONE = '*'
+    """Wildcard matching exactly one segment."""
+
+    MANY = '#'
+    """Wildcard matching zero or more segments."""
+
+    def __init__(self):
+        self._events = {}
+        self._trie = _Node()
+        self._sequence = itertools.count()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._events
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __len__(self):
+        return len(self._events)
+
+    def event(self, name: str) -> Event:
+        """Get Event of topic, create it if does not exist yet.
+
+        New Event receives all wildcard subscriptions matching its topic.
+
+        :param name: Concrete topic name
+        :type name: str
+        :raises eeee.exceptions.NamingError: Naming error
+        :return: Event of topic
+        :rtype: eeee.event.Event
+        """
+        try:
+            return self._events[name]
+        except (KeyError, TypeError):
+            return self._create(name)
+
+    async def publish(self, topic: str, message: Any, publisher: Union[Publisher, str] = None,
+                      deadline: float = None, strategy: Union[str, Reducer] = None):
+        """Publish message to Event of topic.
+
+        :param topic: Concrete topic name
+        :type topic: str
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional name or instance of Publisher
+        :type publisher: eeee.event.Publisher, str
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :param strategy: Optional name of built-in strategy or Reducer
+        :type strategy: str, eeee.event.Reducer
+        :return: List of results from subscribed handlers, reduced value if strategy is set,
+                 or None if event is disabled.
+        """
+        return await self.event(topic).publish(message, publisher, deadline, strategy)
+
+    def subscribe(self, pattern: str, publisher: Union[Publisher, str] = None,
+                  concurrency: int = None, executor: str = None, timeout: float = None,
+                  weak: bool = False, rate_limit: RateLimit = None):
+        """Subscribe decorator for topic or wildcard pattern.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> bus = EventBus()
+            >>> @bus.subscribe('orders.#', publisher='webhook')
+            ... async def all_orders_handler(message, publisher, event):
+            ...     pass # do something
+
+        :param pattern: Topic name or wildcard pattern
+        :type pattern: str
+        :param publisher: Optional name or instance of Publisher
+        :type publisher: eeee.event.Publisher, str
+        :param concurrency: Optional limit of concurrent calls of this subscriber
+        :type concurrency: int
+        :param executor: Executor name, required for synchronous handlers
+        :type executor: str
+        :param timeout: Optional time limit of single call in seconds
+        :type timeout: float
+        :param weak: Hold only weak reference to handler
+        :type weak: bool
+        :param rate_limit: Optional rate limit of calls of this subscriber, in all topics
+        :type rate_limit: eeee.event.RateLimit
+        :return: subscribe decorator
+        """
+        segments = self._split(pattern)
+        publisher = _parse_publisher(publisher)
+
+        def wrapper(handler: callable):
+            """Register subscriber to topic or pattern.
+
+            :param handler: Function or class with __call__ method
+            :type handler: eeee.event.Subscriber, callable
+            :return: Subscription of topic or of wildcard pattern
+            :rtype: eeee.event.Subscription, eeee.bus.PatternSubscription
+            """
+            subscriber = Subscriber(handler, concurrency=concurrency, executor=executor,
+                                    timeout=timeout, weak=weak, rate_limit=rate_limit)
+            if self._is_pattern(segments):
+                return self._reg_pattern(segments, subscriber, publisher)
+            # noinspection PyProtectedMember
+            return self.event(pattern)._reg_sub(subscriber, publisher)
+
+        return wrapper
+
+    def unsubscribe(self, subscriber: Union[Subscriber, callable], pattern: str,
+                    publisher: Union[Publisher, str] = None):
+        """Unsubscribe handler from topic or wildcard pattern.
+
+        Pattern and publisher must be the same as on subscribe.
+        Subscriptions of the same handler to other topics or patterns are kept.
+
+        :param subscriber: Function or class with __call__ method
+        :type subscriber: eeee.event.Subscriber, callable
+        :param pattern: Topic name or wildcard pattern
+        :type pattern: str
+        :param publisher: Optional name or instance of Publisher
+        :type publisher: eeee.event.Publisher, str
+        """
+        segments = self._split(pattern)
+        if not self._is_pattern(segments):
+            self.event(pattern).unsubscribe(subscriber, publisher)
+            return
+
+        name, handler = _parse_handler(subscriber)
+        _is_callable(handler)
+        publisher = _parse_publisher(publisher)
+        node = self._trie.find(segments)
+        for subscription in list(node.subscriptions if node is not None else ()):
+            if subscription.name == name and subscription.publisher == publisher:
+                subscription.cancel()
+
+    def _reg_pattern(self, segments: list, subscriber: Subscriber,
+                     publisher: Union[Publisher, PublisherPattern] = None) -> "PatternSubscription":
+        """Add wildcard subscription to trie and to already existing matching events.
+
+        :param segments: Pattern segments
+        :type segments: list
+        :param subscriber: Instance of Subscriber
+        :type subscriber: eeee.event.Subscriber
+        :param publisher: Optional instance or pattern of Publisher
+        :type publisher: eeee.event.Publisher, eeee.event.PublisherPattern
+        :return: Subscription of pattern
+        :rtype: eeee.bus.PatternSubscription
+        """
+        subscription = PatternSubscription(subscriber, self, segments, publisher,
+                                           next(self._sequence))
+        self._trie.insert(segments).subscriptions.append(subscription)
+        for event in self._matching_events(segments):
+            # noinspection PyProtectedMember
+            subscription.subscriptions.append(event._reg_sub(subscription, publisher))
+        if subscription.weak:
+            subscription.handler.watch(self._prune, subscription)
+        return subscription
+
+    def _remove(self, subscription: "PatternSubscription"):
+        """Remove wildcard subscription from trie and its subscriptions from events.
+
+        :param subscription: Active subscription of pattern
+        :type subscription: eeee.bus.PatternSubscription
+        """
+        node = self._trie.find(subscription.segments)
+        node.subscriptions = [entry for entry in node.subscriptions if entry is not subscription]
+        subscriptions, subscription.subscriptions = subscription.subscriptions, []
+        for event_subscription in subscriptions:
+            event_subscription.cancel()
+
+    # noinspection PyUnusedLocal
+    def _prune(self, handler: callable, subscription: "PatternSubscription"):
+        """Cancel wildcard subscription of garbage collected handler.
+
+        :param handler: Weak handler of dead subscriber
+        :type handler: eeee.event._WeakHandler
+        :param subscription: Subscription of pattern
+        :type subscription: eeee.bus.PatternSubscription
+        """
+        subscription.cancel()
+
+    def _create(self, name: str) -> Event:
+        """Create Event of topic and register matching wildcard subscriptions.
+
+        :param name: Concrete topic name
+        :type name: str
+        :return: New Event
+        :rtype: eeee.event.Event
+        """
+        segments = self._split(name)
+        if self._is_pattern(segments):
+            raise exceptions.NamingError('Topic "{}" must not contain wildcards.'.format(name))
+        event = self._events[name] = self.EVENT_CLASS(name)
+        matching = self._trie.match(segments, self.ONE, self.MANY)
+        for subscription in sorted(matching, key=lambda entry: entry.key):
+            # noinspection PyProtectedMember
+            subscription.subscriptions.append(event._reg_sub(subscription, subscription.publisher))
+        return event
+
+    def _matching_events(self, segments: list) -> list:
+        """Find existing events matching pattern.
+
+        :param segments: Pattern segments
+        :type segments: list
+        :return: List of events
+        :rtype: list
+        """
+        pattern = _Node()
+        pattern.insert(segments).subscriptions.append(None)
+        return [event for name, event in self._events.items()
+                if pattern.match(self._split(name), self.ONE, self.MANY)]
+
+    def _split(self, name: str) -> list:
+        """Split topic or pattern into segments.
+
+        :param name: Topic name or pattern
+        :type name: str
+        :raises eeee.exceptions.NamingError: Naming error
+        :return: List of segments
+        :rtype: list
+        """
+        if type(name) is not str:
+            raise exceptions.NamingError(types=[str], wrong=str(type(name)))
+        return name.split(self.SEPARATOR)
+
+    def _is_pattern(self, segments: list) -> bool:
+        """Tell if segments contain wildcards.
+
+        :param segments: Topic or pattern segments
+        :type segments: list
+        :return: Boolean
+        """
+        return self.ONE in segments or self.MANY in segments
+
+
+class PatternSubscription(Subscriber):
+    """Subscriber registered to wildcard pattern of EventBus, handle of single subscription.
+
+    Returned by subscribe decorator of bus for patterns. Holds subscriptions
+    registered to every Event matching pattern, cancelling it removes
+    pattern from bus and only those subscriptions from events.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> subscription = bus.subscribe('orders.*')(audit)
+        >>> subscription.cancel()
+        >>> subscription.active
+        False
+
+    :param subscriber: Instance of Subscriber
+    :type subscriber: eeee.event.Subscriber
+    :param bus: EventBus subscriber is registered to
+    :type bus: eeee.bus.EventBus
+    :param segments: Pattern segments
+    :type segments: list
+    :param publisher: Optional instance or pattern of Publisher
+    :type publisher: eeee.event.Publisher, eeee.event.PublisherPattern
+    :param key: Registration sequence number, unique within bus
+    :type key: int
+    """
+
+    __slots__ = ('bus', 'segments', 'publisher', 'key', 'subscriptions')
+
+    # noinspection PyMissingConstructor
+    def __init__(self, subscriber: Subscriber, bus: EventBus, segments: list,
+                 publisher: Union[Publisher, PublisherPattern], key: int):
+        # subscriber is validated already, copy instead of parse again
+        self.name = subscriber.name
+        self.handler = subscriber.handler
+        self.limiter = subscriber.limiter
+        self.executor = subscriber.executor
+        self.timeout = subscriber.timeout
+        self.rate_limit = subscriber.rate_limit
+        self.bus = bus
+        self.segments = segments
+        self.publisher = publisher
+        self.key = key
+        self.subscriptions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cancel()
+
+    @property
+    def pattern(self) -> str:
+        """Wildcard pattern.
+
+        :return: Pattern
+        :rtype: str
+        """
+        return self.bus.SEPARATOR.join(self.segments)
+
+    @property
+    def active(self) -> bool:
+        """Tell if subscription is still registered.
+
+        :return: Boolean
+        """
+        # noinspection PyProtectedMember
+        node = self.bus._trie.find(self.segments)
+        return node is not None and any(entry is self for entry in node.subscriptions)
+
+    def cancel(self):
+        """Remove subscription from bus. Cancelling inactive subscription does nothing."""
+        if self.active:
+            # noinspection PyProtectedMember
+            self.bus._remove(self)
+
+
+class _Node:
+    """Topic trie node.
+
+    Each node holds subscriptions of pattern ending at this node
+    and children keyed by next segment.
+    """
+
+    __slots__ = ('children', 'subscriptions')
+
+    def __init__(self):
+        self.children = {}
+        self.subscriptions = []
+
+    def insert(self, segments: list) -> "_Node":
+        """Get node of pattern, creating missing nodes.
+
+        :param segments: Pattern segments
+        :type segments: list
+        :return: Node of pattern
+        :rtype: eeee.bus._Node
+        """
+        node = self
+        for segment in segments:
+            node = node.children.setdefault(segment, _Node())
+        return node
+
+    def find(self, segments: list) -> "_Node":
+        """Get node of pattern.
+
+        :param segments: Pattern segments
+        :type segments: list
+        :return: Node of pattern or None if not found
+        :rtype: eeee.bus._Node
+        """
+        node = self
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def match(self, segments: list, one: str, many: str) -> list:
+        """Collect subscriptions of all patterns matching concrete topic.
+
+        :param segments: Topic segments
+        :type segments: list
+        :param one: Wildcard matching exactly one segment
+        :type one: str
+        :param many: Wildcard matching zero or more segments
+        :type many: str
+        :return: List of subscriptions, without duplicates
+        :rtype: list
+        """
+        found = {}
+        self._collect(segments, 0, (one, many), found)
+        return list(found.values())
+
+    def _collect(self, segments: list, index: int, wildcards: tuple, found: dict):
+        """Walk trie collecting subscriptions matching segments from index.
+
+        :param segments: Topic segments
+        :type segments: list
+        :param index: Index of current segment
+        :type index: int
+        :param wildcards: Pair of single and multi segment wildcards
+        :type wildcards: tuple
+        :param found: Collected subscriptions keyed by identity
+        :type found: dict
+        """
+        many = self.children.get(wildcards[1])
+        if many is not None:
+            many._collect_many(segments, index, wildcards, found)
+        if index == len(segments):
+            found.update((id(entry), entry) for entry in self.subscriptions)
+        else:
+            self._collect_next(segments, index, wildcards, found)
+
+    def _collect_next(self, segments: list, index: int, wildcards: tuple, found: dict):
+        """Walk trie from children matching exactly one segment.
+
+        :param segments: Topic segments
+        :type segments: list
+        :param index: Index of current segment
+        :type index: int
+        :param wildcards: Pair of single and multi segment wildcards
+        :type wildcards: tuple
+        :param found: Collected subscriptions keyed by identity
+        :type found: dict
+        """
+        for key in (segments[index], wildcards[0]):
+            child = self.children.get(key)
+            if child is not None:
+                child._collect(segments, index + 1, wildcards, found)
+
+    def _collect_many(self, segments: list, index: int, wildcards: tuple, found: dict):
+        """Walk trie from multi segment wildcard, consuming zero or more segments.
+
+        :param segments: Topic segments
+        :type segments: list
+        :param index: Index of first segment consumed by wildcard
+        :type index: int
+        :param wildcards: Pair of single and multi segment wildcards
+        :type wildcards: tuple
+        :param found: Collected subscriptions keyed by identity
+        :type found: dict
+        """
+        for skip in range(index, len(segments) + 1):
+            self._collect(segments, skip, wildcards, found)
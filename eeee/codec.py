@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+import pickle
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Union
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+_COUNT = struct.Struct('!H')
+_SINGLE = struct.Struct('!HQ')
+_OUT_OF_BAND = hasattr(pickle, 'PickleBuffer')
+
+
+class Codec(ABC):
+    """Interface of message serialization used across process boundaries.
+
+    Encoded message is a list of bytes-like chunks, so large buffers can be
+    passed on without being copied into single bytes object. Decoder accepts
+    the same list, or all chunks joined into single bytes-like object
+    as it arrives from socket. Codecs are assigned to ``CODEC`` class
+    attribute of :class:`eeee.event.Event` and of bridges, and must be picklable
+    to be used with process executor.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> class JsonCodec(Codec):
+        ...     def encode(self, obj):
+        ...         return [json.dumps(obj).encode()]
+        ...     def decode(self, data):
+        ...         return json.loads(bytes(data[0] if isinstance(data, list) else data))
+        ...
+        >>> Event.CODEC = JsonCodec()
+    """
+
+    @abstractmethod
+    def encode(self, obj: Any) -> list:
+        """Serialize object.
+
+        :param obj: Literally anything the codec supports.
+        :type obj: Any
+        :return: List of bytes-like chunks
+        :rtype: list
+        """
+
+    @abstractmethod
+    def decode(self, data: Union[bytes, memoryview, list]) -> Any:
+        """Deserialize object.
+
+        :param data: List of chunks returned by encode, or chunks joined together
+        :type data: bytes, memoryview, list
+        :return: Deserialized object
+        """
+
+
+class PickleCodec(Codec):
+    """Pickle codec sending large bytes-like objects out of band.
+
+    With pickle protocol 5, available since Python 3.8, bytes, bytearray,
+    memoryview and objects supporting out-of-band pickling, like numpy arrays,
+    are not copied into pickle stream but become separate chunks,
+    which are memoryviews of original objects. On decoding they are
+    taken as memoryview slices of received data, so memoryview and
+    out-of-band objects are not copied at all, bytes and bytearray
+    are rebuilt with single copy. Memoryview, which can not be pickled
+    in band, is always sent out of band. Older Pythons use in-band pickle.
+
+    Messages holding bytes-like objects directly or in values of
+    their dicts, lists and tuples are pickled out of band right away.
+    Others are pickled by :func:`pickle.dumps`, and pickled again
+    out of band only when the stream is larger than ``threshold``.
+
+    Encoded chunks are count of sizes, sizes of pickle stream and of every buffer,
+    pickle stream and buffers.
+
+    :param threshold: Minimal size in bytes of bytes-like objects sent out of band
+    :type threshold: int
+    """
+
+    def __init__(self, threshold: int = 4096):
+        self.threshold = threshold
+
+    def encode(self, obj: Any) -> list:
+        if not _OUT_OF_BAND:  # pragma: no cover, Python < 3.8
+            return _chunks(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL), [])
+        buffers = []
+        stream = self._dumps(obj, buffers)
+        return _chunks(stream, [buffer.raw() for buffer in buffers])
+
+    def decode(self, data: Union[bytes, memoryview, list]) -> Any:
+        if isinstance(data, list):
+            chunks = data[1:]
+        else:
+            chunks = _split(memoryview(data))
+        if len(chunks) == 1:
+            return pickle.loads(chunks[0])
+        return _Unpickler(io.BytesIO(chunks[0]), buffers=chunks[1:]).load()
+
+    def _dumps(self, obj: Any, buffers: list) -> bytes:
+        """Pickle object collecting out-of-band buffers.
+
+        :param obj: Literally anything picklable.
+        :type obj: Any
+        :param buffers: List collecting out-of-band buffers
+        :type buffers: list
+        :return: Pickle stream
+        :rtype: bytes
+        """
+        if not _holds_buffers(obj):
+            stream = _dumps_in_band(obj, buffers)
+            if 0 < len(stream) < self.threshold:
+                return stream
+        del buffers[:]
+        return self._dump(obj, buffers)
+
+    def _dump(self, obj: Any, buffers: list) -> bytes:
+        """Pickle object passing large bytes-like objects out of band.
+
+        :param obj: Literally anything picklable.
+        :type obj: Any
+        :param buffers: List collecting out-of-band buffers
+        :type buffers: list
+        :return: Pickle stream
+        :rtype: bytes
+        """
+        stream = io.BytesIO()
+        _Pickler(stream, self.threshold, buffers.append).dump(obj)
+        return stream.getvalue()
+
+
+def size(chunks: list) -> int:
+    """Get number of bytes of encoded chunks.
+
+    :param chunks: List of bytes-like chunks
+    :type chunks: list
+    :return: Number of bytes
+    :rtype: int
+    """
+    return sum(memoryview(chunk).nbytes for chunk in chunks)
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler passing large bytes-like objects to buffer callback, requires protocol 5.
+
+    Bytes-like objects are replaced with persistent id holding
+    :class:`pickle.PickleBuffer`, which is pickled out of band.
+    Persistent ids are reused, so object referenced many times is sent once.
+
+    :param file: Stream of pickled data
+    :type file: io.BytesIO
+    :param threshold: Minimal size in bytes of out-of-band objects
+    :type threshold: int
+    :param buffer_callback: Called with every out-of-band buffer
+    :type buffer_callback: callable
+    """
+
+    def __init__(self, file: io.BytesIO, threshold: int, buffer_callback: callable):
+        super().__init__(file, 5, buffer_callback=buffer_callback)
+        self.threshold = threshold
+        self.ids = {}
+
+    def persistent_id(self, obj: Any) -> tuple:
+        """Get persistent id of large contiguous bytes-like object.
+
+        Memoryviews are always out of band, as they can not be pickled in band.
+
+        :param obj: Object being pickled
+        :type obj: Any
+        :return: Pair of type and buffer of object, or None to pickle object as usual
+        :rtype: tuple
+        """
+        if type(obj) not in _REBUILT:
+            return None
+        view = memoryview(obj)
+        if not view.contiguous or type(obj) is not memoryview and view.nbytes < self.threshold:
+            return None
+        return self.ids.setdefault(id(obj), (type(obj), pickle.PickleBuffer(obj)))
+
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickler rebuilding bytes-like objects from out-of-band buffers."""
+
+    def persistent_load(self, pid: tuple) -> Union[bytes, bytearray, memoryview]:
+        """Rebuild bytes-like object from its out-of-band buffer.
+
+        :param pid: Pair of type and buffer of object
+        :type pid: tuple
+        :return: Bytes-like object of original type
+        :rtype: bytes, bytearray, memoryview
+        """
+        kind, buffer = pid
+        return kind(buffer)
+
+
+_REBUILT = frozenset((bytes, bytearray, memoryview))
+
+
+def _dumps_in_band(obj: Any, buffers: list) -> bytes:
+    """Pickle object with C pickler, objects supporting out-of-band pickling are still out of band.
+
+    :param obj: Literally anything picklable.
+    :type obj: Any
+    :param buffers: List collecting out-of-band buffers
+    :type buffers: list
+    :return: Pickle stream or empty bytes if object holds memoryview
+    :rtype: bytes
+    """
+    try:
+        return pickle.dumps(obj, 5, buffer_callback=buffers.append)
+    except TypeError:  # memoryview is picklable only out of band
+        return b''
+
+
+def _holds_buffers(obj: Any) -> bool:
+    """Check if object is bytes-like or holds one in its items or their items.
+
+    Only dicts, lists and tuples are looked into.
+
+    :param obj: Literally anything.
+    :type obj: Any
+    :return: Boolean
+    """
+    return type(obj) in _REBUILT or any(map(_holds_directly, _items(obj)))
+
+
+def _holds_directly(obj: Any) -> bool:
+    """Check if object is bytes-like or holds one in its items.
+
+    :param obj: Literally anything.
+    :type obj: Any
+    :return: Boolean
+    """
+    return type(obj) in _REBUILT or not _REBUILT.isdisjoint(map(type, _items(obj)))
+
+
+def _items(obj: Any) -> Iterable:
+    """Get items of dict, list or tuple.
+
+    :param obj: Literally anything.
+    :type obj: Any
+    :return: Values of dict, list or tuple itself, empty for other objects
+    :rtype: Iterable
+    """
+    kind = type(obj)
+    if kind is dict:
+        return obj.values()
+    return obj if kind is list or kind is tuple else ()
+
+
+def _chunks(stream: bytes, buffers: list) -> list:
+    """Prefix pickle stream and buffers with their sizes.
+
+    :param stream: Pickle stream
+    :type stream: bytes
+    :param buffers: Out-of-band buffers
+    :type buffers: list
+    :return: List of chunks
+    :rtype: list
+    """
+    if not buffers:
+        return [_SINGLE.pack(1, len(stream)), stream]
+    sizes = [len(stream)] + [buffer.nbytes for buffer in buffers]
+    header = _COUNT.pack(len(sizes)) + struct.pack('!{}Q'.format(len(sizes)), *sizes)
+    return [header, stream] + buffers
+
+
+def _split(view: memoryview) -> list:
+    """Split joined chunks into pickle stream and buffers, without copying.
+
+    :param view: Joined chunks
+    :type view: memoryview
+    :return: Pickle stream followed by buffers
+    :rtype: list
+    """
+    count, = _COUNT.unpack_from(view)
+    if count == 1:
+        return [view[_SINGLE.size:]]
+    offset = _COUNT.size + 8 * count
+    chunks = []
+    for size in struct.unpack_from('!{}Q'.format(count), view, _COUNT.size):
+        chunks.append(view[offset:offset + size])
+        offset += size
+    return chunks
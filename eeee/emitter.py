@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+from collections import namedtuple
+from typing import Any, Union
+
+from eeee import exceptions
+from eeee.event import Event, Publisher, _is_limit
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class AsyncEmitter:
+    """Fire-and-forget wrapper around Event.
+
+    Messages are put into bounded queue and published by pool of worker tasks,
+    so caller does not wait for handlers to finish.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> my_event = Event('MyEvent')
+        >>> emitter = AsyncEmitter(my_event, maxsize=1000, workers=4,
+        ...                        backpressure=AsyncEmitter.DROP_OLDEST)
+        >>> await emitter.emit({'message': 'secret'}, 'secret publisher')
+        True
+        >>> await emitter.close()
+
+    When queue is full, backpressure policy decides what happens:
+
+    * ``block`` - wait for free space in queue,
+    * ``drop_oldest`` - discard the oldest queued message,
+    * ``drop_newest`` - discard emitted message,
+    * ``raise`` - raise :class:`eeee.exceptions.QueueFullError`.
+
+    Exceptions raised by handlers are counted as failed and never reach the caller.
+
+    :param event: Event to publish messages to
+    :type event: eeee.event.Event
+    :param maxsize: Queue capacity
+    :type maxsize: int
+    :param workers: Number of worker tasks
+    :type workers: int
+    :param backpressure: Policy applied when queue is full
+    :type backpressure: str
+    :raises eeee.exceptions.LimitError: Limit error
+    :raises eeee.exceptions.PolicyError: Policy error
+    """
+
+    BLOCK = 'block'
+    """Wait for free space in queue."""
+
+    DROP_OLDEST = 'drop_oldest'
+    """Discard the oldest queued message."""
+
+    DROP_NEWEST = 'drop_newest'
+    """Discard emitted message."""
+
+    RAISE = 'raise'
+    """Raise QueueFullError."""
+
+    POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, RAISE)
+    """All backpressure policies."""
+
+    _Stats = namedtuple('EmitterStats', ['depth', 'emitted', 'dropped', 'failed'])
+
+    def __init__(self, event: Event, maxsize: int = 1024, workers: int = 1,
+                 backpressure: str = BLOCK):
+        _is_limit(maxsize)
+        _is_limit(workers)
+        if backpressure not in self.POLICIES:
+            raise exceptions.PolicyError(policies=self.POLICIES, wrong=backpressure)
+
+        self.event = event
+        self.maxsize = maxsize
+        self.workers = workers
+        self.backpressure = backpressure
+        self.emitted = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = None
+        self._tasks = ()
+        self._closed = False
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting in queue.
+
+        :return: Queue depth
+        :rtype: int
+        """
+        return 0 if self._queue is None else self._queue.qsize()
+
+    @property
+    def is_closed(self) -> bool:
+        """Check if emitter has been closed.
+
+        :return: Boolean
+        """
+        return self._closed
+
+    def stats(self):
+        """Report emitter counters.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> emitter.stats()
+            EmitterStats(depth=12, emitted=1200, dropped=3, failed=0)
+
+        :return: Named tuple with depth, emitted, dropped and failed
+        :rtype: tuple
+        """
+        return self._Stats(depth=self.depth, emitted=self.emitted,
+                           dropped=self.dropped, failed=self.failed)
+
+    async def emit(self, message: Any, publisher: Union[Publisher, str] = None) -> bool:
+        """Put message into queue and return without waiting for handlers.
+
+        Workers are started on first emit.
+
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional name or instance of Publisher
+        :type publisher: eeee.event.Publisher, str
+        :raises eeee.exceptions.EmitterClosedError: Emitter closed error
+        :raises eeee.exceptions.QueueFullError: Queue full error
+        :return: True if message has been queued, False if it has been dropped.
+        :rtype: bool
+        """
+        if self._closed:
+            raise exceptions.EmitterClosedError
+        self._start()
+        item = (message, Publisher.intern(publisher) if publisher is not None else None)
+        if self.backpressure == self.BLOCK:
+            await self._put(item)
+        elif not self._put_nowait(item):
+            return False
+        self.emitted += 1
+        return True
+
+    async def drain(self):
+        """Wait until all queued messages have been published."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self, drain: bool = True):
+        """Stop accepting messages and shut down workers.
+
+        Messages left in queue when workers stop, put by emits which waited
+        for free slot, are discarded and counted as dropped too.
+
+        :param drain: If True, publish queued messages before shutdown,
+                      otherwise queued messages are discarded and counted as dropped.
+        :type drain: bool
+        """
+        self._closed = True
+        if drain:
+            await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = ()
+        if self._queue is not None:
+            self._discard()
+
+    def _discard(self):
+        """Remove all queued messages, marking them as done."""
+        while self.depth:
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+
+    def _start(self):
+        """Create queue and worker tasks if not running yet."""
+        if self._tasks:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = tuple(asyncio.ensure_future(self._work()) for _ in range(self.workers))
+
+    async def _put(self, item: tuple):
+        """Put item into queue, waiting for free slot.
+
+        Item put after workers of closed emitter stopped is discarded.
+
+        :param item: Message and publisher pair
+        :type item: tuple
+        :raises eeee.exceptions.EmitterClosedError: Emitter closed error
+        """
+        await self._queue.put(item)
+        if self._closed and not self._tasks:
+            self._discard()
+            raise exceptions.EmitterClosedError
+
+    def _put_nowait(self, item: tuple) -> bool:
+        """Put item into queue applying non-blocking backpressure policy.
+
+        :param item: Message and publisher pair
+        :type item: tuple
+        :raises eeee.exceptions.QueueFullError: Queue full error
+        :return: True if item has been queued
+        :rtype: bool
+        """
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+            return True
+        if self.backpressure == self.RAISE:
+            raise exceptions.QueueFullError
+        self.dropped += 1
+        if self.backpressure == self.DROP_NEWEST:
+            return False
+        self._queue.get_nowait()
+        self._queue.task_done()
+        self._queue.put_nowait(item)
+        return True
+
+    async def _work(self):
+        """Publish queued messages until cancelled."""
+        while True:
+            message, publisher = await self._queue.get()
+            try:
+                await self.event.publish(message, publisher)
+            except Exception:
+                self.failed += 1
+            finally:
+                self._queue.task_done()
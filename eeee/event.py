@@ -1,17 +1,35 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import asyncio
-from collections import namedtuple
-from inspect import iscoroutinefunction
-from typing import Any, Union
-
-from eeee import exceptions
+import concurrent.futures
+import fnmatch
+import heapq
+import itertools
+import pickle
+import re
+import sys
+import time
+import weakref
+from collections import OrderedDict, deque, namedtuple
+from functools import lru_cache, partial
+from inspect import iscoroutinefunction, ismethod
+from typing import Any, AsyncIterable, Iterable, Union
+
+from eeee import codec, exceptions, tracing
 
 __author__ = 'Paweł Zadrożny'
 __copyright__ = 'Copyright (c) 2018, Pawelzny'
 
+_INTERNED = {}
+_REGEX_TYPE = type(re.compile(''))
+_STRATEGIES = ('first', 'any', 'all')
+_PROCESS_EXECUTOR = None
+_PROPAGATED = (asyncio.CancelledError, KeyboardInterrupt, SystemExit)
+
 
-def subscribe(event: "Event", publisher: Union["Publisher", str] = None):
+def subscribe(event: "Event", publisher: Union["Publisher", str] = None,
+              concurrency: int = None, executor: str = None, timeout: float = None,
+              weak: bool = False, rate_limit: "RateLimit" = None):
     """Decorator function which subscribe callable to event.
 
     :Example:
@@ -26,24 +44,34 @@ def subscribe(event: "Event", publisher: Union["Publisher", str] = None):
 
     :param event: Event Event object
     :type event: eeee.event.Event
-    :param publisher: Optional name or instance of Publisher
-    :type publisher: eeee.event.Publisher, str
+    :param publisher: Optional name, instance or pattern of Publisher
+    :type publisher: eeee.event.Publisher, eeee.event.PublisherPattern, str
+    :param concurrency: Optional limit of concurrent calls of this subscriber
+    :type concurrency: int
+    :param executor: Executor name, required for synchronous handlers
+    :type executor: str
+    :param timeout: Optional time limit of single call in seconds
+    :type timeout: float
+    :param weak: Hold only weak reference to handler
+    :type weak: bool
+    :param rate_limit: Optional rate limit of calls of this subscriber
+    :type rate_limit: eeee.event.RateLimit
     :return: decorator wrapper
     """
-    if publisher is not None:
-        publisher = Publisher(publisher)
+    publisher = _parse_publisher(publisher)
 
     def wrapper(subscriber: callable):
         """Register subscriber to event.
 
-        :param subscriber: Async function or class with async __call__ method
+        :param subscriber: Function or class with __call__ method
         :type subscriber: eeee.event.Subscriber, callable
-        :return: subscriber
+        :return: subscription
+        :rtype: eeee.event.Subscription
         """
-        subscriber = Subscriber(subscriber)
+        subscriber = Subscriber(subscriber, concurrency=concurrency, executor=executor,
+                                timeout=timeout, weak=weak, rate_limit=rate_limit)
         # noinspection PyProtectedMember
-        event._reg_sub(subscriber, publisher)
-        return subscriber
+        return event._reg_sub(subscriber, publisher)
 
     return wrapper
 
@@ -70,7 +98,33 @@ class Event:
     RETURN_EXCEPTIONS = False
     """If set to True will return handler's exception as result instead of raise it."""
 
+    MAX_CONCURRENCY = None
+    """If set, limits number of handlers running at once for this event."""
+
+    THREAD_EXECUTOR = None
+    """Executor for synchronous handlers. If None, default executor of event loop is used."""
+
+    PROCESS_EXECUTOR = None
+    """Executor for CPU bound handlers. If None, process pool shared by all events is used."""
+
+    PLAN_CACHE_SIZE = 1024
+    """Maximum number of cached dispatch plans, least recently used are evicted first."""
+
+    CODEC = codec.PickleCodec()
+    """Instance of :class:`eeee.codec.Codec` serializing messages for process executor."""
+
+    METRICS = None
+    """Instance of :class:`eeee.metrics.Metrics`. If None, events are not instrumented."""
+
+    HOOKS = ()
+    """Tuple of :class:`eeee.tracing.Hook` notified around publish and every handler call."""
+
+    COALESCE = None
+    """Instance of :class:`eeee.event.Coalescer`. If set, repeated publishes are merged."""
+
     _PubSub = namedtuple('PubSub', ['subscriber', 'publisher'])
+    _PlanCacheInfo = namedtuple('PlanCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+    _CoalesceInfo = namedtuple('CoalesceInfo', ['pending', 'merged', 'delivered', 'failed'])
 
     def __init__(self, name: Union["Event", str] = None):
         if name is None:
@@ -81,9 +135,34 @@ class Event:
             raise exceptions.NamingError(types=[self.__class__, str], wrong=str(type(name)))
 
         self.name = name
-        self.pub_sub = tuple()
+        self._routes = {}
+        self._names = {}
+        self._patterns = set()
+        self._sequence = itertools.count()
+        self._version = 0
+        self._plans = OrderedDict()
+        self._plans_key = None
+        self._plan_hits = 0
+        self._plan_misses = 0
+        self._limiter = None
+        self._payloads = None
+        self._coalescing = None
+        self._rate_limits = {}
         self.__is_enable = True
 
+    @property
+    def pub_sub(self) -> tuple:
+        """Read-only view of all subscriptions in order of registration.
+
+        Subscriptions are routed internally by publisher, this view
+        is rebuilt from the routing index on every access.
+
+        :return: Tuple of PubSub(subscriber, publisher) pairs
+        :rtype: tuple
+        """
+        return tuple(self._PubSub(subscription, subscription.publisher)
+                     for subscription in _merged(self._routes.values()))
+
     @property
     def is_enable(self):
         """Check if Event emitter is enabled.
@@ -92,7 +171,8 @@ class Event:
         """
         return self.__is_enable
 
-    async def publish(self, message: Any, publisher: Union["Publisher", str] = None):
+    async def publish(self, message: Any, publisher: Union["Publisher", str] = None,
+                      deadline: float = None, strategy: Union[str, "Reducer"] = None):
         """Propagate message to all interested in subscribers.
 
         If publisher is not set, then broadcast is meant for all subscribers.
@@ -117,24 +197,140 @@ class Event:
             >>> broadcast = Event('Broadcast')
             >>> result = await broadcast.publish({'message': 'non secret'})
 
+        Message for single handler is handled in task of caller, so context
+        variables set by handler are visible to caller, several handlers run
+        in separate tasks.
+
+        Deadline limits time of all handlers, handlers still running when
+        deadline passes are cancelled and reported as :class:`asyncio.TimeoutError`.
+
+        .. code-block:: python
+
+            >>> result = await broadcast.publish({'message': 'hurry'}, deadline=0.25)
+
+        Strategy reduces results to single value as handlers complete,
+        handlers still running when outcome is decided are cancelled.
+        Built-in strategies are "first" non-None result, "any" and "all",
+        custom strategy is an instance of :class:`Reducer`.
+
+        .. code-block:: python
+
+            >>> allowed = await broadcast.publish({'message': 'may I?'}, strategy='all')
+
+        Messages of publisher with rate limit are admitted first,
+        see :meth:`limit_publisher`.
+
+        When :attr:`COALESCE` is set, publish without strategy returns immediately
+        and message is delivered later, merged with other messages of the same key.
+        See :class:`Coalescer`.
+
         :param message: Literally anything.
         :type message: Any
         :param publisher: Optional name or instance of Publisher
         :type publisher: eeee.event.Publisher, str
-        :return: List of results from subscribed handlers or None if event is disabled.
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :param strategy: Optional name of built-in strategy or Reducer
+        :type strategy: str, eeee.event.Reducer
+        :raises eeee.exceptions.DurationError: Deadline is not a positive number
+        :raises eeee.exceptions.PolicyError: Unknown strategy
+        :raises eeee.exceptions.RateLimitError: Rate limit of publisher exceeded
+        :return: List of results from subscribed handlers, reduced value if strategy is set,
+                 or None if event is disabled, message is coalesced or dropped by rate limit.
+        """
+        return await self._publish(message, publisher, deadline, strategy)
+
+    async def publish_many(self, messages: Union[Iterable, AsyncIterable],
+                           publisher: Union["Publisher", str] = None, deadline: float = None):
+        """Propagate batch of messages to all interested in subscribers.
+
+        Publisher is resolved and routed once for whole batch and all handler
+        calls are scheduled together. Messages may be any iterable or async iterable,
+        async iterable is consumed before dispatch starts.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> my_event = Event('MyEvent')
+            >>> results = await my_event.publish_many(['first', 'second'], 'socket')
+            >>> results
+            [['first handled'], ['second handled']]
+
+        :param messages: Iterable or async iterable of messages.
+        :type messages: Iterable, AsyncIterable
+        :param publisher: Optional name or instance of Publisher
+        :type publisher: eeee.event.Publisher, str
+        :param deadline: Optional time limit in seconds, counted after messages are collected
+        :type deadline: float
+        :raises eeee.exceptions.DurationError: Deadline is not a positive number
+        :raises eeee.exceptions.RateLimitError: Rate limit of publisher exceeded
+        :return: List of result lists, one per message, or None if event is disabled
+                 or batch is dropped by rate limit.
         """
         if not self.is_enable:
             return None
 
-        publisher = Publisher(publisher) if publisher else publisher
+        _is_deadline(deadline)
+        publisher = Publisher.intern(publisher) if publisher is not None else None
+        messages = await _collect(messages)
+        if not await self._admit(publisher, len(messages)):
+            return None
+
+        return await self._dispatch_many(self._plan(publisher, len(messages)), messages,
+                                         publisher, deadline)
+
+    def publish_as_completed(self, message: Any, publisher: Union["Publisher", str] = None,
+                             deadline: float = None):
+        """Propagate message and iterate over results as handlers complete.
+
+        Each result is a pair of subscriber name and value returned by handler.
+        Exceptions raised by handlers, including :class:`asyncio.TimeoutError`,
+        are returned as values, never raised.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> my_event = Event('MyEvent')
+            >>> async for name, result in my_event.publish_as_completed('query'):
+            ...     print(name, result)
+
+        Handlers are started on first iteration, after message of publisher
+        with rate limit is admitted, see :meth:`limit_publisher`.
+        Use iterator as async context manager to cancel handlers
+        which are still running when block exits.
+
+        .. code-block:: python
+
+            >>> async with my_event.publish_as_completed('query') as results:
+            ...     async for name, result in results:
+            ...         if result is not None:
+            ...             break
+
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional name or instance of Publisher
+        :type publisher: eeee.event.Publisher, str
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :raises eeee.exceptions.DurationError: Deadline is not a positive number
+        :raises eeee.exceptions.RateLimitError: Rate limit of publisher exceeded,
+                                                raised on first iteration
+        :return: Async iterator of (subscriber name, result or exception) pairs.
+                 Empty if event is disabled or message is dropped by rate limit.
+        """
+        if not self.is_enable:
+            return _AsCompleted((), lambda: ())
 
-        coros = []
-        for ps in self.pub_sub:
-            if ps.publisher is None or (publisher is not None and ps.publisher == publisher):
-                coros.append(ps.subscriber(message, publisher, event=self.name))
-        return await asyncio.gather(*coros, return_exceptions=self.RETURN_EXCEPTIONS)
+        _is_deadline(deadline)
+        publisher = Publisher.intern(publisher) if publisher is not None else None
+        return self._as_completed(self._plan(publisher), message, publisher, deadline,
+                                  partial(self._admit, publisher))
 
-    def subscribe(self, publisher: Union["Publisher", str] = None):
+    def subscribe(self, publisher: Union["Publisher", str] = None, concurrency: int = None,
+                  executor: str = None, timeout: float = None, weak: bool = False,
+                  rate_limit: "RateLimit" = None):
         """Subscribe decorator integrated within Event object.
 
         :Example:
@@ -148,17 +344,116 @@ class Event:
 
         Subscribe method must be called to decorate handler.
 
-        :param publisher: Optional name or instance of Publisher
-        :type publisher: eeee.event.Publisher, str
+        Concurrency limits number of calls of this handler running at once,
+        other calls wait for free slot in order of arrival.
+
+        .. code-block:: python
+
+            >>> @my_event.subscribe(concurrency=10)
+            ... async def database_handler(message, publisher, event):
+            ...     pass # query database
+
+        Publisher may be a :class:`PublisherPattern` or compiled regular expression,
+        handler will receive messages from all matching publishers.
+        Names are never patterns, so publisher named ``what?`` matches only itself.
+
+        .. code-block:: python
+
+            >>> @my_event.subscribe(publisher=PublisherPattern('webhook:*'))
+            ... async def any_tenant_handler(message, publisher, event):
+            ...     pass # doo something
+
+        Timeout limits time of single call, late calls are cancelled
+        and reported as :class:`asyncio.TimeoutError`, see :attr:`RETURN_EXCEPTIONS`.
+
+        Synchronous handlers run in thread pool executor, see :attr:`THREAD_EXECUTOR`.
+
+        .. code-block:: python
+
+            >>> @my_event.subscribe(executor='thread')
+            ... def blocking_handler(message, publisher, event):
+            ...     pass # call blocking driver
+
+        Weak subscription does not keep handler, or owner of bound method, alive.
+        Subscription is removed as soon as handler is garbage collected,
+        so handler referenced nowhere else, like function decorated in place, is removed at once.
+
+        .. code-block:: python
+
+            >>> my_event.subscribe(weak=True)(connection.on_message)
+
+        Rate limit protects resource used by handler from bursts of messages,
+        see :class:`RateLimit`. Dropped calls return None.
+
+        .. code-block:: python
+
+            >>> @my_event.subscribe(rate_limit=RateLimit(100, policy=RateLimit.DROP))
+            ... async def sms_handler(message, publisher, event):
+            ...     pass # call paid API
+
+        Decorated handler becomes :class:`Subscription`, handle which cancels
+        this very subscription, also when used as context manager.
+
+        .. code-block:: python
+
+            >>> with my_event.subscribe()(connection.on_message):
+            ...     await connection.serve()
+
+        :param publisher: Optional name, instance or pattern of Publisher
+        :type publisher: eeee.event.Publisher, eeee.event.PublisherPattern, str
+        :param concurrency: Optional limit of concurrent calls of this subscriber
+        :type concurrency: int
+        :param executor: Executor name, required for synchronous handlers
+        :type executor: str
+        :param timeout: Optional time limit of single call in seconds
+        :type timeout: float
+        :param weak: Hold only weak reference to handler
+        :type weak: bool
+        :param rate_limit: Optional rate limit of calls of this subscriber
+        :type rate_limit: eeee.event.RateLimit
         :return: subscribe decorator
         """
-        return subscribe(self, publisher)  # delegate to subscribe decorator
+        # delegate to subscribe decorator
+        return subscribe(self, publisher, concurrency, executor, timeout, weak, rate_limit)
+
+    def subscribe_many(self, handlers: Iterable, publisher: Union["Publisher", str] = None,
+                       concurrency: int = None, executor: str = None, timeout: float = None,
+                       weak: bool = False, rate_limit: "RateLimit" = None) -> list:
+        """Subscribe many handlers with the same options.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> subscriptions = my_event.subscribe_many([audit, notify], publisher='webhook')
+            >>> my_event.unsubscribe_many(subscriptions)
+
+        :param handlers: Iterable of functions or classes with __call__ method
+        :type handlers: Iterable
+        :param publisher: Optional name, instance or pattern of Publisher
+        :type publisher: eeee.event.Publisher, eeee.event.PublisherPattern, str
+        :param concurrency: Optional limit of concurrent calls of each subscriber
+        :type concurrency: int
+        :param executor: Executor name, required for synchronous handlers
+        :type executor: str
+        :param timeout: Optional time limit of single call in seconds
+        :type timeout: float
+        :param weak: Hold only weak references to handlers
+        :type weak: bool
+        :param rate_limit: Optional rate limit shared by calls of all subscribers
+        :type rate_limit: eeee.event.RateLimit
+        :return: List of subscriptions in order of handlers
+        :rtype: list
+        """
+        return list(map(subscribe(self, publisher, concurrency, executor, timeout, weak,
+                                  rate_limit), handlers))
 
     def unsubscribe(self, subscriber: Union["Subscriber", callable],
                     publisher: Union["Publisher", str] = None):
         """Unsubscribe subscribed handler from event.
 
         If publisher had been set on subscribe, then must be provided as well.
+        All subscriptions of handler with that publisher are removed.
 
         :Example:
 
@@ -172,11 +467,122 @@ class Event:
         :param publisher: Optional name or instance of Publisher
         :type publisher: eeee.event.Publisher, str
         """
-        subscriber = Subscriber(subscriber)
-        if publisher is not None:
-            publisher = Publisher(publisher)
-        pub_sub = self._PubSub(subscriber=subscriber, publisher=publisher)
-        self.pub_sub = tuple(ps for ps in self.pub_sub if ps != pub_sub)
+        name, handler = _parse_handler(subscriber)
+        _is_callable(handler)
+        key = (name, _parse_publisher(publisher))
+        for subscription in tuple(self._names.get(key, {}).values()):
+            self._remove(subscription)
+
+    def unsubscribe_many(self, subscribers: Iterable, publisher: Union["Publisher", str] = None):
+        """Unsubscribe many handlers or subscriptions.
+
+        Subscriptions are cancelled regardless of publisher,
+        other handlers are unsubscribed from publisher like in :meth:`unsubscribe`.
+
+        :param subscribers: Iterable of subscriptions or handlers
+        :type subscribers: Iterable
+        :param publisher: Optional name or instance of Publisher
+        :type publisher: eeee.event.Publisher, str
+        """
+        for subscriber in subscribers:
+            if isinstance(subscriber, Subscription) and subscriber.event is self:
+                subscriber.cancel()
+            else:
+                self.unsubscribe(subscriber, publisher)
+
+    def plan_cache_info(self):
+        """Report dispatch plan cache statistics.
+
+        Dispatch plan is a tuple of handlers matching publisher,
+        compiled once and reused until subscriptions change.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> my_event.plan_cache_info()
+            PlanCacheInfo(hits=41, misses=1, maxsize=1024, currsize=1)
+
+        :return: Named tuple with hits, misses, maxsize and currsize
+        :rtype: tuple
+        """
+        return self._PlanCacheInfo(hits=self._plan_hits, misses=self._plan_misses,
+                                   maxsize=self.PLAN_CACHE_SIZE, currsize=len(self._plans))
+
+    def limit_publisher(self, publisher: Union["Publisher", str, None],
+                        rate_limit: "RateLimit" = None) -> "RateLimit":
+        """Set rate limit of messages published by publisher.
+
+        Messages of :meth:`publish` and :meth:`publish_many` take tokens
+        before they are dispatched, so noisy publisher does not starve
+        other publishers. Publisher None limits broadcast messages.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> limit = my_event.limit_publisher('crawler', RateLimit(50, policy=RateLimit.DROP))
+            >>> await my_event.publish('page', 'crawler')
+            >>> limit.stats().dropped
+            0
+
+        :param publisher: Name or instance of Publisher, or None
+        :type publisher: eeee.event.Publisher, str
+        :param rate_limit: Rate limit, None removes limit of publisher
+        :type rate_limit: eeee.event.RateLimit
+        :return: Rate limit
+        :rtype: eeee.event.RateLimit
+        """
+        publisher = Publisher.intern(publisher) if publisher is not None else None
+        if rate_limit is None:
+            self._rate_limits.pop(publisher, None)
+        else:
+            self._rate_limits[publisher] = rate_limit
+        return rate_limit
+
+    async def flush(self) -> list:
+        """Deliver coalesced messages without waiting for their window.
+
+        Also waits for deliveries started when window passed.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> my_event.COALESCE = Coalescer()
+            >>> for progress in range(100):
+            ...     await my_event.publish(progress)
+            >>> await my_event.flush()
+            [['99 handled']]
+
+        :return: List of result lists, one per delivered message, in order of first publish,
+                 None for messages dropped because event is disabled.
+        :rtype: list
+        """
+        if self._coalescing is None:
+            return []
+        return await self._coalescing.flush()
+
+    def coalesce_info(self):
+        """Report coalescing statistics.
+
+        Merged is number of publishes merged into other message,
+        delivered is number of messages delivered to handlers
+        and failed is number of deliveries raising after window passed.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> my_event.coalesce_info()
+            CoalesceInfo(pending=2, merged=998, delivered=10, failed=0)
+
+        :return: Named tuple with pending, merged, delivered and failed
+        :rtype: tuple
+        """
+        coalescing = self._coalescing or _Coalescing(self)
+        return self._CoalesceInfo(pending=len(coalescing.pending), merged=coalescing.merged,
+                                  delivered=coalescing.delivered, failed=coalescing.failed)
 
     def enable(self):
         """Enable event.
@@ -209,15 +615,510 @@ class Event:
         return self
 
     def _reg_sub(self, subscriber: Union["Subscriber", callable],
-                 publisher: Union["Publisher", str] = None):
-        """Append subscriber to list of subscribers.
+                 publisher: Union["Publisher", str] = None) -> "Subscription":
+        """Add subscription to routing index.
+
+        Subscriptions are routed by interned publisher or publisher pattern,
+        subscriptions without publisher are kept in wildcard route under None.
+        Routes and index of names are ordered dicts keyed by registration sequence,
+        so both registration and removal take constant time.
 
         :param subscriber: Async function or class with async __call__ method
         :type subscriber: eeee.event.Subscriber, callable
+        :param publisher: Optional name, instance or pattern of Publisher
+        :type publisher: eeee.event.Publisher, eeee.event.PublisherPattern, str
+        :return: Subscription
+        :rtype: eeee.event.Subscription
+        """
+        if not isinstance(subscriber, Subscriber):
+            subscriber = Subscriber(subscriber)
+        subscription = Subscription(subscriber, self, _parse_publisher(publisher),
+                                    next(self._sequence))
+        self._version += 1
+        self._routes.setdefault(subscription.publisher, OrderedDict())[subscription.key] = \
+            subscription
+        self._names.setdefault((subscription.name, subscription.publisher),
+                               OrderedDict())[subscription.key] = subscription
+        if isinstance(subscription.publisher, PublisherPattern):
+            self._patterns.add(subscription.publisher)
+        if subscription.weak:
+            subscription.handler.watch(self._prune, subscription)
+        return subscription
+
+    def _remove(self, subscription: "Subscription"):
+        """Remove subscription from routing index.
+
+        :param subscription: Active subscription of this event
+        :type subscription: eeee.event.Subscription
+        """
+        self._version += 1
+        publisher = subscription.publisher
+        _discard(self._names, (subscription.name, publisher), subscription.key)
+        if not _discard(self._routes, publisher, subscription.key):
+            self._patterns.discard(publisher)
+
+    # noinspection PyUnusedLocal
+    def _prune(self, handler: "_WeakHandler", subscription: "Subscription"):
+        """Cancel subscription of garbage collected handler.
+
+        :param handler: Weak handler of dead subscriber
+        :type handler: eeee.event._WeakHandler
+        :param subscription: Subscription of handler
+        :type subscription: eeee.event.Subscription
+        """
+        subscription.cancel()
+
+    def _plan(self, publisher: "Publisher" = None, count: int = 1) -> tuple:
+        """Get dispatch plan for publisher.
+
+        Plans are invalidated as soon as subscription version, or any of
+        :attr:`MAX_CONCURRENCY`, :attr:`METRICS` and :attr:`HOOKS` compiled into handlers changes.
+        Called once per publish, so published messages are recorded here.
+
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param count: Number of messages published with plan
+        :type count: int
+        :return: Tuple of handlers
+        :rtype: tuple
+        """
+        key = (self._version, self.MAX_CONCURRENCY, self.METRICS, self.HOOKS)
+        if self._plans_key != key:
+            self._plans.clear()
+            self._plans_key = key
+        plan = self._plans.get(publisher)
+        if plan is None:
+            plan = self._compile_plan(publisher)
+        else:
+            self._plan_hits += 1
+            self._plans.move_to_end(publisher)
+        if self.METRICS is not None:
+            self.METRICS.observe_publish(self.name, len(plan), count)
+        return plan
+
+    def _compile_plan(self, publisher: "Publisher" = None) -> tuple:
+        """Compile and cache dispatch plan for publisher.
+
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :return: Tuple of handlers
+        :rtype: tuple
+        """
+        self._plan_misses += 1
+        subscribers = tuple(self._match(publisher))
+        handlers = [self._bind(subscriber, publisher) for subscriber in subscribers]
+        plan = self._plans[publisher] = _Plan(handlers, subscribers, self.HOOKS)
+        if len(self._plans) > self.PLAN_CACHE_SIZE:
+            self._plans.popitem(last=False)
+        return plan
+
+    def _bind(self, subscriber: "Subscriber", publisher: "Publisher" = None) -> callable:
+        """Bind subscriber's handler with executor, limits, timeout and instrumentation.
+
+        Subscriber slot is acquired before Event slot, so calls waiting
+        for busy subscriber do not hold Event slots. Timeout includes
+        time spent waiting for free slot.
+
+        :param subscriber: Instance of Subscriber
+        :type subscriber: eeee.event.Subscriber
+        :param publisher: Optional instance of Publisher, plan is compiled for
+        :type publisher: eeee.event.Publisher
+        :return: Handler ready to call
+        :rtype: callable
+        """
+        handler = self._in_executor(subscriber)
+        if self.MAX_CONCURRENCY is not None:
+            handler = self._event_limiter().bind(handler)
+        handler = self._instrumented(subscriber, publisher, _guarded(subscriber, handler))
+        if subscriber.executor == Subscriber.PROCESS:
+            handler = self._serialized(handler)
+        return handler
+
+    def _instrumented(self, subscriber: "Subscriber", publisher: "Publisher",
+                      handler: callable) -> callable:
+        """Wrap handler with metrics and tracing hooks, if any.
+
+        :param subscriber: Instance of Subscriber
+        :type subscriber: eeee.event.Subscriber
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param handler: Async function or class with async __call__ method
+        :type handler: callable
+        :return: Instrumented handler
+        :rtype: callable
+        """
+        if self.METRICS is not None:
+            handler = self.METRICS.bind(self.name, subscriber.name, handler)
+        if self.HOOKS:
+            handler = tracing.bind(self.HOOKS, self.name, publisher, subscriber.name, handler)
+        return handler
+
+    def _event_limiter(self) -> "_Limiter":
+        """Get limiter shared by all handlers of event.
+
+        :return: Limiter of MAX_CONCURRENCY
+        :rtype: eeee.event._Limiter
+        """
+        if self._limiter is None or self._limiter.limit != self.MAX_CONCURRENCY:
+            self._limiter = _Limiter(self.MAX_CONCURRENCY)
+        return self._limiter
+
+    def _event_coalescing(self) -> "_Coalescing":
+        """Get messages of event waiting for delivery.
+
+        :return: Coalescing state of event
+        :rtype: eeee.event._Coalescing
+        """
+        if self._coalescing is None:
+            self._coalescing = _Coalescing(self)
+        return self._coalescing
+
+    def _in_executor(self, subscriber: "Subscriber") -> callable:
+        """Wrap subscriber's handler to run in its executor.
+
+        :param subscriber: Instance of Subscriber
+        :type subscriber: eeee.event.Subscriber
+        :return: Async handler
+        :rtype: callable
+        """
+        if subscriber.executor == Subscriber.THREAD:
+            return self._in_thread(subscriber.handler)
+        if subscriber.executor == Subscriber.PROCESS:
+            return self._in_process(subscriber.handler)
+        return subscriber.handler
+
+    def _in_thread(self, handler: callable) -> callable:
+        """Wrap synchronous handler to run in thread executor.
+
+        :param handler: Function or class with __call__ method
+        :type handler: callable
+        :return: Async handler
+        :rtype: callable
+        """
+        async def threaded(**kwargs):
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self.THREAD_EXECUTOR, partial(handler, **kwargs))
+
+        return threaded
+
+    def _in_process(self, handler: callable) -> callable:
+        """Wrap synchronous handler to run in process executor.
+
+        Wrapped handler accepts serialized payload instead of message.
+        Message itself is passed along only for tracing and is not sent to worker.
+
+        :param handler: Picklable function or class with __call__ method
+        :type handler: callable
+        :return: Async handler
+        :rtype: callable
+        """
+        # noinspection PyUnusedLocal
+        async def in_process(payload: bytes, message: Any = None):
+            loop = asyncio.get_event_loop()
+            executor = self.PROCESS_EXECUTOR or _process_executor()
+            return await loop.run_in_executor(executor, _call_serialized, handler, self.CODEC,
+                                              payload)
+
+        return in_process
+
+    def _serialized(self, handler: callable) -> callable:
+        """Wrap handler to serialize message when handler is called.
+
+        Serialization happens immediately, not when returned awaitable is awaited,
+        so handlers invoked together share payload of the same message.
+        Message is passed along with payload, so call spans record it.
+
+        :param handler: Handler accepting serialized payload and message
+        :type handler: callable
+        :return: Handler accepting message, publisher and event
+        :rtype: callable
+        """
+        def serialized(message, publisher, event):
+            payloads = self._payloads
+            if payloads is None:
+                return handler(payload=_serialize(self.CODEC, message, publisher, event),
+                               message=message)
+            key = id(message)
+            if key not in payloads:
+                payloads[key] = _serialize(self.CODEC, message, publisher, event)
+            return handler(payload=payloads[key], message=message)
+
+        return serialized
+
+    async def _dispatch(self, plan: tuple, message: Any, publisher: "Publisher" = None,
+                        deadline: float = None, origin: Any = None):
+        """Call handlers from dispatch plan.
+
+        Handlers are called directly, without Subscriber wrapper.
+        Empty plan returns immediately and single handler is awaited in place,
+        only larger plans are gathered. Plans with hooks run in publish span.
+
+        Single handler awaited in place runs in context of caller's task,
+        so context variables it sets remain set after publish returns.
+        Gathered handlers run in tasks with copied context.
+
+        :param plan: Tuple of handlers
+        :type plan: tuple
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :param origin: Optional hook which received message
+        :type origin: Any
+        :return: List of results from handlers
+        :rtype: list
+        """
+        if plan.hooks:
+            span = tracing.Span(tracing.Span.PUBLISH, self.name, publisher, message=message,
+                                origin=origin)
+            return await tracing.trace(plan.hooks, span, self._dispatch(
+                plan.untraced, message, publisher, deadline))
+        if not plan:
+            return []
+        if len(plan) == 1:
+            return [await self._call(plan[0], message, publisher, deadline)]
+        return await asyncio.gather(*_within(self._invoke(plan, (message,), publisher), deadline),
+                                    return_exceptions=self.RETURN_EXCEPTIONS)
+
+    async def _publish(self, message: Any, publisher: Union["Publisher", str] = None,
+                       deadline: float = None, strategy: Union[str, "Reducer"] = None,
+                       origin: Any = None):
+        """Publish message received from origin.
+
+        Origin is carried with message to its publish span, also when message
+        is coalesced and delivered later, so hook which received message
+        from remote node does not send it back.
+
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional name or instance of Publisher
+        :type publisher: eeee.event.Publisher, str
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :param strategy: Optional name of built-in strategy or Reducer
+        :type strategy: str, eeee.event.Reducer
+        :param origin: Optional hook which received message
+        :type origin: Any
+        :return: List of results from subscribed handlers, reduced value if strategy is set,
+                 or None if event is disabled, message is coalesced or dropped by rate limit.
+        """
+        if not self.is_enable:
+            return None
+
+        _is_deadline(deadline)
+        if strategy is not None or self.COALESCE is not None or self._rate_limits:
+            return await self._publish_by_policy(message, publisher, deadline, strategy, origin)
+        publisher = Publisher.intern(publisher) if publisher is not None else None
+
+        return await self._dispatch(self._plan(publisher), message, publisher, deadline, origin)
+
+    async def _publish_by_policy(self, message: Any, publisher: Union["Publisher", str],
+                                 deadline: float, strategy: Union[str, "Reducer"] = None,
+                                 origin: Any = None):
+        """Publish message admitted by rate limit, reducing results or coalescing message.
+
+        :param message: Literally anything.
+        :type message: Any
         :param publisher: Optional name or instance of Publisher
         :type publisher: eeee.event.Publisher, str
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :param strategy: Optional name of built-in strategy or Reducer
+        :type strategy: str, eeee.event.Reducer
+        :param origin: Optional hook which received message
+        :type origin: Any
+        :raises eeee.exceptions.PolicyError: Unknown strategy
+        :raises eeee.exceptions.RateLimitError: Rate limit of publisher exceeded
+        :return: List of results from handlers, reduced value if strategy is set,
+                 or None if message is coalesced or dropped
+        """
+        publisher = Publisher.intern(publisher) if publisher is not None else None
+        if not await self._admit(publisher):
+            return None
+        if strategy is not None:
+            return await self._reduce(self._plan(publisher), message, publisher, deadline,
+                                      _parse_strategy(strategy), origin)
+        if self.COALESCE is None:
+            return await self._dispatch(self._plan(publisher), message, publisher, deadline,
+                                        origin)
+        return self._event_coalescing().put(message, publisher, deadline, origin)
+
+    async def _admit(self, publisher: "Publisher" = None, count: int = 1) -> bool:
+        """Take tokens of publisher's rate limit, if any.
+
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param count: Number of messages
+        :type count: int
+        :raises eeee.exceptions.RateLimitError: Rate limit of publisher exceeded
+        :return: True if messages may be dispatched
+        :rtype: bool
+        """
+        rate_limit = self._rate_limits.get(publisher)
+        return rate_limit is None or await rate_limit.acquire(count)
+
+    async def _dispatch_many(self, plan: tuple, messages: list, publisher: "Publisher" = None,
+                             deadline: float = None):
+        """Call handlers from dispatch plan with every message of batch.
+
+        Plans with hooks run in single publish span of whole batch.
+
+        :param plan: Tuple of handlers
+        :type plan: tuple
+        :param messages: List of messages
+        :type messages: list
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :return: List of result lists, one per message
+        :rtype: list
+        """
+        if plan.hooks:
+            span = tracing.Span(tracing.Span.PUBLISH, self.name, publisher, message=messages,
+                                batch=True)
+            return await tracing.trace(plan.hooks, span, self._dispatch_many(
+                plan.untraced, messages, publisher, deadline))
+        if not plan:
+            return [[] for _ in messages]
+        results = await asyncio.gather(*_within(self._invoke(plan, messages, publisher), deadline),
+                                       return_exceptions=self.RETURN_EXCEPTIONS)
+        size = len(plan)
+        return [results[i:i + size] for i in range(0, len(results), size)]
+
+    async def _reduce(self, plan: tuple, message: Any, publisher: "Publisher",
+                      deadline: float, reducer: "Reducer", origin: Any = None):
+        """Reduce results of handlers as they complete, cancel the rest when done.
+
+        Plans with hooks run in publish span.
+
+        :param plan: Tuple of handlers
+        :type plan: tuple
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :param reducer: Reducer
+        :type reducer: eeee.event.Reducer
+        :param origin: Optional hook which received message
+        :type origin: Any
+        :return: Reduced value
+        """
+        if plan.hooks:
+            span = tracing.Span(tracing.Span.PUBLISH, self.name, publisher, message=message,
+                                origin=origin)
+            return await tracing.trace(plan.hooks, span, self._reduce(
+                plan.untraced, message, publisher, deadline, reducer))
+        async with self._as_completed(plan, message, publisher, deadline) as results:
+            return await self._fold(results, reducer)
+
+    async def _fold(self, results: "_AsCompleted", reducer: "Reducer"):
+        """Fold results with reducer until it is done.
+
+        :param results: Async iterator of (subscriber name, result or exception) pairs
+        :type results: eeee.event._AsCompleted
+        :param reducer: Reducer
+        :type reducer: eeee.event.Reducer
+        :return: Reduced value
+        """
+        value = reducer.initial
+        async for _, result in results:
+            if isinstance(result, Exception) and not self.RETURN_EXCEPTIONS:
+                raise result
+            value = reducer.function(value, result)
+            if reducer.until(value):
+                break
+        return value
+
+    def _as_completed(self, plan: tuple, message: Any, publisher: "Publisher" = None,
+                      deadline: float = None, admit: callable = None) -> "_AsCompleted":
+        """Create iterator over results of handlers as they complete.
+
+        :param plan: Tuple of handlers
+        :type plan: tuple
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :param admit: Optional coroutine function admitting message, called on first iteration
+        :type admit: callable
+        :return: Async iterator of (subscriber name, result or exception) pairs
+        :rtype: eeee.event._AsCompleted
+        """
+        return _AsCompleted([subscriber.name for subscriber in plan.subscribers],
+                            lambda: _within(self._invoke(plan, (message,), publisher), deadline),
+                            admit)
+
+    def _invoke(self, plan: tuple, messages: Iterable, publisher: "Publisher" = None) -> list:
+        """Call every handler from dispatch plan with every message.
+
+        Messages for process executor are serialized during this call,
+        each message only once no matter how many handlers receive it.
+
+        :param plan: Tuple of handlers
+        :type plan: tuple
+        :param messages: Iterable of messages
+        :type messages: Iterable
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :return: List of awaitables
+        :rtype: list
+        """
+        self._payloads = {}
+        try:
+            return [handler(message=message, publisher=publisher, event=self.name)
+                    for message in messages for handler in plan]
+        finally:
+            self._payloads = None
+
+    async def _call(self, handler: callable, message: Any, publisher: "Publisher" = None,
+                    deadline: float = None):
+        """Await single handler.
+
+        Exceptions are returned as :func:`asyncio.gather` returns them,
+        except cancellation, which can not be told apart from cancellation of caller.
+
+        :param handler: Async function or class with async __call__ method
+        :type handler: callable
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :return: Result of handler, or exception if RETURN_EXCEPTIONS is set
         """
-        self.pub_sub += (self._PubSub(subscriber=subscriber, publisher=publisher),)
+        awaitable = handler(message=message, publisher=publisher, event=self.name)
+        try:
+            return await (awaitable if deadline is None else asyncio.wait_for(awaitable, deadline))
+        except BaseException as exc:
+            if not self.RETURN_EXCEPTIONS or isinstance(exc, _PROPAGATED):
+                raise
+            return exc
+
+    def _match(self, publisher: "Publisher" = None):
+        """Find subscribers interested in message from publisher.
+
+        Only wildcard route, route of given publisher and routes of patterns
+        matching publisher name are visited, merged in order of registration.
+        Patterns are evaluated here, so once per publisher thanks to plan cache.
+
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :return: Iterator of subscriptions
+        """
+        routes = [self._routes.get(None, {})]
+        if publisher is not None:
+            routes.append(self._routes.get(publisher, {}))
+            routes.extend(self._routes[pattern] for pattern in self._patterns
+                          if pattern.match(publisher.name))
+        return _merged(routes)
 
 
 class Publisher:
@@ -228,7 +1129,8 @@ class Publisher:
     It is recommended to use Publisher instance.
 
     Two instances of the same name are considered equal but not the same.
-    Publisher is not a singleton.
+    Publisher is not a singleton, use :meth:`Publisher.intern` to get
+    shared instance. Publishers are hashable and may be used as dict keys.
 
     :Example:
 
@@ -264,27 +1166,60 @@ class Publisher:
     :type name: eeee.event.Publisher, str
     """
 
+    __slots__ = ('name', '__weakref__')
+
     def __init__(self, name: Union["Publisher", str]):
         if isinstance(name, self.__class__):
             name = name.name
-        elif type(name) is str:
-            name = name
-        else:
+        elif type(name) is not str:
             raise exceptions.NamingError(types=[self.__class__, str], wrong=str(type(name)))
-        self.name = name
-        self.__template = str(self.__class__) + '{name}</class>'
-        self.__id = self.__template.format(name=self.name)
+        self.name = sys.intern(name)
 
     def __str__(self):
         return str(self.id)
 
     def __eq__(self, other):
+        if other is self:
+            return True
         if isinstance(other, self.__class__):
-            return self.id == other.id
+            return self.name == other.name and type(self) is type(other)
         if type(other) is str:
-            return self.id == self.__template.format(name=other)
+            return self.name == other
         return False
 
+    def __hash__(self):
+        return hash(self.name)
+
+    @classmethod
+    def intern(cls, name: Union["Publisher", str]) -> "Publisher":
+        """Get shared instance of Publisher.
+
+        Interned instances are cached by name for as long as anything
+        holds a reference to them, so the same name resolves to the very same
+        object and equality becomes an identity check.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> Publisher.intern('Broadcaster') is Publisher.intern('Broadcaster')
+            True
+
+        :param name: Name of Publisher
+        :type name: eeee.event.Publisher, str
+        :return: Interned Publisher
+        :rtype: eeee.event.Publisher
+        """
+        if isinstance(name, cls):
+            name = name.name
+        interned = _INTERNED.get(cls)
+        if interned is None:
+            interned = _INTERNED[cls] = weakref.WeakValueDictionary()
+        publisher = interned.get(name) if type(name) is str else None
+        if publisher is None:
+            publisher = interned[name] = cls(name)
+        return publisher
+
     @property
     def id(self) -> str:
         """Publisher identification.
@@ -292,7 +1227,62 @@ class Publisher:
         :return: string ID
         :rtype: str
         """
-        return self.__id
+        return _class_prefix(self.__class__) + self.name + '</class>'
+
+
+class PublisherPattern:
+    """Pattern matching names of publishers.
+
+    Glob strings, e.g. ``webhook:*``, and compiled regular expressions are accepted.
+    Name matches only if whole name matches the pattern.
+
+    Patterns are opt-in: glob strings must be wrapped in PublisherPattern,
+    compiled regular expressions are wrapped on subscribe.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> PublisherPattern('webhook:*').match('webhook:tenant-123')
+        True
+
+        >>> PublisherPattern(re.compile(r'webhook:tenant-\\d+')).match('webhook:tenant-x')
+        False
+
+    :param pattern: Glob string or compiled regular expression
+    :type pattern: str, re.Pattern
+    :raises eeee.exceptions.NamingError: Naming error
+    """
+
+    __slots__ = ('pattern', '_regex')
+
+    def __init__(self, pattern: Union[str, Any]):
+        if isinstance(pattern, _REGEX_TYPE):
+            regex = pattern
+        elif type(pattern) is str:
+            regex = re.compile(fnmatch.translate(pattern))
+        else:
+            raise exceptions.NamingError(types=[str, _REGEX_TYPE], wrong=str(type(pattern)))
+        self.pattern = regex.pattern if isinstance(pattern, _REGEX_TYPE) else pattern
+        self._regex = regex
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(self.__class__.__name__, self.pattern)
+
+    def __eq__(self, other):
+        return isinstance(other, PublisherPattern) and self._regex == other._regex
+
+    def __hash__(self):
+        return hash(self._regex)
+
+    def match(self, name: str) -> bool:
+        """Check if publisher name matches the pattern.
+
+        :param name: Publisher name
+        :type name: str
+        :return: Boolean
+        """
+        return self._regex.fullmatch(name) is not None
 
 
 class Subscriber:
@@ -305,7 +1295,7 @@ class Subscriber:
     Subscriber is not meant to be used outside of Event context.
 
     Two instances of the same name are considered equal but not the same.
-    Subscriber is not a singleton.
+    Subscriber is not a singleton. Subscribers are hashable by name.
 
     :Example:
 
@@ -327,39 +1317,1058 @@ class Subscriber:
 
         >>> result = await sub('a message', Publisher('global'), 'mock event')
 
+    Synchronous handlers must be marked to run in thread or process executor.
+    Handlers for process executor must be picklable, e.g. module level functions.
 
-    :param handler: Async function or class with async __call__ method
+    .. code-block:: python
+
+        >>> def blocking_handler(message, publisher, event):
+        ...     pass
+        ...
+        >>> sub = Subscriber(blocking_handler, executor=Subscriber.THREAD)
+
+    Weak subscriber holds only weak reference to handler, or to owner
+    of bound method. Calls of handler which has been garbage collected return None.
+
+    .. code-block:: python
+
+        >>> sub = Subscriber(connection.on_message, weak=True)
+
+
+    :param handler: Function or class with __call__ method
     :type handler: eeee.event.Subscriber, callable
+    :param concurrency: Optional limit of concurrent calls of handler
+    :type concurrency: int
+    :param executor: Executor name, required for synchronous handlers
+    :type executor: str
+    :param timeout: Optional time limit of single call in seconds
+    :type timeout: float
+    :param weak: Hold only weak reference to handler
+    :type weak: bool
+    :param rate_limit: Optional rate limit of calls of handler
+    :type rate_limit: eeee.event.RateLimit
+    :raises eeee.exceptions.HandlerError: Handler does not support weak references
+    :raises eeee.exceptions.NotCoroutineError: Synchronous handler without executor
+    :raises eeee.exceptions.LimitError: Limit error
+    :raises eeee.exceptions.DurationError: Timeout is not a positive number
+    :raises eeee.exceptions.PolicyError: Unknown executor
+    :raises eeee.exceptions.ExecutorError: Coroutine marked to run in executor,
+                                           or weak handler marked to run in process executor
+    :raises eeee.exceptions.NotPicklableError: Handler for process executor is not picklable
     """
 
-    def __init__(self, handler: Union["Subscriber", callable]):
-        self.name, self.handler = _parse_handler(handler)
+    THREAD = 'thread'
+    """Run synchronous handler in thread executor."""
+
+    PROCESS = 'process'
+    """Run synchronous, picklable handler in process executor."""
+
+    EXECUTORS = (THREAD, PROCESS)
+    """All executor names."""
+
+    __slots__ = ('name', 'handler', 'limiter', 'executor', 'timeout', 'rate_limit',
+                 '__weakref__')
+
+    def __init__(self, handler: Union["Subscriber", callable], concurrency: int = None,
+                 executor: str = None, timeout: float = None, weak: bool = False,
+                 rate_limit: "RateLimit" = None):
+        if isinstance(handler, Subscriber):
+            concurrency = handler.concurrency if concurrency is None else concurrency
+            executor = handler.executor if executor is None else executor
+            timeout = handler.timeout if timeout is None else timeout
+            rate_limit = handler.rate_limit if rate_limit is None else rate_limit
+        name, handler = _parse_handler(handler)
+        self.rate_limit = rate_limit
+        self.name = sys.intern(name)
+        self.limiter = None if concurrency is None else _Limiter(concurrency)
+        if timeout is not None:
+            _is_duration(timeout)
+        self.timeout = timeout
 
         # handler validation
-        _is_callable(self.handler)
-        _is_coro(self.handler)
-
-        self.__template = str(self.__class__) + '{name}</class>'
-        self.__id = self.__template.format(name=self.name)
+        _is_callable(handler)
+        self.executor = _parse_executor(handler, executor)
+        if weak and self.executor == self.PROCESS:
+            raise exceptions.ExecutorError('Weak handler can not run in process executor.')
+        self.handler = _weak_handler(handler) if weak else handler
 
     def __eq__(self, other):
+        if other is self:
+            return True
         if isinstance(other, self.__class__):
-            return self.id == other.id
+            return self.name == other.name and type(self) is type(other)
         if type(other) is str:
-            return self.id == self.__template.format(name=other)
+            return self.name == other
         return False
 
+    def __hash__(self):
+        return hash(self.name)
+
     async def __call__(self, message, publisher, event):
-        return await self.handler(message=message, publisher=publisher, event=event)
+        if self.executor is None:
+            return await self.handler(message=message, publisher=publisher, event=event)
+        loop = asyncio.get_event_loop()
+        if self.executor == self.PROCESS:
+            return await loop.run_in_executor(_process_executor(), _call_serialized, self.handler,
+                                              Event.CODEC,
+                                              _serialize(Event.CODEC, message, publisher, event))
+        return await loop.run_in_executor(None, partial(self.handler, message=message,
+                                                        publisher=publisher, event=event))
 
     @property
-    def id(self):
-        """Subscriber identification.
+    def weak(self) -> bool:
+        """Tell if subscriber holds only weak reference to handler.
+
+        :return: Boolean
+        """
+        return isinstance(self.handler, _WeakHandler)
+
+    @property
+    def concurrency(self):
+        """Limit of concurrent calls of handler.
+
+        :return: Limit or None if unlimited
+        :rtype: int
+        """
+        return None if self.limiter is None else self.limiter.limit
+
+    @property
+    def id(self):
+        """Subscriber identification.
 
         :return: string ID
         :rtype: str
         """
-        return self.__id
+        return _class_prefix(self.__class__) + self.name + '</class>'
+
+
+class Subscription(Subscriber):
+    """Subscriber registered to Event, handle of single subscription.
+
+    Returned by subscribe decorator. Cancelling subscription removes
+    only this registration, in constant time.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> subscription = my_event.subscribe('socket')(connection.on_message)
+        >>> subscription.cancel()
+        >>> subscription.active
+        False
+
+    Subscription is also context manager, cancelled on exit.
+
+    .. code-block:: python
+
+        >>> with my_event.subscribe()(connection.on_message):
+        ...     await connection.serve()
+
+    Subscriptions are equal only to themselves, so handles of the same handler
+    registered several times are distinct. Subscription is still equal
+    to plain :class:`Subscriber` of its handler and to its name.
+
+    :param subscriber: Instance of Subscriber
+    :type subscriber: eeee.event.Subscriber
+    :param event: Event subscriber is registered to
+    :type event: eeee.event.Event
+    :param publisher: Optional instance or pattern of Publisher
+    :type publisher: eeee.event.Publisher, eeee.event.PublisherPattern
+    :param key: Registration sequence number, unique within event
+    :type key: int
+    """
+
+    __slots__ = ('event', 'publisher', 'key')
+
+    # noinspection PyMissingConstructor
+    def __init__(self, subscriber: Subscriber, event: Event,
+                 publisher: Union["Publisher", PublisherPattern], key: int):
+        # subscriber is validated already, copy instead of parse again
+        self.name = subscriber.name
+        self.handler = subscriber.handler
+        self.limiter = subscriber.limiter
+        self.executor = subscriber.executor
+        self.timeout = subscriber.timeout
+        self.rate_limit = subscriber.rate_limit
+        self.event = event
+        self.publisher = publisher
+        self.key = key
+
+    def __eq__(self, other):
+        if isinstance(other, Subscription):
+            return other is self
+        if type(other) is Subscriber:
+            return self.name == other.name
+        return type(other) is str and self.name == other
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cancel()
+
+    @property
+    def active(self) -> bool:
+        """Tell if subscription is still registered.
+
+        :return: Boolean
+        """
+        # noinspection PyProtectedMember
+        return self.event._routes.get(self.publisher, {}).get(self.key) is self
+
+    def cancel(self):
+        """Remove subscription from event. Cancelling inactive subscription does nothing."""
+        if self.active:
+            # noinspection PyProtectedMember
+            self.event._remove(self)
+
+
+class Reducer:
+    """Strategy reducing results of handlers to single value.
+
+    Results are passed to reducer in order of completion.
+    As soon as ``until`` returns True, remaining handlers are cancelled.
+    When :attr:`Event.RETURN_EXCEPTIONS` is set, exceptions raised by handlers
+    are passed as results, built-in strategies treat them as None.
+
+    :Example:
+
+    Sum results until total reaches 100
+
+    .. code-block:: python
+
+        >>> budget = Reducer(lambda total, result: total + result, initial=0,
+        ...                  until=lambda total: total >= 100)
+        >>> total = await my_event.publish('estimate', strategy=budget)
+
+    :param function: Callable taking accumulated value and result, returning new value
+    :type function: callable
+    :param initial: Initial value, returned when there are no handlers
+    :type initial: Any
+    :param until: Optional callable taking accumulated value, True stops reduction
+    :type until: callable
+    """
+
+    __slots__ = ('function', 'initial', 'until')
+
+    def __init__(self, function: callable, initial: Any = None, until: callable = None):
+        _is_callable(function)
+        self.function = function
+        self.initial = initial
+        self.until = until or _never
+
+    @classmethod
+    def first(cls) -> "Reducer":
+        """First result which is neither None nor exception.
+
+        :return: Reducer
+        :rtype: eeee.event.Reducer
+        """
+        return cls(lambda value, result: _answer(result), until=lambda value: value is not None)
+
+    @classmethod
+    def any(cls) -> "Reducer":
+        """True if any result is truthy, stops on first truthy result. Exceptions are falsy.
+
+        :return: Reducer
+        :rtype: eeee.event.Reducer
+        """
+        return cls(lambda value, result: bool(_answer(result)), initial=False, until=bool)
+
+    @classmethod
+    def all(cls) -> "Reducer":
+        """True if all results are truthy, stops on first falsy result. Exceptions are falsy.
+
+        :return: Reducer
+        :rtype: eeee.event.Reducer
+        """
+        return cls(lambda value, result: bool(_answer(result)), initial=True,
+                   until=lambda value: not value)
+
+
+class Coalescer:
+    """Policy merging repeated publishes of event, so handlers run once per key.
+
+    Publishes with the same key, publisher by default, are merged while waiting
+    for delivery. Only the latest message is delivered, unless ``merge``
+    combines waiting message with the published one. Merged message is delivered
+    with publisher and deadline of the latest publish, when ``window`` passes
+    since first merged publish, or since the latest one if ``debounce`` is set,
+    or when :meth:`Event.flush` is awaited. Without window messages wait for flush.
+
+    Coalesced publish returns None immediately. Exceptions raised by handlers
+    after window passed are counted as failed, flush raises them as publish does.
+    Messages whose delivery comes while event is disabled are dropped.
+    Publishes with strategy and :meth:`Event.publish_many` are not coalesced.
+
+    :Example:
+
+    Deliver the latest price of every symbol at most ten times a second
+
+    .. code-block:: python
+
+        >>> prices = Event('prices')
+        >>> prices.COALESCE = Coalescer(window=0.1,
+        ...                             key=lambda message, publisher: message['symbol'])
+        >>> await prices.publish({'symbol': 'EUR', 'price': 1.17})
+
+    Sum counters published until flush
+
+    .. code-block:: python
+
+        >>> hits.COALESCE = Coalescer(merge=lambda waiting, message: waiting + message)
+        >>> await hits.publish(1)
+        >>> await hits.publish(2)
+        >>> await hits.flush()
+        [['3 handled']]
+
+    :param window: Optional delay of delivery in seconds
+    :type window: float
+    :param key: Optional callable taking message and publisher, returning hashable key
+    :type key: callable
+    :param merge: Optional callable taking waiting and published message, returning merged one
+    :type merge: callable
+    :param debounce: If True, window restarts on every merged publish
+    :type debounce: bool
+    :raises eeee.exceptions.DurationError: Window is not a positive number
+    :raises eeee.exceptions.NotCallableError: Key or merge is not callable
+    """
+
+    __slots__ = ('window', 'key', 'merge', 'debounce')
+
+    def __init__(self, window: float = None, key: callable = None, merge: callable = None,
+                 debounce: bool = False):
+        if window is not None:
+            _is_duration(window)
+        self.window = window
+        self.key = _callable_or(key, _by_publisher)
+        self.merge = _callable_or(merge, _latest)
+        self.debounce = debounce
+
+
+class RateLimit:
+    """Token bucket limiting rate of messages.
+
+    Bucket holds up to ``burst`` tokens and is refilled with ``rate`` tokens
+    per second, every message takes one token. When bucket is empty,
+    policy decides what happens with message:
+
+    * ``delay`` - wait until token is available, delayed messages keep order of arrival,
+    * ``drop`` - discard message,
+    * ``raise`` - raise :class:`eeee.exceptions.RateLimitError`.
+
+    Rate limit is attached to subscriber with ``rate_limit`` argument of subscribe,
+    or to publisher with :meth:`Event.limit_publisher`. Instance has single bucket,
+    so the same instance attached in many places limits all of them together.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> limit = my_event.limit_publisher('crawler', RateLimit(50, burst=10))
+        >>> await my_event.publish('page', 'crawler')
+        >>> limit.stats()
+        RateLimitStats(tokens=9.0, delayed=0, dropped=0)
+
+    :param rate: Tokens refilled per second
+    :type rate: int, float
+    :param burst: Bucket capacity, by default tokens refilled in one second, at least one
+    :type burst: int
+    :param policy: Policy applied when bucket is empty
+    :type policy: str
+    :raises eeee.exceptions.LimitError: Rate is not a positive number or burst
+                                        is not a positive integer
+    :raises eeee.exceptions.PolicyError: Policy error
+    """
+
+    DELAY = 'delay'
+    """Wait until token is available."""
+
+    DROP = 'drop'
+    """Discard message."""
+
+    RAISE = 'raise'
+    """Raise RateLimitError."""
+
+    POLICIES = (DELAY, DROP, RAISE)
+    """All rate limit policies."""
+
+    _Stats = namedtuple('RateLimitStats', ['tokens', 'delayed', 'dropped'])
+
+    __slots__ = ('rate', 'burst', 'policy', 'delayed', 'dropped', '_tokens', '_updated')
+
+    def __init__(self, rate: float, burst: int = None, policy: str = DELAY):
+        if type(rate) not in (int, float) or rate <= 0:
+            raise exceptions.LimitError('Rate must be a positive number.')
+        burst = max(1, int(rate)) if burst is None else burst
+        _is_limit(burst)
+        if policy not in self.POLICIES:
+            raise exceptions.PolicyError(policies=self.POLICIES, wrong=policy)
+
+        self.rate = rate
+        self.burst = burst
+        self.policy = policy
+        self.delayed = 0
+        self.dropped = 0
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    def stats(self):
+        """Report rate limit counters.
+
+        Tokens are negative while delayed messages are waiting for them.
+        Messages rejected with raise policy are counted as dropped.
+
+        :return: Named tuple with tokens, delayed and dropped
+        :rtype: tuple
+        """
+        self._refill()
+        return self._Stats(tokens=self._tokens, delayed=self.delayed, dropped=self.dropped)
+
+    async def acquire(self, count: int = 1) -> bool:
+        """Take tokens for messages, applying policy if there is not enough of them.
+
+        Tokens for many messages are taken at once, so batch larger than burst
+        is always delayed, dropped or rejected.
+
+        :param count: Number of messages
+        :type count: int
+        :raises eeee.exceptions.RateLimitError: Rate limit exceeded with raise policy
+        :return: True if messages may pass, False if they have been dropped
+        :rtype: bool
+        """
+        wait = self._take(count)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait is not None
+
+    def bind(self, handler: callable) -> callable:
+        """Wrap handler so each call takes token, dropped calls return None.
+
+        :param handler: Async function or class with async __call__ method
+        :type handler: callable
+        :return: Rate limited handler
+        :rtype: callable
+        """
+        async def rate_limited(**kwargs):
+            if await self.acquire():
+                return await handler(**kwargs)
+            return None
+
+        return rate_limited
+
+    def _refill(self):
+        """Add tokens refilled since last update."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self, count: int) -> float:
+        """Take tokens.
+
+        :param count: Number of tokens
+        :type count: int
+        :raises eeee.exceptions.RateLimitError: Rate limit exceeded with raise policy
+        :return: Seconds to wait, or None if messages have been dropped
+        :rtype: float
+        """
+        self._refill()
+        if self._tokens >= count:
+            self._tokens -= count
+            return 0
+        if self.policy == self.DELAY:
+            wait = (count - self._tokens) / self.rate
+            self._tokens -= count
+            self.delayed += count
+            return wait
+        self.dropped += count
+        if self.policy == self.RAISE:
+            raise exceptions.RateLimitError
+        return None
+
+
+class _Plan(tuple):
+    """Dispatch plan.
+
+    Tuple of handlers ready to call, with subscribers they were bound from
+    and tracing hooks resolved at compile time.
+
+    :param handlers: Iterable of handlers
+    :type handlers: Iterable
+    :param subscribers: Tuple of subscribers in the same order
+    :type subscribers: tuple
+    :param hooks: Tuple of tracing hooks
+    :type hooks: tuple
+    """
+
+    def __new__(cls, handlers: Iterable, subscribers: tuple, hooks: tuple = ()):
+        plan = super().__new__(cls, handlers)
+        plan.subscribers = subscribers
+        plan.hooks = hooks
+        plan.untraced = cls(plan, subscribers) if hooks else plan
+        return plan
+
+
+class _AsCompleted:
+    """Async iterator over results of handlers in order of completion.
+
+    :param names: Subscriber names in order of awaitables
+    :type names: list
+    :param start: Callable returning awaitables, called on first iteration
+    :type start: callable
+    :param admit: Optional coroutine function, handlers are not started if it returns False
+    :type admit: callable
+    """
+
+    def __init__(self, names: list, start: callable, admit: callable = None):
+        self._names = names
+        self._start = start
+        self._admit = admit
+        self._pending = None
+        self._done = deque()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._pending is None:
+            await self._begin()
+        if not self._done and self._pending:
+            done, _ = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+            self._done.extend(done)
+        if not self._done:
+            raise StopAsyncIteration
+        task = self._done.popleft()
+        name = self._pending.pop(task)
+        return name, task.exception() or task.result()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def _begin(self):
+        """Admit message and start handlers."""
+        admitted = self._admit is None or await self._admit()
+        awaitables = self._start() if admitted else ()
+        self._pending = {asyncio.ensure_future(awaitable): name
+                         for awaitable, name in zip(awaitables, self._names)}
+
+    async def aclose(self):
+        """Cancel handlers which are still running."""
+        pending = self._pending or {}
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._pending = {}
+        self._done.clear()
+
+
+class _WeakHandler:
+    """Weak reference to handler, notifying watchers when handler dies.
+
+    Bound methods are referenced with :class:`weakref.WeakMethod`,
+    so subscription does not keep method owner alive.
+
+    :param handler: Function or class with __call__ method
+    :type handler: callable
+    :raises eeee.exceptions.HandlerError: Handler does not support weak references
+    """
+
+    __slots__ = ('ref', 'watchers')
+
+    def __init__(self, handler: callable):
+        reference = weakref.WeakMethod if ismethod(handler) else weakref.ref
+        try:
+            self.ref = reference(handler, self._release)
+        except TypeError:
+            raise exceptions.HandlerError('Argument "handler" must support weak references.')
+        self.watchers = []
+
+    def watch(self, method: callable, *args):
+        """Call method with this handler and args when handler dies.
+
+        Method is referenced weakly too, so watcher may be garbage collected first.
+        Method is called at once if handler is already dead.
+
+        :param method: Bound method
+        :type method: callable
+        :param args: Additional method arguments
+        """
+        if self.ref() is None:
+            method(self, *args)
+        else:
+            self.watchers.append((weakref.WeakMethod(method), args))
+
+    # noinspection PyUnusedLocal
+    def _release(self, ref: weakref.ref):
+        """Notify alive watchers about dead handler.
+
+        :param ref: Dead reference
+        :type ref: weakref.ref
+        """
+        watchers, self.watchers = self.watchers, []
+        for method, args in watchers:
+            method = method()
+            if method is not None:
+                method(self, *args)
+
+
+class _WeakCoroutine(_WeakHandler):
+    """Weak reference to coroutine handler."""
+
+    __slots__ = ()
+
+    async def __call__(self, **kwargs):
+        handler = self.ref()
+        if handler is not None:
+            return await handler(**kwargs)
+
+
+class _WeakFunction(_WeakHandler):
+    """Weak reference to synchronous handler."""
+
+    __slots__ = ()
+
+    def __call__(self, **kwargs):
+        handler = self.ref()
+        if handler is not None:
+            return handler(**kwargs)
+
+
+class _Limiter:
+    """Concurrency limiter.
+
+    Semaphore is created on first use, inside running event loop.
+
+    :param limit: Number of concurrent calls
+    :type limit: int
+    :raises eeee.exceptions.LimitError: Limit error
+    """
+
+    __slots__ = ('limit', '_semaphore')
+
+    def __init__(self, limit: int):
+        _is_limit(limit)
+        self.limit = limit
+        self._semaphore = None
+
+    def bind(self, handler: callable) -> callable:
+        """Wrap handler so each call waits for free slot.
+
+        :param handler: Async function or class with async __call__ method
+        :type handler: callable
+        :return: Limited handler
+        :rtype: callable
+        """
+        async def limited(**kwargs):
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.limit)
+            async with self._semaphore:
+                return await handler(**kwargs)
+
+        return limited
+
+
+class _Pending:
+    """Message waiting for delivery with timer of its window.
+
+    :param message: Literally anything.
+    :type message: Any
+    :param publisher: Optional instance of Publisher
+    :type publisher: eeee.event.Publisher
+    :param deadline: Optional time limit in seconds
+    :type deadline: float
+    :param origin: Optional hook which received message
+    :type origin: Any
+    """
+
+    __slots__ = ('message', 'publisher', 'deadline', 'origin', 'timer')
+
+    def __init__(self, message: Any, publisher: "Publisher" = None, deadline: float = None,
+                 origin: Any = None):
+        self.message = message
+        self.publisher = publisher
+        self.deadline = deadline
+        self.origin = origin
+        self.timer = None
+
+    def cancel(self):
+        """Cancel timer of window, if any."""
+        if self.timer is not None:
+            self.timer.cancel()
+
+
+class _Coalescing:
+    """Messages of event waiting for delivery, merged per key of event's Coalescer.
+
+    Waiting messages are kept in order of first publish. Deliveries
+    started by timers are tracked, so flush can wait for them.
+
+    :param event: Event delivering messages
+    :type event: eeee.event.Event
+    """
+
+    __slots__ = ('event', 'pending', 'tasks', 'merged', 'delivered', 'failed')
+
+    def __init__(self, event: Event):
+        self.event = event
+        self.pending = {}
+        self.tasks = set()
+        self.merged = 0
+        self.delivered = 0
+        self.failed = 0
+
+    def put(self, message: Any, publisher: "Publisher" = None, deadline: float = None,
+            origin: Any = None):
+        """Put message waiting for delivery, merging it with waiting message of the same key.
+
+        Merged message keeps origin only if all its messages came from the same origin.
+
+        :param message: Literally anything.
+        :type message: Any
+        :param publisher: Optional instance of Publisher
+        :type publisher: eeee.event.Publisher
+        :param deadline: Optional time limit in seconds
+        :type deadline: float
+        :param origin: Optional hook which received message
+        :type origin: Any
+        :return: None
+        """
+        coalescer = self.event.COALESCE
+        key = coalescer.key(message, publisher)
+        pending = self.pending.get(key)
+        if pending is None:
+            pending = self.pending[key] = _Pending(message, publisher, deadline, origin)
+            self._schedule(key, pending, coalescer.window)
+            return None
+        self.merged += 1
+        pending.message = coalescer.merge(pending.message, message)
+        pending.publisher, pending.deadline = publisher, deadline
+        pending.origin = origin if pending.origin is origin else None
+        if coalescer.debounce:
+            pending.cancel()
+            self._schedule(key, pending, coalescer.window)
+        return None
+
+    async def flush(self) -> list:
+        """Deliver all waiting messages and wait for deliveries started by timers.
+
+        :return: List of result lists, one per delivered message
+        :rtype: list
+        """
+        pending, self.pending = list(self.pending.values()), {}
+        for item in pending:
+            item.cancel()
+        results = await asyncio.gather(*[self._deliver(item) for item in pending])
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        return results
+
+    def _schedule(self, key: Any, pending: _Pending, window: float = None):
+        """Start timer delivering message when window passes.
+
+        :param key: Key of message
+        :type key: Any
+        :param pending: Waiting message
+        :type pending: eeee.event._Pending
+        :param window: Optional delay of delivery in seconds
+        :type window: float
+        """
+        if window is not None:
+            pending.timer = asyncio.get_event_loop().call_later(window, self._release, key)
+
+    def _release(self, key: Any):
+        """Start delivery of message whose window passed.
+
+        :param key: Key of message
+        :type key: Any
+        """
+        task = asyncio.ensure_future(self._background(self.pending.pop(key)))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _background(self, pending: _Pending):
+        """Deliver message counting failure instead of raising it.
+
+        :param pending: Waiting message
+        :type pending: eeee.event._Pending
+        """
+        try:
+            await self._deliver(pending)
+        except Exception:
+            self.failed += 1
+
+    async def _deliver(self, pending: _Pending) -> list:
+        """Publish waiting message to handlers, unless event is disabled.
+
+        :param pending: Waiting message
+        :type pending: eeee.event._Pending
+        :return: List of results from handlers, or None if event is disabled
+        :rtype: list
+        """
+        event = self.event
+        if not event.is_enable:
+            return None
+        self.delivered += 1
+        # noinspection PyProtectedMember
+        return await event._dispatch(event._plan(pending.publisher), pending.message,
+                                     pending.publisher, pending.deadline, pending.origin)
+
+
+def _guarded(subscriber: "Subscriber", handler: callable) -> callable:
+    """Wrap handler with concurrency limit, rate limit and timeout of subscriber.
+
+    Rate limit is applied before concurrency limit, so delayed calls
+    do not hold slots. Timeout includes time spent on delay.
+
+    :param subscriber: Instance of Subscriber
+    :type subscriber: eeee.event.Subscriber
+    :param handler: Async function or class with async __call__ method
+    :type handler: callable
+    :return: Guarded handler
+    :rtype: callable
+    """
+    if subscriber.limiter is not None:
+        handler = subscriber.limiter.bind(handler)
+    if subscriber.rate_limit is not None:
+        handler = subscriber.rate_limit.bind(handler)
+    if subscriber.timeout is not None:
+        handler = _timed(handler, subscriber.timeout)
+    return handler
+
+
+def _timed(handler: callable, timeout: float) -> callable:
+    """Wrap handler so each call is cancelled after timeout.
+
+    :param handler: Async function or class with async __call__ method
+    :type handler: callable
+    :param timeout: Time limit in seconds
+    :type timeout: float
+    :return: Timed handler
+    :rtype: callable
+    """
+    async def timed(**kwargs):
+        return await asyncio.wait_for(handler(**kwargs), timeout)
+
+    return timed
+
+
+def _within(awaitables: list, deadline: float = None) -> list:
+    """Limit awaitables with common deadline.
+
+    :param awaitables: List of awaitables
+    :type awaitables: list
+    :param deadline: Optional time limit in seconds
+    :type deadline: float
+    :return: List of awaitables
+    :rtype: list
+    """
+    if deadline is None:
+        return awaitables
+    return [asyncio.wait_for(awaitable, deadline) for awaitable in awaitables]
+
+
+def _merged(routes: Iterable):
+    """Merge routes into single iterator in order of registration.
+
+    :param routes: Iterable of ordered dicts of subscriptions keyed by sequence
+    :type routes: Iterable
+    :return: Iterator of subscriptions
+    """
+    return (subscription for _, subscription in heapq.merge(*(route.items() for route in routes)))
+
+
+def _discard(index: dict, key: Any, item: int) -> bool:
+    """Remove item from ordered dict kept in index, drop dict when it becomes empty.
+
+    :param index: Dict of ordered dicts
+    :type index: dict
+    :param key: Key of ordered dict in index
+    :type key: Any
+    :param item: Key of item to remove
+    :type item: int
+    :return: True if ordered dict still has items
+    :rtype: bool
+    """
+    items = index[key]
+    del items[item]
+    if not items:
+        del index[key]
+    return bool(items)
+
+
+def _parse_strategy(strategy: Union[str, Reducer]) -> Reducer:
+    """Parse reduce strategy.
+
+    :param strategy: Name of built-in strategy or Reducer
+    :type strategy: str, eeee.event.Reducer
+    :raises eeee.exceptions.PolicyError: Unknown strategy
+    :return: Reducer
+    :rtype: eeee.event.Reducer
+    """
+    if isinstance(strategy, Reducer):
+        return strategy
+    if strategy not in _STRATEGIES:
+        raise exceptions.PolicyError(policies=tuple(_STRATEGIES), wrong=strategy)
+    return getattr(Reducer, strategy)()
+
+
+def _by_publisher(message: Any, publisher: "Publisher" = None) -> "Publisher":
+    """Default key of coalesced message.
+
+    :param message: Literally anything.
+    :type message: Any
+    :param publisher: Optional instance of Publisher
+    :type publisher: eeee.event.Publisher
+    :return: Publisher
+    """
+    return publisher
+
+
+def _latest(waiting: Any, message: Any) -> Any:
+    """Default merge of coalesced messages, keeping the latest one.
+
+    :param waiting: Message waiting for delivery
+    :type waiting: Any
+    :param message: Published message
+    :type message: Any
+    :return: Published message
+    """
+    return message
+
+
+def _callable_or(function: callable, default: callable) -> callable:
+    """Check optional callable, falling back to default.
+
+    :param function: Optional callable
+    :type function: callable
+    :param default: Callable used if function is None
+    :type default: callable
+    :raises eeee.exception.NotCallableError: Not callable error
+    :return: Callable
+    :rtype: callable
+    """
+    if function is None:
+        return default
+    _is_callable(function)
+    return function
+
+
+def _answer(result: Any) -> Any:
+    """Result of handler for built-in strategies, exceptions become None.
+
+    :param result: Result of handler or exception
+    :type result: Any
+    :return: Result or None
+    """
+    return None if isinstance(result, BaseException) else result
+
+
+def _never(value: Any) -> bool:
+    """Never stop reduction.
+
+    :param value: Accumulated value
+    :type value: Any
+    :return: False
+    """
+    return False
+
+
+def _parse_publisher(publisher: Union["Publisher", PublisherPattern, str, Any] = None):
+    """Parse publisher of subscription.
+
+    Compiled regular expressions become PublisherPattern,
+    names are interned as Publisher.
+
+    :param publisher: Optional name, instance or pattern of Publisher
+    :type publisher: eeee.event.Publisher, eeee.event.PublisherPattern, str, re.Pattern
+    :raises eeee.exceptions.NamingError: Naming error
+    :return: None, Publisher or PublisherPattern
+    """
+    if publisher is None or isinstance(publisher, PublisherPattern):
+        return publisher
+    if isinstance(publisher, _REGEX_TYPE):
+        return PublisherPattern(publisher)
+    return Publisher.intern(publisher)
+
+
+def _process_executor() -> concurrent.futures.Executor:
+    """Get process pool shared by all events.
+
+    Pool and multiprocessing machinery are imported and created on first use.
+
+    :return: Process pool executor
+    :rtype: concurrent.futures.ProcessPoolExecutor
+    """
+    global _PROCESS_EXECUTOR
+    if _PROCESS_EXECUTOR is None:
+        from concurrent.futures.process import ProcessPoolExecutor
+        _PROCESS_EXECUTOR = ProcessPoolExecutor()
+    return _PROCESS_EXECUTOR
+
+
+def _serialize(serializer: codec.Codec, message: Any, publisher: "Publisher", event: str) -> bytes:
+    """Serialize handler arguments for process executor.
+
+    :param serializer: Instance of Codec
+    :type serializer: eeee.codec.Codec
+    :param message: Literally anything serializer supports.
+    :type message: Any
+    :param publisher: Optional instance of Publisher
+    :type publisher: eeee.event.Publisher
+    :param event: Event name
+    :type event: str
+    :return: Serialized arguments
+    :rtype: bytes
+    """
+    return b''.join(serializer.encode({'message': message, 'publisher': publisher,
+                                       'event': event}))
+
+
+def _call_serialized(handler: callable, serializer: codec.Codec, payload: bytes):
+    """Call handler with serialized arguments, runs in worker process.
+
+    :param handler: Function or callable object.
+    :type handler: callable
+    :param serializer: Instance of Codec
+    :type serializer: eeee.codec.Codec
+    :param payload: Serialized arguments
+    :type payload: bytes
+    :return: Result of handler
+    """
+    return handler(**serializer.decode(payload))
+
+
+async def _collect(messages: Union[Iterable, AsyncIterable]) -> list:
+    """Collect messages from iterable or async iterable.
+
+    :param messages: Iterable or async iterable of messages.
+    :type messages: Iterable, AsyncIterable
+    :return: List of messages
+    :rtype: list
+    """
+    if not hasattr(messages, '__aiter__'):
+        return list(messages)
+    collected = []
+    async for message in messages:
+        collected.append(message)
+    return collected
+
+
+@lru_cache(maxsize=None)
+def _class_prefix(cls: type) -> str:
+    """Build identification prefix shared by all instances of class.
+
+    :param cls: Publisher or Subscriber class
+    :type cls: type
+    :return: Class prefix
+    :rtype: str
+    """
+    return str(cls)
 
 
 def _parse_handler(handler: Union[callable, object, Subscriber]):
@@ -385,6 +2394,46 @@ def _parse_handler(handler: Union[callable, object, Subscriber]):
     return name, handler
 
 
+def _weak_handler(handler: callable) -> _WeakHandler:
+    """Wrap handler with weak reference matching its kind.
+
+    :param handler: Function or class with __call__ method
+    :type handler: callable
+    :raises eeee.exceptions.HandlerError: Handler does not support weak references
+    :return: Weak handler
+    :rtype: eeee.event._WeakHandler
+    """
+    return (_WeakCoroutine if _iscoro(handler) else _WeakFunction)(handler)
+
+
+def _parse_executor(handler: Union[callable, object], executor: str = None):
+    """Parse executor of handler.
+
+    Coroutines run on event loop and can not be marked for executor,
+    synchronous handlers must be marked explicitly.
+
+    :param handler: Function or callable object.
+    :type handler: callable, object
+    :param executor: Optional executor name
+    :type executor: str
+    :raises eeee.exceptions.NotCoroutineError: Synchronous handler without executor
+    :raises eeee.exceptions.PolicyError: Unknown executor
+    :raises eeee.exceptions.ExecutorError: Coroutine marked to run in executor
+    :raises eeee.exceptions.NotPicklableError: Handler for process executor is not picklable
+    :return: Executor name or None for coroutines
+    :rtype: str
+    """
+    if executor is None:
+        _is_coro(handler)
+        return None
+    if executor not in Subscriber.EXECUTORS:
+        raise exceptions.PolicyError(policies=Subscriber.EXECUTORS, wrong=executor)
+    _is_sync(handler)
+    if executor == Subscriber.PROCESS:
+        _is_picklable(handler)
+    return executor
+
+
 def _is_callable(handler: Union[callable, object]):
     """Check if handler is callable.
 
@@ -407,10 +2456,82 @@ def _is_coro(handler: Union[callable, object]):
     :raises eeee.exceptions.NotCoroutineError: Not coroutine error
     :return: None
     """
+    if not _iscoro(handler):
+        raise exceptions.NotCoroutineError
+
+
+def _is_sync(handler: Union[callable, object]):
+    """Check if handler is not coroutine.
+
+    :param handler: Function or callable object.
+    :type handler: callable, object
+    :raises eeee.exceptions.ExecutorError: Executor error
+    :return: None
+    """
+    if _iscoro(handler):
+        raise exceptions.ExecutorError
+
+
+def _is_picklable(handler: Union[callable, object]):
+    """Check if handler can be sent to other process.
+
+    :param handler: Function or callable object.
+    :type handler: callable, object
+    :raises eeee.exceptions.NotPicklableError: Not picklable error
+    :return: None
+    """
     try:
-        is_coro = iscoroutinefunction(handler) or iscoroutinefunction(handler.__call__)
+        pickle.dumps(handler)
+    except Exception:
+        raise exceptions.NotPicklableError
+
+
+def _iscoro(handler: Union[callable, object]) -> bool:
+    """Tell if handler is coroutine.
+
+    Class with async __call__ method is considered a coroutine.
+
+    :param handler: Function or callable object.
+    :type handler: callable, object
+    :return: Boolean
+    """
+    try:
+        return iscoroutinefunction(handler) or iscoroutinefunction(handler.__call__)
     except AttributeError:
-        is_coro = False
+        return False
 
-    if not is_coro:
-        raise exceptions.NotCoroutineError
+
+def _is_limit(limit: int):
+    """Check if limit is a positive integer.
+
+    :param limit: Limit value
+    :type limit: int
+    :raises eeee.exceptions.LimitError: Limit error
+    :return: None
+    """
+    if type(limit) is not int or limit < 1:
+        raise exceptions.LimitError(wrong=limit)
+
+
+def _is_deadline(deadline: float = None):
+    """Check if optional deadline is a positive number of seconds.
+
+    :param deadline: Optional deadline value
+    :type deadline: int, float
+    :raises eeee.exceptions.DurationError: Duration error
+    :return: None
+    """
+    if deadline is not None:
+        _is_duration(deadline)
+
+
+def _is_duration(seconds: float):
+    """Check if duration is a positive number of seconds.
+
+    :param seconds: Duration value
+    :type seconds: int, float
+    :raises eeee.exceptions.DurationError: Duration error
+    :return: None
+    """
+    if type(seconds) not in (int, float) or seconds <= 0:
+        raise exceptions.DurationError(wrong=seconds)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from typing import Any
 
 __author__ = 'Paweł Zadrożny'
 __copyright__ = 'Copyright (c) 2018, Pawelzny'
@@ -69,3 +70,140 @@ class NotCoroutineError(HandlerError):
 
     message = 'Argument "handler" must be coroutine.'
     """Handler type mismatch message."""
+
+
+class ExecutorError(HandlerError):
+    """Leaf of HandlerError, raised when coroutine handler is marked to run in executor."""
+
+    message = 'Coroutine handler can not run in executor.'
+    """Executor mismatch message."""
+
+
+class NotPicklableError(HandlerError):
+    """Leaf of HandlerError, raised when handler for process executor can not be pickled."""
+
+    message = 'Argument "handler" must be picklable to run in process executor.'
+    """Handler not picklable message."""
+
+
+class EeeeValueError(EeeeException):
+    """General value related exception.
+
+    All other exceptions related to Value are derived from this one.
+    """
+
+    message = 'Argument value error.'
+    """Value mismatch "eeee" exception message."""
+
+
+class LimitError(EeeeValueError):
+    """Limit value error exception.
+
+    Raised when limit is not a positive integer.
+    """
+
+    message = 'Limit must be a positive integer.'
+    """Limit error message."""
+
+    def __init__(self, message: str = None, wrong: Any = None):
+        if message is not None:
+            self.message = message
+        elif wrong is not None:
+            self.message = '{message} Got {wrong!r} instead.'.format(message=self.message,
+                                                                     wrong=wrong)
+        super().__init__(self.message)
+
+
+class DurationError(EeeeValueError):
+    """Duration value error exception.
+
+    Raised when duration, like timeout or deadline, is not a positive number of seconds.
+    """
+
+    message = 'Duration must be a positive number of seconds.'
+    """Duration error message."""
+
+    def __init__(self, message: str = None, wrong: Any = None):
+        if message is not None:
+            self.message = message
+        elif wrong is not None:
+            self.message = '{message} Got {wrong!r} instead.'.format(message=self.message,
+                                                                     wrong=wrong)
+        super().__init__(self.message)
+
+
+class PolicyError(EeeeValueError):
+    """Policy value error exception.
+
+    Raised when unknown policy name has been given.
+    """
+
+    message = 'Unknown policy.'
+    """Policy error message."""
+
+    def __init__(self, message: str = None, policies: list = None, wrong: Any = None):
+        if message is not None:
+            self.message = message
+        elif policies and wrong is not None:
+            self.message = ('{message} Must be one of: {policies}, '
+                            'got {wrong!r} instead.'.format(message=self.message,
+                                                            policies=policies,
+                                                            wrong=wrong))
+        super().__init__(self.message)
+
+
+class EmitterError(EeeeException):
+    """Root Exception for emitter errors."""
+
+    message = 'Emitter error.'
+    """Emitter error message."""
+
+    def __init__(self, message: str = None):
+        if message is not None:
+            self.message = message
+        super().__init__(self.message)
+
+
+class QueueFullError(EmitterError):
+    """Leaf of EmitterError, raised when emitter queue is full."""
+
+    message = 'Emitter queue is full.'
+    """Queue full message."""
+
+
+class EmitterClosedError(EmitterError):
+    """Leaf of EmitterError, raised when message is emitted after close."""
+
+    message = 'Emitter is closed.'
+    """Emitter closed message."""
+
+
+class TransportError(EeeeException):
+    """Root Exception for transport errors."""
+
+    message = 'Transport error.'
+    """Transport error message."""
+
+    def __init__(self, message: str = None):
+        if message is not None:
+            self.message = message
+        super().__init__(self.message)
+
+
+class TransportClosedError(TransportError):
+    """Leaf of TransportError, raised when transport is used before start or after close."""
+
+    message = 'Transport is not running.'
+    """Transport closed message."""
+
+
+class RateLimitError(EeeeException):
+    """Raised when message exceeds rate limit with raise policy."""
+
+    message = 'Rate limit exceeded.'
+    """Rate limit message."""
+
+    def __init__(self, message: str = None):
+        if message is not None:
+            self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from bisect import bisect_left
+from collections import namedtuple
+from time import perf_counter
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class Metrics:
+    """Registry of event and subscriber metrics.
+
+    Instrumentation is opt-in. Assign registry to ``Event.METRICS``
+    and handlers will be measured, starting from next publish.
+    Events without registry are not instrumented at all.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> metrics = Metrics()
+        >>> Event.METRICS = metrics
+        >>> my_event = Event('MyEvent')
+        >>> result = await my_event.publish({'message': 'secret'})
+        >>> print(metrics.to_prometheus())
+
+    Recorded are:
+
+    * number of published messages and fan-out size per event,
+    * number of calls, number of exceptions and latency histogram per subscriber.
+
+    Histograms use fixed logarithmic buckets, so observing value is
+    a bisect and increment of preallocated counter.
+    """
+
+    LATENCY_BUCKETS = tuple(2 ** exponent / 1000000 for exponent in range(24))
+    """Upper bounds of latency buckets in seconds, from 1 microsecond to about 8 seconds."""
+
+    FAN_OUT_BUCKETS = tuple(2 ** exponent for exponent in range(15))
+    """Upper bounds of fan-out buckets, from 1 to 16384 subscribers."""
+
+    _Snapshot = namedtuple('MetricsSnapshot', ['events', 'subscribers'])
+    _EventSnapshot = namedtuple('EventMetrics', ['name', 'published', 'fan_out'])
+    _SubscriberSnapshot = namedtuple('SubscriberMetrics',
+                                     ['event', 'name', 'calls', 'exceptions', 'latency'])
+
+    def __init__(self):
+        self._events = {}
+        self._subscribers = {}
+
+    def observe_publish(self, event: str, fan_out: int, count: int = 1):
+        """Record published messages.
+
+        :param event: Event name
+        :type event: str
+        :param fan_out: Number of subscribers receiving each message
+        :type fan_out: int
+        :param count: Number of published messages
+        :type count: int
+        """
+        try:
+            stats = self._events[event]
+        except KeyError:
+            stats = self._events[event] = _Histogram(self.FAN_OUT_BUCKETS)
+        stats.observe(fan_out, count)
+
+    def bind(self, event: str, subscriber: str, handler: callable) -> callable:
+        """Wrap handler to measure calls, latency and exceptions.
+
+        :param event: Event name
+        :type event: str
+        :param subscriber: Subscriber name
+        :type subscriber: str
+        :param handler: Async function or class with async __call__ method
+        :type handler: callable
+        :return: Measured handler
+        :rtype: callable
+        """
+        stats = self._subscribers.setdefault((event, subscriber),
+                                             _SubscriberStats(self.LATENCY_BUCKETS))
+
+        async def measured(**kwargs):
+            start = perf_counter()
+            try:
+                return await handler(**kwargs)
+            except Exception:
+                stats.exceptions += 1
+                raise
+            finally:
+                stats.latency.observe(perf_counter() - start)
+
+        return measured
+
+    def snapshot(self):
+        """Copy current state of all metrics.
+
+        :Example:
+
+        .. code-block:: python
+
+            >>> metrics.snapshot().events
+            (EventMetrics(name='MyEvent', published=2, fan_out=HistogramSnapshot(...)),)
+
+        :return: Named tuple with events and subscribers metrics
+        :rtype: tuple
+        """
+        events = tuple(self._EventSnapshot(name, stats.count, stats.snapshot())
+                       for name, stats in self._events.items())
+        subscribers = tuple(self._SubscriberSnapshot(event, name, stats.latency.count,
+                                                     stats.exceptions, stats.latency.snapshot())
+                            for (event, name), stats in self._subscribers.items())
+        return self._Snapshot(events, subscribers)
+
+    def reset(self):
+        """Zero all counters, keeping handlers instrumented."""
+        for stats in self._events.values():
+            stats.reset()
+        for stats in self._subscribers.values():
+            stats.exceptions = 0
+            stats.latency.reset()
+
+    def to_prometheus(self, prefix: str = 'eeee') -> str:
+        """Export snapshot in Prometheus text exposition format.
+
+        :param prefix: Prefix of metric names
+        :type prefix: str
+        :return: Metrics in text format
+        :rtype: str
+        """
+        snapshot = self.snapshot()
+        lines = []
+        _family(lines, prefix + '_event_published_total', 'counter', 'Published messages.',
+                ((_labels(event=e.name), e.published) for e in snapshot.events))
+        _histogram(lines, prefix + '_event_fan_out', 'Subscribers receiving message.',
+                   ((_labels(event=e.name), e.fan_out) for e in snapshot.events))
+        _family(lines, prefix + '_subscriber_calls_total', 'counter', 'Handler calls.',
+                ((_labels(event=s.event, subscriber=s.name), s.calls)
+                 for s in snapshot.subscribers))
+        _family(lines, prefix + '_subscriber_exceptions_total', 'counter',
+                'Exceptions raised by handler.',
+                ((_labels(event=s.event, subscriber=s.name), s.exceptions)
+                 for s in snapshot.subscribers))
+        _histogram(lines, prefix + '_subscriber_latency_seconds', 'Handler latency.',
+                   ((_labels(event=s.event, subscriber=s.name), s.latency)
+                    for s in snapshot.subscribers))
+        return '\n'.join(lines) + '\n'
+
+
+class _Histogram:
+    """Histogram with fixed bucket bounds.
+
+    Last counter holds values above the highest bound.
+
+    :param bounds: Sorted upper bounds of buckets
+    :type bounds: tuple
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum')
+
+    _Snapshot = namedtuple('HistogramSnapshot', ['bounds', 'counts', 'count', 'sum'])
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.reset()
+
+    def observe(self, value: float, count: int = 1):
+        """Record value.
+
+        :param value: Observed value
+        :type value: float
+        :param count: Number of observations of the same value
+        :type count: int
+        """
+        self.counts[bisect_left(self.bounds, value)] += count
+        self.count += count
+        self.sum += value * count
+
+    def reset(self):
+        """Zero all counters."""
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def snapshot(self):
+        """Copy current state.
+
+        :return: Named tuple with bounds, counts, count and sum
+        :rtype: tuple
+        """
+        return self._Snapshot(self.bounds, tuple(self.counts), self.count, self.sum)
+
+
+class _SubscriberStats:
+    """Subscriber counters.
+
+    :param bounds: Upper bounds of latency buckets
+    :type bounds: tuple
+    """
+
+    __slots__ = ('exceptions', 'latency')
+
+    def __init__(self, bounds: tuple):
+        self.exceptions = 0
+        self.latency = _Histogram(bounds)
+
+
+def _family(lines: list, name: str, kind: str, description: str, samples):
+    """Append metric family in Prometheus text format.
+
+    :param lines: Output lines
+    :type lines: list
+    :param name: Metric name
+    :type name: str
+    :param kind: Metric type
+    :type kind: str
+    :param description: Help text
+    :type description: str
+    :param samples: Iterable of (labels, value) pairs
+    """
+    lines.append('# HELP {} {}'.format(name, description))
+    lines.append('# TYPE {} {}'.format(name, kind))
+    lines.extend('{}{{{}}} {}'.format(name, labels, value) for labels, value in samples)
+
+
+def _histogram(lines: list, name: str, description: str, samples):
+    """Append histogram family in Prometheus text format.
+
+    :param lines: Output lines
+    :type lines: list
+    :param name: Metric name
+    :type name: str
+    :param description: Help text
+    :type description: str
+    :param samples: Iterable of (labels, histogram snapshot) pairs
+    """
+    lines.append('# HELP {} {}'.format(name, description))
+    lines.append('# TYPE {} histogram'.format(name))
+    for labels, histogram in samples:
+        cumulative = 0
+        for bound, count in zip(histogram.bounds + ('+Inf',), histogram.counts):
+            cumulative += count
+            lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, labels, bound, cumulative))
+        lines.append('{}_sum{{{}}} {}'.format(name, labels, histogram.sum))
+        lines.append('{}_count{{{}}} {}'.format(name, labels, histogram.count))
+
+
+def _labels(**labels) -> str:
+    """Format labels, escaping values.
+
+    :return: Comma separated labels
+    :rtype: str
+    """
+    return ','.join('{}="{}"'.format(key, _escape(value)) for key, value in sorted(labels.items()))
+
+
+def _escape(value: str) -> str:
+    """Escape label value.
+
+    :param value: Label value
+    :type value: str
+    :return: Escaped value
+    :rtype: str
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import itertools
+from time import perf_counter
+from typing import Any
+
+try:
+    import contextvars
+except ImportError:  # pragma: no cover, Python < 3.7
+    contextvars = None
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+_IDS = itertools.count(1)
+
+
+class Hook:
+    """Base tracing hook.
+
+    Hooks are assigned to ``Event.HOOKS`` as tuple and resolved
+    when dispatch plans are compiled, so events without hooks are not traced at all.
+    Override any of methods, both are called with :class:`Span` of publish or handler call.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> class Printer(Hook):
+        ...     def after(self, span):
+        ...         print(span.kind, span.event, span.subscriber, span.duration)
+        ...
+        >>> Event.HOOKS = (Printer(),)
+
+    Exceptions raised by hooks are propagated to publisher.
+    """
+
+    def before(self, span: "Span"):
+        """Called when publish or handler call starts.
+
+        :param span: Started span
+        :type span: eeee.tracing.Span
+        """
+
+    def after(self, span: "Span"):
+        """Called when publish or handler call ends, also on error and cancellation.
+
+        :param span: Finished span
+        :type span: eeee.tracing.Span
+        """
+
+
+class Span:
+    """Timed unit of work, publish or single handler call.
+
+    Current span is carried by :mod:`contextvars`, so spans started inside
+    of handler, including nested publishes, become its children and whole
+    chain of events shares one trace id. On Python older than 3.7
+    spans are not linked.
+
+    :param kind: Span kind, publish or call
+    :type kind: str
+    :param event: Event name
+    :type event: str
+    :param publisher: Optional instance of Publisher
+    :type publisher: eeee.event.Publisher
+    :param subscriber: Subscriber name, None for publish
+    :type subscriber: str
+    :param message: Published message
+    :type message: Any
+    :param origin: Optional hook which received published message from remote node
+    :type origin: Any
+    :param batch: True if span is publish of batch and message is list of messages
+    :type batch: bool
+    """
+
+    PUBLISH = 'publish'
+    """Span of Event.publish."""
+
+    CALL = 'call'
+    """Span of single handler call."""
+
+    __slots__ = ('kind', 'event', 'publisher', 'subscriber', 'message', 'origin', 'batch',
+                 'span_id', 'parent_id', 'trace_id', 'start', 'end', 'error')
+
+    def __init__(self, kind: str, event: str, publisher: Any = None, subscriber: str = None,
+                 message: Any = None, origin: Any = None, batch: bool = False):
+        parent = current_span()
+        self.kind = kind
+        self.event = event
+        self.publisher = publisher
+        self.subscriber = subscriber
+        self.message = message
+        self.origin = origin
+        self.batch = batch
+        self.span_id = next(_IDS)
+        self.parent_id = None if parent is None else parent.span_id
+        self.trace_id = self.span_id if parent is None else parent.trace_id
+        self.start = perf_counter()
+        self.end = None
+        self.error = None
+
+    def __repr__(self):
+        return '<Span {} {} of {!r} in trace {}>'.format(self.kind, self.span_id, self.event,
+                                                         self.trace_id)
+
+    @property
+    def duration(self) -> float:
+        """Span duration in seconds, None if span has not finished yet.
+
+        :return: Duration
+        :rtype: float
+        """
+        return None if self.end is None else self.end - self.start
+
+
+def current_span() -> Span:
+    """Get span of publish or handler call running in current context.
+
+    :return: Current span or None
+    :rtype: eeee.tracing.Span
+    """
+    return _CURRENT.get(None)
+
+
+def bind(hooks: tuple, event: str, publisher: Any, subscriber: str, handler: callable) -> callable:
+    """Wrap handler to run in its own span.
+
+    :param hooks: Tuple of hooks
+    :type hooks: tuple
+    :param event: Event name
+    :type event: str
+    :param publisher: Optional instance of Publisher
+    :type publisher: eeee.event.Publisher
+    :param subscriber: Subscriber name
+    :type subscriber: str
+    :param handler: Async function or class with async __call__ method
+    :type handler: callable
+    :return: Traced handler
+    :rtype: callable
+    """
+    async def traced(**kwargs):
+        span = Span(Span.CALL, event, publisher, subscriber, kwargs.get('message'))
+        return await trace(hooks, span, handler(**kwargs))
+
+    return traced
+
+
+async def trace(hooks: tuple, span: Span, awaitable):
+    """Await inside of span, notifying hooks.
+
+    Span is current while awaitable runs, so tasks it creates inherit it.
+
+    :param hooks: Tuple of hooks
+    :type hooks: tuple
+    :param span: Started span
+    :type span: eeee.tracing.Span
+    :param awaitable: Not started coroutine or other awaitable
+    :return: Result of awaitable
+    """
+    token = _CURRENT.set(span)
+    try:
+        _notify(hooks, 'before', span)
+        return await awaitable
+    except BaseException as exc:
+        span.error = exc
+        raise
+    finally:
+        span.end = perf_counter()
+        _CURRENT.reset(token)
+        _notify(hooks, 'after', span)
+
+
+def _notify(hooks: tuple, method: str, span: Span):
+    """Call method of every hook.
+
+    :param hooks: Tuple of hooks
+    :type hooks: tuple
+    :param method: Name of hook method
+    :type method: str
+    :param span: Span
+    :type span: eeee.tracing.Span
+    """
+    for hook in hooks:
+        getattr(hook, method)(span)
+
+
+class _NoContext:
+    """Stand-in of ContextVar for Python without contextvars, holds nothing."""
+
+    @staticmethod
+    def get(default: Any = None):
+        return default
+
+    @staticmethod
+    def set(value: Any):
+        return None
+
+    @staticmethod
+    def reset(token: Any):
+        return None
+
+
+_CURRENT = _NoContext() if contextvars is None else contextvars.ContextVar('eeee_span')
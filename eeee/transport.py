@@ -0,0 +1,651 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import struct
+from abc import ABC, abstractmethod
+from typing import Iterable, Union
+
+from eeee import codec, exceptions
+from eeee.event import Event, _is_limit
+from eeee.tracing import Hook, Span
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+PUBLISH = 1
+"""Frame command of published payload."""
+
+SUBSCRIBE = 2
+"""Frame command of subscription to event."""
+
+UNSUBSCRIBE = 3
+"""Frame command of cancelled subscription to event."""
+
+_HEADER = struct.Struct('!BHI')
+
+
+class Transport(ABC):
+    """Interface of transports carrying publishes between nodes.
+
+    Transport moves opaque payloads tagged with event name, serialization
+    is left to :class:`Relay`. Payload is sent as list of bytes-like chunks
+    returned by :meth:`eeee.codec.Codec.encode` and received either as
+    the same list or as single bytes-like object, both accepted by codec.
+    Sends and subscriptions are pipelined, they return immediately
+    and frames are written in batches, :meth:`flush` waits until
+    everything queued so far has been written.
+    Payloads are never delivered back to transport which sent them.
+
+    Implement all methods to plug in another broker.
+    """
+
+    @property
+    @abstractmethod
+    def is_running(self) -> bool:
+        """Check if transport has been started and not closed yet.
+
+        :return: Boolean
+        """
+
+    @abstractmethod
+    async def start(self):
+        """Connect to broker, subscriptions made before start are sent now."""
+
+    @abstractmethod
+    async def close(self):
+        """Flush queued frames and disconnect from broker."""
+
+    @abstractmethod
+    async def flush(self):
+        """Wait until queued frames have been written."""
+
+    @abstractmethod
+    def send(self, event: str, payload: list):
+        """Queue payload to be published to remote subscribers of event.
+
+        :param event: Event name
+        :type event: str
+        :param payload: List of bytes-like chunks
+        :type payload: list
+        :raises eeee.exceptions.TransportClosedError: Transport closed error
+        """
+
+    @abstractmethod
+    def subscribe(self, event: str, receiver: callable):
+        """Receive payloads published to event by other nodes.
+
+        :param event: Event name
+        :type event: str
+        :param receiver: Coroutine function called with event name and payload,
+                         payloads are received one at a time in order of arrival
+        :type receiver: callable
+        """
+
+    @abstractmethod
+    def unsubscribe(self, event: str):
+        """Stop receiving payloads published to event.
+
+        :param event: Event name
+        :type event: str
+        """
+
+
+class Relay(Hook):
+    """Publish messages of selected events through transport.
+
+    Relay is a tracing hook of relayed events. Message and publisher name
+    are serialized once with ``CODEC`` when publish starts and handed to transport.
+    Payloads received from transport are published to local event
+    of the same name, but never sent back. Publishes with strategy and batches
+    of :meth:`eeee.event.Event.publish_many` are relayed as plain publishes
+    of every message, and results of remote handlers are not returned.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> my_event = Event('MyEvent')
+        >>> relay = Relay(StreamTransport('broker.local', 7070, pool_size=4), [my_event])
+        >>> await relay.start()
+        >>> await my_event.publish({'message': 'to every node'})
+        >>> await relay.close()
+
+    Messages must be serializable, otherwise publish raises error of codec,
+    like :class:`pickle.PicklingError`.
+
+    :param transport: Instance of Transport
+    :type transport: eeee.transport.Transport
+    :param events: Events to relay
+    :type events: Iterable
+    """
+
+    CODEC = codec.PickleCodec()
+    """Instance of :class:`eeee.codec.Codec` serializing relayed messages."""
+
+    def __init__(self, transport: Transport, events: Iterable[Event] = ()):
+        self.transport = transport
+        self.sent = 0
+        self.received = 0
+        self.failed = 0
+        self._events = {}
+        for event in events:
+            self.attach(event)
+
+    def attach(self, event: Event):
+        """Relay publishes of event.
+
+        :param event: Event to relay
+        :type event: eeee.event.Event
+        """
+        self._events[event.name] = event
+        event.HOOKS = event.HOOKS + (self,)
+        self.transport.subscribe(event.name, self._deliver)
+
+    def detach(self, event: Event):
+        """Stop relaying publishes of event.
+
+        :param event: Relayed event
+        :type event: eeee.event.Event
+        """
+        if self._events.get(event.name) is event:
+            del self._events[event.name]
+            self.transport.unsubscribe(event.name)
+        event.HOOKS = tuple(hook for hook in event.HOOKS if hook is not self)
+
+    async def start(self):
+        """Start transport."""
+        await self.transport.start()
+
+    async def close(self):
+        """Detach events and close transport."""
+        for event in list(self._events.values()):
+            self.detach(event)
+        await self.transport.close()
+
+    def before(self, span: Span):
+        """Send published message, or every message of batch, through transport.
+
+        :param span: Started span
+        :type span: eeee.tracing.Span
+        """
+        if span.kind != Span.PUBLISH or span.origin is self or not self.transport.is_running:
+            return
+        publisher = None if span.publisher is None else span.publisher.name
+        for message in span.message if span.batch else (span.message,):
+            self.transport.send(span.event, self.CODEC.encode((message, publisher)))
+            self.sent += 1
+
+    async def _deliver(self, name: str, payload: Union[bytes, memoryview, list]):
+        """Publish received message to local event, so it is not sent back.
+
+        This relay is origin of publish, also when message is coalesced
+        and delivered later. Exceptions raised by handlers are counted as failed.
+
+        :param name: Event name
+        :type name: str
+        :param payload: Serialized message and publisher name
+        :type payload: bytes, memoryview, list
+        """
+        try:
+            message, publisher = self.CODEC.decode(payload)
+            self.received += 1
+            # noinspection PyProtectedMember
+            await self._events[name]._publish(message, publisher, origin=self)
+        except Exception:
+            self.failed += 1
+
+
+class LoopbackBroker:
+    """In-memory broker connecting loopback transports of single process.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> broker = LoopbackBroker()
+        >>> first, second = LoopbackTransport(broker), LoopbackTransport(broker)
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+
+    def subscribe(self, event: str, transport: "LoopbackTransport"):
+        """Route payloads of event to transport.
+
+        :param event: Event name
+        :type event: str
+        :param transport: Subscribed transport
+        :type transport: eeee.transport.LoopbackTransport
+        """
+        self._subscribers.setdefault(event, set()).add(transport)
+
+    def unsubscribe(self, event: str, transport: "LoopbackTransport"):
+        """Stop routing payloads of event to transport.
+
+        :param event: Event name
+        :type event: str
+        :param transport: Subscribed transport
+        :type transport: eeee.transport.LoopbackTransport
+        """
+        subscribers = self._subscribers.get(event, set())
+        subscribers.discard(transport)
+        if not subscribers:
+            self._subscribers.pop(event, None)
+
+    def route(self, sender: "LoopbackTransport", batch: list):
+        """Pass batch of payloads to subscribed transports other than sender.
+
+        :param sender: Sending transport
+        :type sender: eeee.transport.LoopbackTransport
+        :param batch: List of event name and payload pairs
+        :type batch: list
+        """
+        for event, payload in batch:
+            for transport in self._subscribers.get(event, ()):
+                if transport is not sender:
+                    transport.put(event, payload)
+
+
+class LoopbackTransport(Transport):
+    """Transport passing payloads through in-memory broker, without copying.
+
+    Payloads sent in single loop iteration are routed together
+    in the next one. Useful in tests and to benchmark relay
+    without network.
+
+    :param broker: Broker shared with other transports
+    :type broker: eeee.transport.LoopbackBroker
+    """
+
+    def __init__(self, broker: LoopbackBroker):
+        self.broker = broker
+        self._receivers = {}
+        self._pending = []
+        self._inbox = None
+        self._task = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def start(self):
+        self._inbox = asyncio.Queue()
+        self._task = asyncio.ensure_future(self._receive())
+        for event in self._receivers:
+            self.broker.subscribe(event, self)
+
+    async def close(self):
+        if not self.is_running:
+            return
+        await self.flush()
+        for event in self._receivers:
+            self.broker.unsubscribe(event, self)
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = self._inbox = None
+
+    async def flush(self):
+        self._route()
+
+    def send(self, event: str, payload: list):
+        if not self.is_running:
+            raise exceptions.TransportClosedError
+        if not self._pending:
+            asyncio.get_event_loop().call_soon(self._route)
+        self._pending.append((event, payload))
+
+    def subscribe(self, event: str, receiver: callable):
+        self._receivers[event] = receiver
+        if self.is_running:
+            self.broker.subscribe(event, self)
+
+    def unsubscribe(self, event: str):
+        self._receivers.pop(event, None)
+        self.broker.unsubscribe(event, self)
+
+    def put(self, event: str, payload: list):
+        """Accept payload routed by broker.
+
+        :param event: Event name
+        :type event: str
+        :param payload: List of bytes-like chunks
+        :type payload: list
+        """
+        self._inbox.put_nowait((event, payload))
+
+    def _route(self):
+        """Pass pending payloads to broker."""
+        batch, self._pending = self._pending, []
+        self.broker.route(self, batch)
+
+    async def _receive(self):
+        """Pass received payloads to receivers until cancelled."""
+        while True:
+            event, payload = await self._inbox.get()
+            await self._receivers.get(event, _discard)(event, payload)
+
+
+class BrokerServer:
+    """Reference broker server for stream transports, on TCP or Unix domain socket.
+
+    Server only routes frames: payloads are forwarded as received,
+    without deserialization, to every other connection subscribed to event.
+
+    :Example:
+
+    .. code-block:: python
+
+        >>> server = BrokerServer('127.0.0.1', 0)
+        >>> await server.start()
+        >>> transport = StreamTransport('127.0.0.1', server.port)
+
+    :param host: Host to listen on, ignored if path is set
+    :type host: str
+    :param port: Port to listen on, 0 picks free port
+    :type port: int
+    :param path: Path of Unix domain socket
+    :type path: str
+    """
+
+    def __init__(self, host: str = None, port: int = None, path: str = None):
+        self.host = host
+        self.port = port
+        self.path = path
+        self._server = None
+        self._subscribers = {}
+        self._tasks = set()
+
+    @property
+    def is_running(self) -> bool:
+        """Check if server has been started and not closed yet.
+
+        :return: Boolean
+        """
+        return self._server is not None
+
+    async def start(self):
+        """Start listening, port is resolved when 0 has been given."""
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._accept, path=self.path)
+            return
+        self._server = await asyncio.start_server(self._accept, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and close all connections."""
+        if not self.is_running:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._server = None
+
+    def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Start serving connected transport.
+
+        :param reader: Stream of transport
+        :type reader: asyncio.StreamReader
+        :param writer: Stream of transport
+        :type writer: asyncio.StreamWriter
+        """
+        task = asyncio.ensure_future(self._serve(reader, _Channel(writer)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _serve(self, reader: asyncio.StreamReader, channel: "_Channel"):
+        """Route frames of transport until connection is closed.
+
+        Connection with unknown command is closed.
+
+        :param reader: Stream of transport
+        :type reader: asyncio.StreamReader
+        :param channel: Channel of transport
+        :type channel: eeee.transport._Channel
+        """
+        try:
+            while True:
+                command, event, _, frame = await _read(reader)
+                self._route(channel, command, event, frame)
+        except (asyncio.IncompleteReadError, OSError, KeyError):
+            pass
+        finally:
+            for subscribers in self._subscribers.values():
+                subscribers.discard(channel)
+            channel.close()
+
+    def _route(self, channel: "_Channel", command: int, event: str, frame: list):
+        """Handle frame received from transport.
+
+        :param channel: Channel of transport
+        :type channel: eeee.transport._Channel
+        :param command: Frame command
+        :type command: int
+        :param event: Event name
+        :type event: str
+        :param frame: Received frame
+        :type frame: list
+        :raises KeyError: Unknown command
+        """
+        if command == PUBLISH:
+            self._publish(channel, event, frame)
+        else:
+            self._subscribe(channel, event, command)
+
+    def _publish(self, channel: "_Channel", event: str, frame: list):
+        """Forward frame to subscribers of event other than sender.
+
+        :param channel: Channel of sender
+        :type channel: eeee.transport._Channel
+        :param event: Event name
+        :type event: str
+        :param frame: Received frame
+        :type frame: list
+        """
+        for subscriber in self._subscribers.get(event, ()):
+            if subscriber is not channel:
+                subscriber.put(frame)
+
+    def _subscribe(self, channel: "_Channel", event: str, command: int):
+        """Add or remove subscription of transport.
+
+        :param channel: Channel of transport
+        :type channel: eeee.transport._Channel
+        :param event: Event name
+        :type event: str
+        :param command: SUBSCRIBE or UNSUBSCRIBE
+        :type command: int
+        :raises KeyError: Unknown command
+        """
+        subscribers = self._subscribers.setdefault(event, set())
+        {SUBSCRIBE: subscribers.add, UNSUBSCRIBE: subscribers.discard}[command](channel)
+
+
+class StreamTransport(Transport):
+    """Transport connected to :class:`BrokerServer` over TCP or Unix domain socket.
+
+    Transport keeps pool of connections and every event is bound to one
+    of them, so frames of single event keep their order. Frames queued
+    in single loop iteration are written to connection with single write.
+
+    :param host: Broker host, ignored if path is set
+    :type host: str
+    :param port: Broker port
+    :type port: int
+    :param path: Path of broker Unix domain socket
+    :type path: str
+    :param pool_size: Number of connections
+    :type pool_size: int
+    :raises eeee.exceptions.LimitError: Limit error
+    """
+
+    def __init__(self, host: str = None, port: int = None, path: str = None,
+                 pool_size: int = 1):
+        _is_limit(pool_size)
+        self.host = host
+        self.port = port
+        self.path = path
+        self.pool_size = pool_size
+        self._receivers = {}
+        self._channels = ()
+        self._tasks = ()
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._channels)
+
+    async def start(self):
+        streams = [await self._open() for _ in range(self.pool_size)]
+        self._channels = tuple(_Channel(writer) for _, writer in streams)
+        self._tasks = tuple(asyncio.ensure_future(self._receive(reader)) for reader, _ in streams)
+        for event in self._receivers:
+            self._channel(event).put(_frame(SUBSCRIBE, event))
+
+    async def close(self):
+        if not self.is_running:
+            return
+        await self.flush()
+        for channel in self._channels:
+            channel.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._channels = self._tasks = ()
+
+    async def flush(self):
+        await asyncio.gather(*[channel.drain() for channel in self._channels])
+
+    def send(self, event: str, payload: list):
+        self._channel(event).put(_frame(PUBLISH, event, payload))
+
+    def subscribe(self, event: str, receiver: callable):
+        self._receivers[event] = receiver
+        if self.is_running:
+            self._channel(event).put(_frame(SUBSCRIBE, event))
+
+    def unsubscribe(self, event: str):
+        self._receivers.pop(event, None)
+        if self.is_running:
+            self._channel(event).put(_frame(UNSUBSCRIBE, event))
+
+    async def _open(self) -> tuple:
+        """Open connection to broker.
+
+        :return: Reader and writer
+        :rtype: tuple
+        """
+        if self.path is not None:
+            return await asyncio.open_unix_connection(self.path)
+        return await asyncio.open_connection(self.host, self.port)
+
+    def _channel(self, event: str) -> "_Channel":
+        """Get connection of event.
+
+        :param event: Event name
+        :type event: str
+        :raises eeee.exceptions.TransportClosedError: Transport closed error
+        :return: Channel
+        :rtype: eeee.transport._Channel
+        """
+        if not self._channels:
+            raise exceptions.TransportClosedError
+        return self._channels[hash(event) % len(self._channels)]
+
+    async def _receive(self, reader: asyncio.StreamReader):
+        """Pass received payloads to receivers until connection is closed.
+
+        :param reader: Stream of broker
+        :type reader: asyncio.StreamReader
+        """
+        try:
+            while True:
+                _, event, payload, _ = await _read(reader)
+                await self._receivers.get(event, _discard)(event, payload)
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+
+
+class _Channel:
+    """Stream writer batching frames queued in single loop iteration.
+
+    :param writer: Stream writer
+    :type writer: asyncio.StreamWriter
+    """
+
+    __slots__ = ('writer', 'pending', 'loop')
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.pending = []
+        self.loop = asyncio.get_event_loop()
+
+    def put(self, frame: list):
+        """Queue frame, write is scheduled with first queued frame.
+
+        :param frame: List of bytes-like chunks
+        :type frame: list
+        """
+        if not self.pending:
+            self.loop.call_soon(self.write)
+        self.pending.extend(frame)
+
+    def write(self):
+        """Write queued frames unless connection is closing."""
+        chunks, self.pending = self.pending, []
+        if chunks and not self.writer.transport.is_closing():
+            self.writer.writelines(chunks)
+
+    async def drain(self):
+        """Write queued frames and wait until they are sent."""
+        self.write()
+        await self.writer.drain()
+
+    def close(self):
+        """Write queued frames and close connection."""
+        self.write()
+        self.writer.close()
+
+
+def _frame(command: int, event: str, payload: list = ()) -> list:
+    """Encode frame, payload chunks are not copied.
+
+    Frame is a header of command, length of event name and length of payload,
+    followed by UTF-8 event name and payload.
+
+    :param command: PUBLISH, SUBSCRIBE or UNSUBSCRIBE
+    :type command: int
+    :param event: Event name
+    :type event: str
+    :param payload: List of bytes-like chunks
+    :type payload: list
+    :return: List of bytes-like chunks
+    :rtype: list
+    """
+    name = event.encode()
+    return [_HEADER.pack(command, len(name), codec.size(payload)), name] + list(payload)
+
+
+async def _read(reader: asyncio.StreamReader) -> tuple:
+    """Read single frame.
+
+    :param reader: Stream
+    :type reader: asyncio.StreamReader
+    :raises asyncio.IncompleteReadError: Connection closed
+    :return: Command, event name, payload view and whole frame as list of chunks
+    :rtype: tuple
+    """
+    header = await reader.readexactly(_HEADER.size)
+    command, name_size, payload_size = _HEADER.unpack(header)
+    body = await reader.readexactly(name_size + payload_size)
+    return command, body[:name_size].decode(), memoryview(body)[name_size:], [header, body]
+
+
+async def _discard(event: str, payload: Union[bytes, memoryview, list]):
+    """Receiver of payloads of events no longer subscribed to.
+
+    :param event: Event name
+    :type event: str
+    :param payload: Serialized message
+    :type payload: bytes, memoryview, list
+    """
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+
+from eeee import Event
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+def collecting_event(name: str, received: list, **options) -> Event:
+    """Create event with handler appending message and publisher name to received list.
+
+    :param name: Event name
+    :type name: str
+    :param received: List of received (message, publisher name) pairs
+    :type received: list
+    :param options: Subscribe options of handler
+    :return: Event
+    :rtype: eeee.event.Event
+    """
+    event = Event(name)
+
+    # noinspection PyShadowingNames,PyUnusedLocal
+    @event.subscribe(**options)
+    async def collect(message, publisher, event):
+        received.append((message, publisher and publisher.name))
+        return message
+
+    return event
+
+
+async def until(condition: callable, timeout: float = 5.0):
+    """Wait until condition is true or timeout passes.
+
+    :param condition: Callable without arguments
+    :type condition: callable
+    :param timeout: Time limit in seconds
+    :type timeout: float
+    """
+    loop = asyncio.get_event_loop()
+    end = loop.time() + timeout
+    while not condition() and loop.time() < end:
+        await asyncio.sleep(0.005)
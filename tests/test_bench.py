@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+
+from eeee import bench
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class TestBench(unittest.TestCase):
+    def test_run_quick_matrix(self):
+        report = bench.run(quick=True, budget=10)
+
+        self.assertEqual(len(report['results']), sum(map(len, bench.QUICK_MATRIX.values())))
+        for result in report['results']:
+            self.assertGreaterEqual(result['operations'], bench.MIN_OPERATIONS)
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertLessEqual(result['latency_us']['p50'], result['latency_us']['max'])
+
+    def test_main_writes_json(self):
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        try:
+            bench.main(['--quick', '--budget', '10', '--scenario', 'churn', '--output', path])
+            with open(path) as output:
+                report = json.load(output)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(report['budget'], 10)
+        self.assertListEqual([result['scenario'] for result in report['results']],
+                             ['churn'] * len(bench.QUICK_MATRIX['churn']))
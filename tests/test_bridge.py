@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import multiprocessing
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+from cl import Loop
+
+from eeee import Coalescer, Event
+from eeee.bridge import ProcessBridge
+from tests.helpers import collecting_event, until
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+def worker(directory: str, ready, received, stop):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    jobs, replies = Event('jobs'), Event('replies')
+
+    # noinspection PyShadowingNames,PyUnusedLocal
+    @jobs.subscribe()
+    async def reply(message, publisher, event):
+        received.put((os.getpid(), message, publisher.name))
+        await replies.publish('done by {}'.format(os.getpid()), 'worker')
+
+    async def serve():
+        bridge = ProcessBridge(directory, [jobs, replies])
+        await bridge.start()
+        ready.put(os.getpid())
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+        await bridge.close()
+
+    loop.run_until_complete(serve())
+    loop.close()
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix domain sockets are not supported')
+class TestProcessBridge(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_attach_and_detach(self):
+        event = Event('attached')
+        bridge = ProcessBridge(self.directory, [event])
+        # noinspection PyProtectedMember
+        self.assertIn(bridge, event._plan().hooks)
+
+        bridge.detach(event)
+        # noinspection PyProtectedMember
+        self.assertTupleEqual(event._plan().hooks, ())
+
+    def test_mirror_without_echo(self):
+        first_received, second_received = [], []
+        first = collecting_event('news', first_received)
+        second = collecting_event('news', second_received)
+        first_bridge = ProcessBridge(self.directory, [first], name='first')
+        second_bridge = ProcessBridge(self.directory, [second], name='second')
+
+        async def scenario():
+            await first_bridge.start()
+            await second_bridge.start()
+            await first_bridge.discover()
+            await first.publish('one', 'sender')
+            await first.publish('two')
+            await until(lambda: len(second_received) == 2)
+            await second.publish('three')
+            await until(lambda: len(first_received) == 3)
+            await asyncio.sleep(0.05)
+            stats = first_bridge.stats(), second_bridge.stats()
+            await first_bridge.close()
+            await second_bridge.close()
+            return stats
+
+        with Loop(scenario()) as loop:
+            first_stats, second_stats = loop.run_until_complete()
+
+        self.assertListEqual([message for message, _ in first_received], ['one', 'two', 'three'])
+        self.assertListEqual(second_received, [('one', 'sender'), ('two', None), ('three', None)])
+        self.assertEqual((first_stats.peers, first_stats.sent, first_stats.received), (1, 2, 1))
+        self.assertEqual((second_stats.sent, second_stats.received), (1, 2))
+        self.assertListEqual(os.listdir(self.directory), [])
+        self.assertTupleEqual(first.HOOKS, ())
+
+    def test_coalesced_mirror_without_echo(self):
+        first_received, second_received = [], []
+        first = collecting_event('coalesced', first_received)
+        second = collecting_event('coalesced', second_received)
+        first.COALESCE = Coalescer(window=0.01)
+        second.COALESCE = Coalescer(window=0.01)
+        first_bridge = ProcessBridge(self.directory, [first], name='first')
+        second_bridge = ProcessBridge(self.directory, [second], name='second')
+
+        async def scenario():
+            await first_bridge.start()
+            await second_bridge.start()
+            await first_bridge.discover()
+            await first.publish('one', 'sender')
+            await until(lambda: second_received)
+            await asyncio.sleep(0.1)
+            stats = first_bridge.stats(), second_bridge.stats()
+            await first_bridge.close()
+            await second_bridge.close()
+            return stats
+
+        with Loop(scenario()) as loop:
+            first_stats, second_stats = loop.run_until_complete()
+
+        self.assertListEqual(first_received, [('one', 'sender')])
+        self.assertListEqual(second_received, [('one', 'sender')])
+        self.assertEqual((first_stats.sent, first_stats.received), (1, 0))
+        self.assertEqual((second_stats.sent, second_stats.received), (0, 1))
+
+    def test_batched_write(self):
+        received = []
+        source = Event('batch')
+        target = collecting_event('batch', received)
+        source_bridge = ProcessBridge(self.directory, [source], name='source')
+        target_bridge = ProcessBridge(self.directory, [target], name='target')
+
+        async def scenario():
+            await target_bridge.start()
+            await source_bridge.start()
+            writes = []
+            # noinspection PyProtectedMember
+            writer, = source_bridge._peers.values()
+            writelines = writer.writelines
+            writer.writelines = lambda data: writes.append(data) or writelines(data)
+            await asyncio.gather(*[source.publish(index) for index in range(10)])
+            await until(lambda: len(received) == 10)
+            await source_bridge.close()
+            await target_bridge.close()
+            return writes
+
+        with Loop(scenario()) as loop:
+            writes = loop.run_until_complete()
+
+        self.assertEqual(len(writes), 1)
+        self.assertListEqual([message for message, _ in received], list(range(10)))
+
+    def test_large_binary_message(self):
+        received = []
+        source = Event('blobs')
+        target = collecting_event('blobs', received)
+        source_bridge = ProcessBridge(self.directory, [source], name='source')
+        target_bridge = ProcessBridge(self.directory, [target], name='target')
+        blob = os.urandom(1 << 20)
+
+        async def scenario():
+            await target_bridge.start()
+            await source_bridge.start()
+            await source.publish({'blob': blob, 'view': memoryview(blob)[:1024]})
+            await until(lambda: received)
+            await source_bridge.close()
+            await target_bridge.close()
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        (message, _), = received
+        self.assertEqual(message['blob'], blob)
+        self.assertEqual(bytes(message['view']), blob[:1024])
+
+    def test_failed_delivery(self):
+        target = Event('failing')
+        target.RETURN_EXCEPTIONS = False
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @target.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise ValueError(message)
+
+        source = Event('failing')
+        source_bridge = ProcessBridge(self.directory, [source], name='source')
+        target_bridge = ProcessBridge(self.directory, [target], name='target')
+
+        async def scenario():
+            await target_bridge.start()
+            await source_bridge.start()
+            await source.publish('boom')
+            await source.publish('bang')
+            await until(lambda: target_bridge.failed == 2)
+            await source_bridge.close()
+            await target_bridge.close()
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertEqual((target_bridge.received, target_bridge.failed), (2, 2))
+
+    def test_mirror_across_processes(self):
+        context = multiprocessing.get_context('fork')
+        ready, received, stop = context.Queue(), context.Queue(), context.Event()
+        replies = []
+        jobs = Event('jobs')
+        bridge = ProcessBridge(self.directory, [jobs, collecting_event('replies', replies)])
+        workers = [context.Process(target=worker, args=(self.directory, ready, received, stop))
+                   for _ in range(2)]
+
+        async def scenario():
+            await bridge.start()
+            for process in workers:
+                process.start()
+            loop = asyncio.get_event_loop()
+            pids = [await loop.run_in_executor(None, ready.get, True, 10) for _ in workers]
+            await bridge.discover()
+            await jobs.publish('job', 'parent')
+            jobs_received = [await loop.run_in_executor(None, received.get, True, 10)
+                             for _ in workers]
+            await until(lambda: len(replies) == 2)
+            stop.set()
+            await loop.run_in_executor(None, _join, workers)
+            await bridge.close()
+            return pids, jobs_received
+
+        with Loop(scenario()) as loop:
+            pids, jobs_received = loop.run_until_complete()
+
+        self.assertListEqual(sorted(jobs_received),
+                             sorted((pid, 'job', 'parent') for pid in pids))
+        self.assertListEqual(sorted(replies),
+                             sorted(('done by {}'.format(pid), 'worker') for pid in pids))
+        self.assertTrue(all(process.exitcode == 0 for process in workers))
+
+
+def _join(processes: list):
+    for process in processes:
+        process.join(10)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import gc
+import unittest
+
+from cl import Loop
+
+from eeee import Event, EventBus, exceptions
+from eeee.bus import PatternSubscription
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class Recorder:
+    def __init__(self, name: str):
+        self.__name__ = name
+
+    # noinspection PyUnusedLocal
+    async def __call__(self, message, publisher, event):
+        return self.__name__
+
+
+class TestRegistry(unittest.TestCase):
+    def test_event_created_once(self):
+        bus = EventBus()
+        event = bus.event('orders.created')
+
+        self.assertIsInstance(event, Event)
+        self.assertEqual(event.name, 'orders.created')
+        self.assertIs(bus.event('orders.created'), event)
+        self.assertIn('orders.created', bus)
+        self.assertListEqual(list(bus), ['orders.created'])
+        self.assertEqual(len(bus), 1)
+
+    def test_raise_on_wildcard_topic(self):
+        with self.assertRaises(exceptions.NamingError):
+            EventBus().event('orders.*')
+
+    def test_raise_on_bad_naming(self):
+        with self.assertRaises(exceptions.NamingError):
+            EventBus().event(['orders'])
+
+
+class TestTopicMatching(unittest.TestCase):
+    @staticmethod
+    def publish(bus: EventBus, topic: str):
+        with Loop(bus.publish(topic, 'message')) as loop:
+            return loop.run_until_complete()
+
+    def test_exact_topic(self):
+        bus = EventBus()
+        bus.subscribe('orders.created')(Recorder('exact'))
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['exact'])
+        self.assertListEqual(self.publish(bus, 'orders.deleted'), [])
+
+    def test_single_segment_wildcard(self):
+        bus = EventBus()
+        bus.subscribe('orders.*')(Recorder('one'))
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['one'])
+        self.assertListEqual(self.publish(bus, 'orders'), [])
+        self.assertListEqual(self.publish(bus, 'orders.eu.created'), [])
+
+    def test_multi_segment_wildcard(self):
+        bus = EventBus()
+        bus.subscribe('orders.#')(Recorder('many'))
+        bus.subscribe('#.created')(Recorder('suffix'))
+
+        self.assertListEqual(self.publish(bus, 'orders'), ['many'])
+        self.assertListEqual(self.publish(bus, 'orders.eu.created'), ['many', 'suffix'])
+        self.assertListEqual(self.publish(bus, 'users.created'), ['suffix'])
+
+    def test_custom_wildcards(self):
+        class MqttBus(EventBus):
+            SEPARATOR = '/'
+            ONE = '+'
+            MANY = '>'
+
+        bus = MqttBus()
+        bus.subscribe('orders/+')(Recorder('one'))
+        bus.subscribe('orders/>')(Recorder('many'))
+        bus.subscribe('orders/*')(Recorder('literal'))
+
+        self.assertListEqual(self.publish(bus, 'orders/created'), ['one', 'many'])
+        self.assertListEqual(self.publish(bus, 'orders/eu/created'), ['many'])
+        self.assertListEqual(self.publish(bus, 'orders/*'), ['one', 'many', 'literal'])
+
+    def test_pattern_added_to_existing_events(self):
+        bus = EventBus()
+        bus.subscribe('orders.created')(Recorder('exact'))
+        bus.event('users.created')
+        bus.subscribe('*.created')(Recorder('late'))
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['exact', 'late'])
+        self.assertListEqual(self.publish(bus, 'users.created'), ['late'])
+
+    def test_pattern_with_publisher(self):
+        bus = EventBus()
+        bus.subscribe('orders.*', publisher='webhook')(Recorder('webhook'))
+
+        with Loop(bus.publish('orders.created', 'message', 'webhook')) as loop:
+            self.assertListEqual(loop.run_until_complete(), ['webhook'])
+        self.assertListEqual(self.publish(bus, 'orders.created'), [])
+
+    def test_unsubscribe_pattern(self):
+        bus = EventBus()
+        recorder = Recorder('gone')
+        bus.subscribe('orders.#')(recorder)
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['gone'])
+
+        bus.unsubscribe(recorder, 'orders.#')
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), [])
+        self.assertListEqual(self.publish(bus, 'orders.deleted'), [])
+
+    def test_unsubscribe_pattern_keeps_topic(self):
+        bus = EventBus()
+        recorder = Recorder('both')
+        bus.subscribe('orders.created')(recorder)
+        bus.subscribe('orders.*')(recorder)
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['both', 'both'])
+
+        bus.unsubscribe(recorder, 'orders.*')
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['both'])
+
+    def test_unsubscribe_threaded_pattern(self):
+        bus = EventBus()
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        def blocking_handler(message, publisher, event):
+            return 'blocking'
+
+        bus.subscribe('orders.*', executor='thread')(blocking_handler)
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['blocking'])
+
+        bus.unsubscribe(blocking_handler, 'orders.*')
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), [])
+
+    def test_unsubscribe_topic(self):
+        bus = EventBus()
+        recorder = Recorder('gone')
+        bus.subscribe('orders.created')(recorder)
+        bus.unsubscribe(recorder, 'orders.created')
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), [])
+
+    def test_weak_pattern_pruned(self):
+        bus = EventBus()
+        recorder = Recorder('weak')
+        bus.subscribe('orders.*', weak=True)(recorder)
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['weak'])
+
+        del recorder
+        gc.collect()
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), [])
+        self.assertListEqual(self.publish(bus, 'orders.deleted'), [])
+        self.assertListEqual(bus._trie.find(['orders', '*']).subscriptions, [])
+
+    def test_topic_subscription_handle(self):
+        bus = EventBus()
+        subscription = bus.subscribe('orders.created')(Recorder('handle'))
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['handle'])
+
+        subscription.cancel()
+
+        self.assertListEqual(self.publish(bus, 'orders.created'), [])
+
+    def test_pattern_subscription_handle(self):
+        bus = EventBus()
+        recorder = Recorder('handle')
+        bus.subscribe('orders.created')(recorder)
+        bus.event('orders.deleted')
+
+        with bus.subscribe('orders.*')(recorder) as subscription:
+            self.assertIsInstance(subscription, PatternSubscription)
+            self.assertEqual(subscription.pattern, 'orders.*')
+            self.assertListEqual(self.publish(bus, 'orders.created'), ['handle', 'handle'])
+            self.assertListEqual(self.publish(bus, 'orders.updated'), ['handle'])
+
+        self.assertFalse(subscription.active)
+        self.assertListEqual(self.publish(bus, 'orders.created'), ['handle'])
+        self.assertListEqual(self.publish(bus, 'orders.deleted'), [])
+        self.assertListEqual(self.publish(bus, 'orders.updated'), [])
+        subscription.cancel()
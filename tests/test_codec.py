@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import pickle
+import unittest
+
+from cl import Loop
+
+from eeee import Event
+from eeee.codec import Codec, PickleCodec, size
+from eeee.transport import LoopbackBroker, LoopbackTransport, Relay
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+OUT_OF_BAND = hasattr(pickle, 'PickleBuffer')
+
+
+class JsonCodec(Codec):
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, obj):
+        self.encoded += 1
+        return [json.dumps(obj).encode()]
+
+    def decode(self, data):
+        return json.loads(bytes(data[0] if isinstance(data, list) else data).decode())
+
+
+class TestPickleCodec(unittest.TestCase):
+    def test_round_trip(self):
+        codec = PickleCodec()
+        message = {'text': 'hello', 'numbers': [1, 2, 3], 'small': b'bytes'}
+
+        chunks = codec.encode(message)
+
+        self.assertEqual(len(chunks), 2)
+        self.assertDictEqual(codec.decode(chunks), message)
+        self.assertDictEqual(codec.decode(b''.join(chunks)), message)
+        self.assertEqual(size(chunks), len(b''.join(chunks)))
+
+    @unittest.skipUnless(OUT_OF_BAND, 'pickle protocol 5 requires Python 3.8')
+    def test_out_of_band(self):
+        codec = PickleCodec(threshold=1024)
+        blob = b'x' * 4096
+        mutable = bytearray(b'y' * 2048)
+        view = memoryview(b'z' * 1024)
+
+        chunks = codec.encode({'blob': blob, 'again': [blob], 'mutable': mutable, 'view': view})
+
+        self.assertEqual(len(chunks), 5)
+        self.assertIs(chunks[2].obj, blob)
+        self.assertIs(chunks[3].obj, mutable)
+        self.assertLess(len(chunks[1]), 1024)
+        for decoded in (codec.decode(chunks), codec.decode(memoryview(b''.join(chunks)))):
+            self.assertEqual(decoded['blob'], blob)
+            self.assertEqual(decoded['again'][0], blob)
+            self.assertIs(type(decoded['mutable']), bytearray)
+            self.assertEqual(decoded['mutable'], mutable)
+            self.assertIs(type(decoded['view']), memoryview)
+            self.assertEqual(decoded['view'], view)
+
+    @unittest.skipUnless(OUT_OF_BAND, 'pickle protocol 5 requires Python 3.8')
+    def test_deeply_nested_buffers(self):
+        codec = PickleCodec(threshold=1024)
+        message = {'a': {'b': {'blob': b'x' * 4096, 'view': memoryview(b'small')}}}
+
+        chunks = codec.encode(message)
+        decoded = codec.decode(chunks)
+
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(decoded['a']['b']['blob'], b'x' * 4096)
+        self.assertEqual(decoded['a']['b']['view'], b'small')
+
+    def test_small_message_in_band(self):
+        codec = PickleCodec(threshold=1024)
+
+        chunks = codec.encode({'a': {'b': {'small': b'bytes'}}, 'text': 'x' * 2048})
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(codec.decode(chunks)['text'], 'x' * 2048)
+
+    @unittest.skipUnless(OUT_OF_BAND, 'pickle protocol 5 requires Python 3.8')
+    def test_received_view_is_not_copied(self):
+        codec = PickleCodec(threshold=1024)
+        received = bytearray(b''.join(codec.encode(memoryview(b'z' * 2048))))
+
+        decoded = codec.decode(received)
+        received[-1] = ord('!')
+
+        self.assertEqual(bytes(decoded[-1:]), b'!')
+
+    def test_codec_is_picklable(self):
+        codec = pickle.loads(pickle.dumps(PickleCodec(threshold=10)))
+
+        self.assertEqual(codec.threshold, 10)
+
+
+class TestCustomCodec(unittest.TestCase):
+    def test_interface(self):
+        class Incomplete(Codec):
+            def encode(self, obj):
+                return [b'']
+
+        with self.assertRaises(TypeError):
+            Codec()
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_relay_codec(self):
+        broker = LoopbackBroker()
+        received = []
+        source, target = Event('json'), Event('json')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @target.subscribe()
+        async def collect(message, publisher, event):
+            received.append(message)
+
+        sender, receiver = Relay(LoopbackTransport(broker), [source]), Relay(
+            LoopbackTransport(broker), [target])
+        sender.CODEC = receiver.CODEC = JsonCodec()
+
+        async def scenario():
+            await receiver.start()
+            await sender.start()
+            await source.publish({'id': 1})
+            await sender.transport.flush()
+            await asyncio.sleep(0.01)
+            await sender.close()
+            await receiver.close()
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(received, [{'id': 1}])
+        self.assertEqual(sender.CODEC.encoded, 1)
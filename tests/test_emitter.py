@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from cl import Loop
+
+from eeee import AsyncEmitter, Event, exceptions
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class Collector:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.received = []
+
+    # noinspection PyUnusedLocal
+    async def __call__(self, message, publisher, event):
+        await asyncio.sleep(self.delay)
+        self.received.append(message)
+
+
+class TestEmit(unittest.TestCase):
+    def test_emit_and_close(self):
+        event = Event('emit')
+        collector = Collector()
+        event.subscribe()(collector)
+        emitter = AsyncEmitter(event, workers=2)
+
+        async def scenario():
+            for message in range(5):
+                await emitter.emit(message)
+            await emitter.close()
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(sorted(collector.received), [0, 1, 2, 3, 4])
+        self.assertTrue(emitter.is_closed)
+        self.assertEqual(emitter.stats(), (0, 5, 0, 0))
+
+    def test_emit_does_not_wait_for_handlers(self):
+        event = Event('emit fast')
+        collector = Collector(delay=0.05)
+        event.subscribe()(collector)
+        emitter = AsyncEmitter(event)
+
+        async def scenario():
+            await emitter.emit('slow')
+            received = list(collector.received)
+            await emitter.close()
+            return received
+
+        with Loop(scenario()) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+        self.assertListEqual(collector.received, ['slow'])
+
+    def test_emit_after_close(self):
+        emitter = AsyncEmitter(Event('closed'))
+
+        async def scenario():
+            await emitter.close()
+            await emitter.emit('too late')
+
+        with self.assertRaises(exceptions.EmitterClosedError):
+            with Loop(scenario()) as loop:
+                loop.run_until_complete()
+
+    def test_close_without_drain(self):
+        event = Event('emit discard')
+        collector = Collector(delay=0.05)
+        event.subscribe()(collector)
+        emitter = AsyncEmitter(event)
+
+        async def scenario():
+            for message in range(5):
+                await emitter.emit(message)
+            await emitter.close(drain=False)
+            await asyncio.wait_for(emitter.drain(), 1)
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(collector.received, [])
+        self.assertEqual(emitter.stats(), (0, 5, 5, 0))
+
+    def test_close_with_blocked_emit(self):
+        event = Event('emit blocked close')
+        collector = Collector(delay=0.05)
+        event.subscribe()(collector)
+        emitter = AsyncEmitter(event, maxsize=1, workers=1)
+
+        async def scenario():
+            await emitter.emit(0)
+            await asyncio.sleep(0)
+            await emitter.emit(1)
+            blocked = asyncio.ensure_future(emitter.emit(2))
+            await asyncio.sleep(0.01)
+            await emitter.close(drain=False)
+            with self.assertRaises(exceptions.EmitterClosedError):
+                await blocked
+            await asyncio.wait_for(emitter.drain(), 1)
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(collector.received, [])
+        self.assertEqual(emitter.stats(), (0, 2, 2, 0))
+
+    def test_failed_handlers_are_counted(self):
+        event = Event('emit failure')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise ValueError(message)
+
+        emitter = AsyncEmitter(event)
+
+        async def scenario():
+            await emitter.emit('boom')
+            await emitter.close()
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertEqual(emitter.failed, 1)
+
+
+class TestBackpressure(unittest.TestCase):
+    @staticmethod
+    def fill(backpressure: str):
+        event = Event('backpressure')
+        collector = Collector()
+        event.subscribe()(collector)
+        emitter = AsyncEmitter(event, maxsize=2, backpressure=backpressure)
+
+        async def scenario():
+            try:
+                return [await emitter.emit(message) for message in range(4)]
+            finally:
+                await emitter.close()
+
+        with Loop(scenario()) as loop:
+            accepted = loop.run_until_complete()
+        return emitter, collector, accepted
+
+    def test_drop_newest(self):
+        emitter, collector, accepted = self.fill(AsyncEmitter.DROP_NEWEST)
+
+        self.assertListEqual(accepted, [True, True, False, False])
+        self.assertListEqual(collector.received, [0, 1])
+        self.assertEqual(emitter.dropped, 2)
+
+    def test_drop_oldest(self):
+        emitter, collector, accepted = self.fill(AsyncEmitter.DROP_OLDEST)
+
+        self.assertListEqual(accepted, [True, True, True, True])
+        self.assertListEqual(collector.received, [2, 3])
+        self.assertEqual(emitter.dropped, 2)
+
+    def test_block(self):
+        emitter, collector, accepted = self.fill(AsyncEmitter.BLOCK)
+
+        self.assertListEqual(collector.received, [0, 1, 2, 3])
+        self.assertEqual(emitter.dropped, 0)
+
+    def test_raise(self):
+        with self.assertRaises(exceptions.QueueFullError):
+            self.fill(AsyncEmitter.RAISE)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(exceptions.PolicyError):
+            AsyncEmitter(Event('unknown policy'), backpressure='ignore')
+
+    def test_wrong_limits(self):
+        with self.assertRaises(exceptions.LimitError):
+            AsyncEmitter(Event('no workers'), workers=0)
+
+        with self.assertRaises(exceptions.LimitError):
+            AsyncEmitter(Event('unbounded'), maxsize=0)
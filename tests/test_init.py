@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import unittest
+
+import eeee
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code: str) -> str:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [
+        ROOT, os.environ.get('PYTHONPATH')])))
+    return subprocess.check_output([sys.executable, '-c', code], env=env).decode().strip()
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'module __getattr__ requires Python 3.7')
+class TestLazyImport(unittest.TestCase):
+    def test_import_loads_nothing(self):
+        loaded = run('import sys, eeee; '
+                     'print(sorted(m for m in sys.modules if m.startswith(("eeee", "cl"))))')
+        self.assertEqual(loaded, "['eeee']")
+
+    def test_event_without_context_loop(self):
+        result = run('import sys; sys.modules["cl"] = None\n'
+                     'from eeee import Event\n'
+                     'import eeee.event\n'
+                     'try:\n'
+                     '    from eeee import Loop\n'
+                     'except ImportError:\n'
+                     '    print(Event.__module__, "without Loop")')
+        self.assertEqual(result, 'eeee.event without Loop')
+
+    def test_names_resolved_on_access(self):
+        from eeee.event import Event
+
+        self.assertIs(eeee.Event, Event)
+        self.assertIn('Event', vars(eeee))
+        self.assertTrue(set(eeee.__all__) <= set(dir(eeee)))
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            getattr(eeee, 'Unknown')
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from cl import Loop
+
+from eeee import Event, Metrics
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+# noinspection PyShadowingNames,PyUnusedLocal
+async def sleepy_handler(message, publisher, event):
+    await asyncio.sleep(0.002)
+
+
+# noinspection PyShadowingNames,PyUnusedLocal
+async def failing_handler(message, publisher, event):
+    raise ValueError(message)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_disabled_by_default(self):
+        event = Event('not instrumented')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def handler(message, publisher, event):
+            return message
+
+        self.assertIsNone(event.METRICS)
+        # noinspection PyProtectedMember
+        plan = event._plan()
+        self.assertIs(plan[0], handler.handler)
+
+    def test_enable_on_live_event(self):
+        event = Event('live')
+        event.RETURN_EXCEPTIONS = True
+        event.subscribe()(sleepy_handler)
+        event.subscribe()(failing_handler)
+        metrics = Metrics()
+
+        with Loop(event.publish('not measured')) as loop:
+            loop.run_until_complete()
+        event.METRICS = metrics
+        with Loop(event.publish('measured')) as loop:
+            loop.run_until_complete()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot.events[0].published, 1)
+        self.assertEqual([stats.calls for stats in snapshot.subscribers], [1, 1])
+
+    def test_event_metrics(self):
+        event = Event('instrumented')
+        event.METRICS, event.RETURN_EXCEPTIONS = Metrics(), True
+        event.subscribe()(sleepy_handler)
+        event.subscribe()(failing_handler)
+
+        with Loop(event.publish('one')) as loop:
+            loop.run_until_complete()
+        with Loop(event.publish_many(['two', 'three'])) as loop:
+            loop.run_until_complete()
+
+        stats, = event.METRICS.snapshot().events
+        self.assertEqual(stats.name, 'instrumented')
+        self.assertEqual(stats.published, 3)
+        self.assertEqual(stats.fan_out.count, 3)
+        self.assertEqual(stats.fan_out.sum, 6)
+        self.assertEqual(stats.fan_out.counts[1], 3)
+
+    def test_subscriber_metrics(self):
+        event = Event('subscribers')
+        event.METRICS, event.RETURN_EXCEPTIONS = Metrics(), True
+        event.subscribe()(sleepy_handler)
+        event.subscribe()(failing_handler)
+
+        with Loop(event.publish_many(['one', 'two'])) as loop:
+            loop.run_until_complete()
+
+        sleepy, failing = event.METRICS.snapshot().subscribers
+        self.assertEqual((sleepy.event, sleepy.name), ('subscribers', 'sleepy_handler'))
+        self.assertEqual((sleepy.calls, sleepy.exceptions), (2, 0))
+        self.assertEqual((failing.calls, failing.exceptions), (2, 2))
+        self.assertEqual(sum(sleepy.latency.counts), 2)
+        self.assertGreaterEqual(sleepy.latency.sum, 0.004)
+        self.assertEqual(sum(sleepy.latency.counts[:11]), 0)
+
+    def test_reset(self):
+        event = Event('reset')
+        event.METRICS, event.RETURN_EXCEPTIONS = Metrics(), True
+        event.subscribe()(sleepy_handler)
+        event.subscribe()(failing_handler)
+
+        with Loop(event.publish('one')) as loop:
+            loop.run_until_complete()
+        event.METRICS.reset()
+
+        snapshot = event.METRICS.snapshot()
+        self.assertEqual(snapshot.events[0].published, 0)
+        self.assertEqual(snapshot.subscribers[1].exceptions, 0)
+        self.assertEqual(len(snapshot.subscribers), 2)
+
+    def test_prometheus(self):
+        event = Event('prom"etheus')
+        event.METRICS, event.RETURN_EXCEPTIONS = Metrics(), True
+        event.subscribe()(sleepy_handler)
+        event.subscribe()(failing_handler)
+
+        with Loop(event.publish('one')) as loop:
+            loop.run_until_complete()
+
+        text = event.METRICS.to_prometheus()
+        self.assertIn('# TYPE eeee_event_published_total counter\n', text)
+        self.assertIn('eeee_event_published_total{event="prom\\"etheus"} 1\n', text)
+        self.assertIn('eeee_event_fan_out_bucket{event="prom\\"etheus",le="2"} 1\n', text)
+        self.assertIn('# TYPE eeee_subscriber_latency_seconds histogram\n', text)
+        self.assertIn('eeee_subscriber_exceptions_total'
+                      '{event="prom\\"etheus",subscriber="failing_handler"} 1\n', text)
+        self.assertIn('eeee_subscriber_latency_seconds_bucket'
+                      '{event="prom\\"etheus",subscriber="failing_handler",le="+Inf"} 1\n', text)
+        self.assertTrue(text.endswith('\n'))
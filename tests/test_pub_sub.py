@@ -1,15 +1,50 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import asyncio
+import gc
+import os
+import re
+import threading
 import unittest
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
 
 from cl import Loop
 
-from eeee import Event, Publisher, subscribe
+from eeee import Event, Publisher, exceptions, subscribe
+from eeee import event as event_module
+from eeee.event import (Coalescer, PublisherPattern, RateLimit, Reducer, Subscriber,
+                        Subscription)
+from tests.helpers import collecting_event
 
 __author__ = 'Paweł Zadrożny'
 __copyright__ = 'Copyright (c) 2018, Pawelzny'
 
 
+class AsyncMessages:
+    def __init__(self, *messages):
+        self.pending = list(messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.pending:
+            raise StopAsyncIteration
+        return self.pending.pop(0)
+
+
+# noinspection PyShadowingNames,PyUnusedLocal
+def cpu_handler(message, publisher, event):
+    return os.getpid(), message * 2
+
+
+# noinspection PyShadowingNames,PyUnusedLocal
+def cpu_handler_copy(message, publisher, event):
+    return os.getpid(), message * 3
+
+
 class TestSubscribe(unittest.TestCase):
     def test_standalone_decorator(self):
         event = Event('sub standalone')
@@ -74,6 +109,32 @@ class TestSubscribe(unittest.TestCase):
         event.unsubscribe(i_feel_no_regret, Publisher('nuke'))
         self.assertEqual(len(event.pub_sub), 0)
 
+    def test_pub_sub_is_read_only(self):
+        event = Event('read only view')
+
+        with self.assertRaises(AttributeError):
+            event.pub_sub = tuple()
+
+    def test_pub_sub_keeps_registration_order(self):
+        event = Event('ordered routes')
+
+        @event.subscribe(publisher='first')
+        async def one():
+            pass
+
+        @event.subscribe()
+        async def two():
+            pass
+
+        @event.subscribe(publisher='first')
+        async def three():
+            pass
+
+        self.assertListEqual([ps.subscriber for ps in event.pub_sub], [one, two, three])
+
+        event.unsubscribe(one, 'first')
+        self.assertListEqual([ps.subscriber for ps in event.pub_sub], [two, three])
+
 
 class TestPublishMessage(unittest.TestCase):
     def test_publish_to_all(self):
@@ -142,6 +203,29 @@ class TestPublishMessage(unittest.TestCase):
         self.assertEqual(result[1], Publisher('broadcast'))
         self.assertEqual(result[2], 'publish to all but omit')
 
+    def test_publish_in_order_of_registration(self):
+        event = Event('publish in order')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher='ordered')
+        async def first_ord(message, publisher, event):
+            return 'first'
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def second_ord(message, publisher, event):
+            return 'second'
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher='ordered')
+        async def third_ord(message, publisher, event):
+            return 'third'
+
+        with Loop(event.publish('in order', 'ordered')) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result, ['first', 'second', 'third'])
+
     def test_publish_to_empty_event(self):
         event = Event('I am empty inside :(')
 
@@ -165,3 +249,1073 @@ class TestPublishMessage(unittest.TestCase):
             result = loop.run_until_complete()
 
         self.assertIsNone(result)
+
+    def test_publish_raise_from_single_handler(self):
+        event = Event('single raise')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise ValueError(message)
+
+        with self.assertRaises(ValueError):
+            with Loop(event.publish('boom')) as loop:
+                loop.run_until_complete()
+
+    def test_publish_return_exceptions(self):
+        event = Event('return exceptions')
+        event.RETURN_EXCEPTIONS = True
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise ValueError(message)
+
+        with Loop(event.publish('single')) as loop:
+            result = loop.run_until_complete()
+        self.assertIsInstance(result[0], ValueError)
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def fine_handler(message, publisher, event):
+            return message
+
+        with Loop(event.publish('many')) as loop:
+            result = loop.run_until_complete()
+        self.assertIsInstance(result[0], ValueError)
+        self.assertEqual(result[1], 'many')
+
+    def test_publish_return_base_exceptions(self):
+        event = Event('return base exceptions')
+        event.RETURN_EXCEPTIONS = True
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def exiting_handler(message, publisher, event):
+            raise GeneratorExit(message)
+
+        with Loop(event.publish('single')) as loop:
+            self.assertIsInstance(loop.run_until_complete()[0], GeneratorExit)
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def fine_handler(message, publisher, event):
+            return message
+
+        with Loop(event.publish('many')) as loop:
+            self.assertIsInstance(loop.run_until_complete()[0], GeneratorExit)
+
+
+class TestDispatchPlan(unittest.TestCase):
+    def test_plan_cache_hits(self):
+        event = Event('cached plan')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher='cached')
+        async def cached_handler(message, publisher, event):
+            return message
+
+        for _ in range(3):
+            with Loop(event.publish('hit me', 'cached')) as loop:
+                result = loop.run_until_complete()
+            self.assertListEqual(result, ['hit me'])
+
+        info = event.plan_cache_info()
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.currsize, 1)
+
+    def test_plan_invalidated_on_subscribe(self):
+        event = Event('invalidated plan')
+
+        with Loop(event.publish('before')) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def late_handler(message, publisher, event):
+            return message
+
+        with Loop(event.publish('after')) as loop:
+            self.assertListEqual(loop.run_until_complete(), ['after'])
+
+        event.unsubscribe(late_handler)
+        with Loop(event.publish('gone')) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+        self.assertEqual(event.plan_cache_info().misses, 3)
+
+    def test_plan_cache_is_bounded(self):
+        event = Event('bounded plans')
+        event.PLAN_CACHE_SIZE = 2
+
+        for publisher in ('one', 'two', 'three'):
+            with Loop(event.publish('message', publisher)) as loop:
+                loop.run_until_complete()
+
+        info = event.plan_cache_info()
+        self.assertEqual(info.currsize, 2)
+        self.assertEqual(info.maxsize, 2)
+
+
+class TestPublishMany(unittest.TestCase):
+    def test_publish_many(self):
+        event = Event('publish many')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def upper_handler(message, publisher, event):
+            return message.upper()
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher='batch')
+        async def lower_handler(message, publisher, event):
+            return message.lower()
+
+        with Loop(event.publish_many(['One', 'Two'], 'batch')) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result, [['ONE', 'one'], ['TWO', 'two']])
+        self.assertEqual(event.plan_cache_info().misses, 1)
+
+    def test_publish_many_async_iterable(self):
+        event = Event('publish many async')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def echo_handler(message, publisher, event):
+            return message
+
+        with Loop(event.publish_many(AsyncMessages('a', 'b', 'c'))) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result, [['a'], ['b'], ['c']])
+
+    def test_publish_many_without_subscribers(self):
+        event = Event('publish many to nobody')
+
+        with Loop(event.publish_many(['x', 'y'])) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result, [[], []])
+
+    def test_publish_many_return_exceptions(self):
+        event = Event('publish many exceptions')
+        event.RETURN_EXCEPTIONS = True
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def picky_handler(message, publisher, event):
+            if message == 'bad':
+                raise ValueError(message)
+            return message
+
+        with Loop(event.publish_many(['good', 'bad'])) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result[0], ['good'])
+        self.assertIsInstance(result[1][0], ValueError)
+
+    def test_publish_many_on_disabled_event(self):
+        event = Event('publish many disabled').disable()
+
+        with Loop(event.publish_many(['x'])) as loop:
+            self.assertIsNone(loop.run_until_complete())
+
+
+class Tracker:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    # noinspection PyUnusedLocal
+    async def __call__(self, message, publisher, event):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        return message
+
+
+class TestConcurrencyLimit(unittest.TestCase):
+    def test_event_limit(self):
+        event = Event('event limit')
+        event.MAX_CONCURRENCY = 2
+        tracker = Tracker()
+        for _ in range(5):
+            event.subscribe()(tracker)
+
+        with Loop(event.publish('limited')) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result, ['limited'] * 5)
+        self.assertEqual(tracker.peak, 2)
+
+    def test_change_event_limit(self):
+        event = Event('live event limit')
+        tracker = Tracker()
+        for _ in range(5):
+            event.subscribe()(tracker)
+
+        async def scenario():
+            await event.publish('free')
+            event.MAX_CONCURRENCY = 1
+            tracker.peak = 0
+            await event.publish('limited')
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertEqual(tracker.peak, 1)
+
+    def test_subscriber_limit(self):
+        event = Event('subscriber limit')
+        tracker = Tracker()
+        event.subscribe(concurrency=1)(tracker)
+
+        with Loop(event.publish_many(['first', 'second', 'third'])) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result, [['first'], ['second'], ['third']])
+        self.assertEqual(tracker.peak, 1)
+
+    def test_unlimited(self):
+        event = Event('unlimited')
+        tracker = Tracker()
+        for _ in range(5):
+            event.subscribe()(tracker)
+
+        with Loop(event.publish('free')) as loop:
+            loop.run_until_complete()
+
+        self.assertEqual(tracker.peak, 5)
+
+    def test_raise_limit_error(self):
+        with self.assertRaises(exceptions.LimitError):
+            Event('wrong limit').subscribe(concurrency=0)(Tracker())
+
+
+class TestThreadExecutor(unittest.TestCase):
+    def test_sync_and_async_handlers(self):
+        event = Event('mixed handlers')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(executor='thread')
+        def sync_handler(message, publisher, event):
+            return threading.current_thread().name
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def async_handler(message, publisher, event):
+            return threading.current_thread().name
+
+        with Loop(event.publish('mixed')) as loop:
+            result = loop.run_until_complete()
+
+        self.assertNotEqual(result[0], threading.current_thread().name)
+        self.assertEqual(result[1], threading.current_thread().name)
+
+    def test_event_executor(self):
+        event = Event('own executor')
+        event.THREAD_EXECUTOR = ThreadPoolExecutor(1, thread_name_prefix='eeee-test')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(executor='thread')
+        def sync_handler(message, publisher, event):
+            return threading.current_thread().name
+
+        with Loop(event.publish('pooled')) as loop:
+            result = loop.run_until_complete()
+
+        event.THREAD_EXECUTOR.shutdown()
+        self.assertTrue(result[0].startswith('eeee-test'))
+
+    def test_sync_handler_requires_executor(self):
+        event = Event('sync without executor')
+
+        def sync_handler(message, publisher, event):
+            pass
+
+        with self.assertRaises(exceptions.NotCoroutineError):
+            event.subscribe()(sync_handler)
+
+
+class TestProcessExecutor(unittest.TestCase):
+    def setUp(self):
+        self.pool = ProcessPoolExecutor(2)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_process_handlers(self):
+        event = Event('cpu bound')
+        event.PROCESS_EXECUTOR = self.pool
+        event.subscribe(executor='process')(cpu_handler)
+        event.subscribe(executor='process')(cpu_handler_copy)
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def loop_handler(message, publisher, event):
+            return os.getpid(), message
+
+        with mock.patch('eeee.event._serialize', wraps=event_module._serialize) as serialize:
+            with Loop(event.publish(21)) as loop:
+                result = loop.run_until_complete()
+
+        self.assertEqual(serialize.call_count, 1)
+        self.assertListEqual([value for _, value in result], [42, 63, 21])
+        self.assertNotEqual(result[0][0], os.getpid())
+        self.assertEqual(result[2][0], os.getpid())
+
+    def test_process_handlers_many(self):
+        event = Event('cpu bound batch')
+        event.PROCESS_EXECUTOR = self.pool
+        event.subscribe(executor='process')(cpu_handler)
+        event.subscribe(executor='process')(cpu_handler_copy)
+
+        with mock.patch('eeee.event._serialize', wraps=event_module._serialize) as serialize:
+            with Loop(event.publish_many([1, 2])) as loop:
+                result = loop.run_until_complete()
+
+        self.assertEqual(serialize.call_count, 2)
+        self.assertListEqual([[value for _, value in r] for r in result], [[2, 3], [4, 6]])
+
+    def test_not_picklable_handler(self):
+        event = Event('not picklable')
+
+        def local_handler(message, publisher, event):
+            pass
+
+        with self.assertRaises(exceptions.NotPicklableError):
+            event.subscribe(executor='process')(local_handler)
+
+
+class TestPublisherPattern(unittest.TestCase):
+    @staticmethod
+    def publish(event: Event, publisher: str):
+        with Loop(event.publish('message', publisher)) as loop:
+            return loop.run_until_complete()
+
+    def test_glob_publisher(self):
+        event = Event('glob publisher')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher=PublisherPattern('webhook:*'))
+        async def tenant_handler(message, publisher, event):
+            return publisher.name
+
+        self.assertIsInstance(event.pub_sub[0].publisher, PublisherPattern)
+        self.assertListEqual(self.publish(event, 'webhook:tenant-1'), ['webhook:tenant-1'])
+        self.assertListEqual(self.publish(event, 'webhook:tenant-2'), ['webhook:tenant-2'])
+        self.assertListEqual(self.publish(event, 'cron'), [])
+
+    def test_regex_publisher(self):
+        event = Event('regex publisher')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher=re.compile(r'webhook:tenant-\d+'))
+        async def numeric_tenant_handler(message, publisher, event):
+            return publisher.name
+
+        self.assertListEqual(self.publish(event, 'webhook:tenant-1'), ['webhook:tenant-1'])
+        self.assertListEqual(self.publish(event, 'webhook:tenant-x'), [])
+
+    def test_patterns_and_exact_publishers_in_order(self):
+        event = Event('mixed publishers')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher='webhook:tenant-1')
+        async def exact_handler(message, publisher, event):
+            return 'exact'
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher=PublisherPattern('webhook:*'))
+        async def glob_handler(message, publisher, event):
+            return 'glob'
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def all_handler(message, publisher, event):
+            return 'all'
+
+        self.assertListEqual(self.publish(event, 'webhook:tenant-1'), ['exact', 'glob', 'all'])
+        self.assertListEqual(self.publish(event, 'webhook:tenant-1'), ['exact', 'glob', 'all'])
+        self.assertEqual(event.plan_cache_info().misses, 1)
+
+    def test_unsubscribe_pattern(self):
+        event = Event('unsubscribe pattern')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher=PublisherPattern('webhook:*'))
+        async def glob_handler(message, publisher, event):
+            return 'glob'
+
+        event.unsubscribe(glob_handler, PublisherPattern('webhook:*'))
+
+        self.assertEqual(len(event.pub_sub), 0)
+        self.assertListEqual(self.publish(event, 'webhook:tenant-1'), [])
+
+    def test_names_are_not_patterns(self):
+        event = Event('exact names')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher='what?')
+        async def exact_handler(message, publisher, event):
+            return publisher.name
+
+        self.assertIsInstance(event.pub_sub[0].publisher, Publisher)
+        self.assertListEqual(self.publish(event, 'what?'), ['what?'])
+        self.assertListEqual(self.publish(event, 'whatX'), [])
+
+    def test_empty_publisher_name(self):
+        event = Event('empty name')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(publisher=PublisherPattern('*'))
+        async def any_handler(message, publisher, event):
+            return publisher.name
+
+        self.assertListEqual(self.publish(event, ''), [''])
+        with Loop(event.publish_many(['message'], '')) as loop:
+            self.assertListEqual(loop.run_until_complete(), [['']])
+
+    def test_pattern_equality(self):
+        self.assertEqual(PublisherPattern('a*'), PublisherPattern('a*'))
+        self.assertNotEqual(PublisherPattern('a*'), PublisherPattern(re.compile('a*')))
+        self.assertNotEqual(PublisherPattern('a*'), Publisher('a*'))
+
+    def test_raise_on_bad_pattern(self):
+        with self.assertRaises(exceptions.NamingError):
+            PublisherPattern(['a*'])
+
+
+class Sleeper:
+    def __init__(self, name: str, delay: float):
+        self.__name__ = name
+        self.delay = delay
+        self.cancelled = False
+
+    # noinspection PyUnusedLocal
+    async def __call__(self, message, publisher, event):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.__name__
+
+
+class TestTimeout(unittest.TestCase):
+    def test_subscriber_timeout(self):
+        event = Event('subscriber timeout')
+        event.RETURN_EXCEPTIONS = True
+        hung = Sleeper('hung', 10)
+        event.subscribe(timeout=0.01)(hung)
+        event.subscribe(timeout=1)(Sleeper('fast', 0))
+
+        with Loop(event.publish('hurry')) as loop:
+            result = loop.run_until_complete()
+
+        self.assertIsInstance(result[0], asyncio.TimeoutError)
+        self.assertEqual(result[1], 'fast')
+        self.assertTrue(hung.cancelled)
+
+    def test_subscriber_timeout_raises(self):
+        event = Event('subscriber timeout raise')
+        event.subscribe(timeout=0.01)(Sleeper('hung', 10))
+
+        with self.assertRaises(asyncio.TimeoutError):
+            with Loop(event.publish('hurry')) as loop:
+                loop.run_until_complete()
+
+    def test_publish_deadline(self):
+        event = Event('publish deadline')
+        event.RETURN_EXCEPTIONS = True
+        event.subscribe()(Sleeper('fast', 0))
+        event.subscribe()(Sleeper('slow', 10))
+
+        with Loop(event.publish('hurry', deadline=0.01)) as loop:
+            result = loop.run_until_complete()
+
+        self.assertEqual(result[0], 'fast')
+        self.assertIsInstance(result[1], asyncio.TimeoutError)
+
+    def test_publish_deadline_single_handler(self):
+        event = Event('publish deadline single')
+        event.subscribe()(Sleeper('slow', 10))
+
+        with self.assertRaises(asyncio.TimeoutError):
+            with Loop(event.publish('hurry', deadline=0.01)) as loop:
+                loop.run_until_complete()
+
+    def test_publish_many_deadline(self):
+        event = Event('publish many deadline')
+        event.RETURN_EXCEPTIONS = True
+        event.subscribe()(Sleeper('slow', 10))
+
+        with Loop(event.publish_many(['a', 'b'], deadline=0.01)) as loop:
+            result = loop.run_until_complete()
+
+        self.assertIsInstance(result[0][0], asyncio.TimeoutError)
+        self.assertIsInstance(result[1][0], asyncio.TimeoutError)
+
+    def test_raise_duration_error(self):
+        event = Event('wrong durations')
+
+        with self.assertRaises(exceptions.DurationError):
+            event.subscribe(timeout=0)(Sleeper('zero', 0))
+
+        with self.assertRaises(exceptions.DurationError):
+            with Loop(event.publish('never', deadline=-1)) as loop:
+                loop.run_until_complete()
+
+
+class TestPublishAsCompleted(unittest.TestCase):
+    @staticmethod
+    async def collect(results):
+        collected = []
+        async for pair in results:
+            collected.append(pair)
+        return collected
+
+    def test_results_in_order_of_completion(self):
+        event = Event('as completed')
+        event.subscribe()(Sleeper('slow', 0.02))
+        event.subscribe()(Sleeper('fast', 0))
+
+        with Loop(self.collect(event.publish_as_completed('race'))) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result, [('fast', 'fast'), ('slow', 'slow')])
+
+    def test_exceptions_are_returned(self):
+        event = Event('as completed failure')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise ValueError(message)
+
+        event.subscribe()(Sleeper('slow', 10))
+
+        with Loop(self.collect(event.publish_as_completed('boom', deadline=0.01))) as loop:
+            result = loop.run_until_complete()
+
+        self.assertEqual(result[0][0], 'failing_handler')
+        self.assertIsInstance(result[0][1], ValueError)
+        self.assertEqual(result[1][0], 'slow')
+        self.assertIsInstance(result[1][1], asyncio.TimeoutError)
+
+    def test_cancel_on_exit(self):
+        event = Event('as completed cancel')
+        slow = Sleeper('slow', 10)
+        event.subscribe()(Sleeper('fast', 0))
+        event.subscribe()(slow)
+
+        async def first():
+            async with event.publish_as_completed('first') as results:
+                async for name, _ in results:
+                    return name
+
+        with Loop(first()) as loop:
+            self.assertEqual(loop.run_until_complete(), 'fast')
+        self.assertTrue(slow.cancelled)
+
+    def test_empty_and_disabled(self):
+        event = Event('as completed empty')
+
+        with Loop(self.collect(event.publish_as_completed('void'))) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+        event.subscribe()(Sleeper('fast', 0))
+        event.disable()
+        with Loop(self.collect(event.publish_as_completed('void'))) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+
+class Answer(Sleeper):
+    def __init__(self, name: str, delay: float, value):
+        super().__init__(name, delay)
+        self.value = value
+
+    async def __call__(self, message, publisher, event):
+        await super().__call__(message, publisher, event)
+        return self.value
+
+
+class TestPublishStrategy(unittest.TestCase):
+    def test_first_skips_none_and_cancels_rest(self):
+        event = Event('first strategy')
+        slow = Answer('slow', 10, 'late')
+        event.subscribe()(Answer('none', 0, None))
+        event.subscribe()(Answer('answer', 0.01, 'early'))
+        event.subscribe()(slow)
+
+        with Loop(event.publish('who?', strategy='first')) as loop:
+            self.assertEqual(loop.run_until_complete(), 'early')
+        self.assertTrue(slow.cancelled)
+
+    def test_any(self):
+        event = Event('any strategy')
+        slow = Answer('slow', 10, False)
+        event.subscribe()(Answer('no', 0, False))
+        event.subscribe()(Answer('yes', 0.01, True))
+        event.subscribe()(slow)
+
+        with Loop(event.publish('anyone?', strategy='any')) as loop:
+            self.assertIs(loop.run_until_complete(), True)
+        self.assertTrue(slow.cancelled)
+
+    def test_all_vetoed(self):
+        event = Event('all strategy')
+        slow = Answer('slow', 10, True)
+        event.subscribe()(Answer('yes', 0, True))
+        event.subscribe()(Answer('veto', 0.01, False))
+        event.subscribe()(slow)
+
+        with Loop(event.publish('may I?', strategy='all')) as loop:
+            self.assertIs(loop.run_until_complete(), False)
+        self.assertTrue(slow.cancelled)
+
+    def test_initial_values_without_handlers(self):
+        event = Event('empty strategy')
+        for strategy, expected in (('first', None), ('any', False), ('all', True)):
+            with Loop(event.publish('void', strategy=strategy)) as loop:
+                self.assertIs(loop.run_until_complete(), expected)
+
+    def test_custom_reducer(self):
+        event = Event('custom strategy')
+        slow = Answer('slow', 10, 100)
+        event.subscribe()(Answer('one', 0, 60))
+        event.subscribe()(Answer('two', 0.01, 50))
+        event.subscribe()(slow)
+        budget = Reducer(lambda total, result: total + result, initial=0,
+                         until=lambda total: total >= 100)
+
+        with Loop(event.publish('estimate', strategy=budget)) as loop:
+            self.assertEqual(loop.run_until_complete(), 110)
+        self.assertTrue(slow.cancelled)
+
+    def test_exception_cancels_rest(self):
+        event = Event('strategy failure')
+        slow = Answer('slow', 10, True)
+        event.subscribe()(slow)
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise ValueError(message)
+
+        with Loop(event.publish('boom', strategy='all')) as loop:
+            self.assertRaises(ValueError, loop.run_until_complete)
+        self.assertTrue(slow.cancelled)
+
+        event.RETURN_EXCEPTIONS = True
+        with Loop(event.publish('boom', strategy='first', deadline=0.05)) as loop:
+            self.assertIsNone(loop.run_until_complete())
+
+    def test_returned_exceptions_are_not_answers(self):
+        event = Event('strategy exceptions')
+        event.RETURN_EXCEPTIONS = True
+        event.subscribe()(Answer('fine', 0.01, True))
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise RuntimeError(message)
+
+        for strategy, expected in (('first', True), ('any', True), ('all', False)):
+            with Loop(event.publish('vote', strategy=strategy)) as loop:
+                self.assertIs(loop.run_until_complete(), expected)
+
+        event.unsubscribe(Answer('fine', 0, True))
+        for strategy, expected in (('first', None), ('any', False), ('all', False)):
+            with Loop(event.publish('vote', strategy=strategy)) as loop:
+                self.assertIs(loop.run_until_complete(), expected)
+
+    def test_unknown_strategy(self):
+        event = Event('unknown strategy')
+
+        with Loop(event.publish('void', strategy='most')) as loop:
+            self.assertRaises(exceptions.PolicyError, loop.run_until_complete)
+        self.assertRaises(exceptions.NotCallableError, Reducer, 'sum')
+
+
+class TestCoalescing(unittest.TestCase):
+    def test_latest_message_per_publisher(self):
+        received = []
+        event = collecting_event('coalesced', received)
+        event.COALESCE = Coalescer(window=0.02)
+
+        async def scenario():
+            for index in range(100):
+                self.assertIsNone(await event.publish(index, 'first'))
+                if index < 50:
+                    await event.publish(index, 'second')
+            self.assertListEqual(received, [])
+            await asyncio.sleep(0.05)
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(received, [(99, 'first'), (49, 'second')])
+        self.assertEqual(event.coalesce_info(), (0, 148, 2, 0))
+
+    def test_merge_until_flush(self):
+        received = []
+        event = collecting_event('merged', received)
+        event.COALESCE = Coalescer(key=lambda message, publisher: message[0],
+                                   merge=lambda waiting, message: (waiting[0],
+                                                                   waiting[1] + message[1]))
+
+        async def scenario():
+            for index in range(10):
+                await event.publish(('odd' if index % 2 else 'even', index))
+            await asyncio.sleep(0.01)
+            self.assertEqual(event.coalesce_info().pending, 2)
+            return await event.flush()
+
+        with Loop(scenario()) as loop:
+            self.assertListEqual(loop.run_until_complete(), [[('even', 20)], [('odd', 25)]])
+
+        self.assertEqual(len(received), 2)
+        with Loop(event.flush()) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+    def test_disabled_event_drops_deliveries(self):
+        received = []
+        event = collecting_event('coalesced disabled', received)
+        event.COALESCE = Coalescer(window=0.02)
+
+        async def scenario():
+            await event.publish('timer')
+            event.disable()
+            await asyncio.sleep(0.05)
+            event.enable()
+            event.COALESCE = Coalescer()
+            await event.publish('flush')
+            event.disable()
+            return await event.flush()
+
+        with Loop(scenario()) as loop:
+            self.assertListEqual(loop.run_until_complete(), [None])
+
+        self.assertListEqual(received, [])
+        self.assertEqual(event.coalesce_info(), (0, 0, 0, 0))
+
+    def test_debounce(self):
+        received = []
+        event = collecting_event('debounced', received)
+        event.COALESCE = Coalescer(window=0.05, debounce=True)
+
+        async def scenario():
+            for index in range(3):
+                await event.publish(index)
+                await asyncio.sleep(0.03)
+            self.assertListEqual(received, [])
+            await asyncio.sleep(0.05)
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(received, [(2, None)])
+
+    def test_failures(self):
+        event = Event('coalesced failure')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise ValueError(message)
+
+        async def scenario():
+            event.COALESCE = Coalescer(window=0.01)
+            await event.publish('background')
+            await asyncio.sleep(0.03)
+            event.COALESCE = Coalescer()
+            await event.publish('flushed')
+            await event.flush()
+
+        with Loop(scenario()) as loop:
+            self.assertRaises(ValueError, loop.run_until_complete)
+        self.assertEqual(event.coalesce_info(), (0, 0, 2, 1))
+
+    def test_strategy_is_not_coalesced(self):
+        received = []
+        event = collecting_event('coalesced strategy', received)
+        event.COALESCE = Coalescer()
+
+        with Loop(event.publish('now', strategy='first')) as loop:
+            self.assertEqual(loop.run_until_complete(), 'now')
+        self.assertEqual(event.coalesce_info(), (0, 0, 0, 0))
+
+    def test_invalid_coalescer(self):
+        self.assertRaises(exceptions.DurationError, Coalescer, window=0)
+        self.assertRaises(exceptions.NotCallableError, Coalescer, key='publisher')
+        self.assertRaises(exceptions.NotCallableError, Coalescer, merge='sum')
+
+
+class TestRateLimit(unittest.TestCase):
+    def test_subscriber_drop(self):
+        received = []
+        rate_limit = RateLimit(1, burst=2, policy=RateLimit.DROP)
+        event = collecting_event('dropping subscriber', received, rate_limit=rate_limit)
+
+        with Loop(event.publish_many(range(5))) as loop:
+            self.assertListEqual(loop.run_until_complete(), [[0], [1], [None], [None], [None]])
+        self.assertListEqual(received, [(0, None), (1, None)])
+        self.assertEqual(rate_limit.stats()[1:], (0, 3))
+
+    def test_subscriber_delay(self):
+        received = []
+        rate_limit = RateLimit(100, burst=1)
+        event = collecting_event('delaying subscriber', received, rate_limit=rate_limit)
+
+        async def scenario():
+            start = asyncio.get_event_loop().time()
+            await event.publish_many(range(3))
+            return asyncio.get_event_loop().time() - start
+
+        with Loop(scenario()) as loop:
+            self.assertGreaterEqual(loop.run_until_complete(), 0.015)
+        self.assertListEqual(received, [(0, None), (1, None), (2, None)])
+        self.assertEqual((rate_limit.delayed, rate_limit.dropped), (2, 0))
+        self.assertLess(rate_limit.stats().tokens, 1)
+
+    def test_publisher_raise(self):
+        received = []
+        event = collecting_event('raising publisher', received)
+        rate_limit = event.limit_publisher('noisy', RateLimit(1, policy=RateLimit.RAISE))
+
+        async def scenario():
+            await event.publish('first', 'noisy')
+            with self.assertRaises(exceptions.RateLimitError):
+                await event.publish('second', 'noisy')
+            await event.publish('quiet', 'quiet')
+            await event.publish('broadcast')
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(received,
+                             [('first', 'noisy'), ('quiet', 'quiet'), ('broadcast', None)])
+        self.assertEqual(rate_limit.dropped, 1)
+
+    def test_publisher_as_completed(self):
+        received = []
+        event = collecting_event('raising as completed', received)
+        event.limit_publisher('noisy', RateLimit(1, policy=RateLimit.RAISE))
+        dropping = event.limit_publisher('quiet', RateLimit(1, burst=1, policy=RateLimit.DROP))
+
+        async def collect(message, publisher):
+            results = []
+            async for result in event.publish_as_completed(message, publisher):
+                results.append(result)
+            return results
+
+        async def scenario():
+            results = await collect('first', 'noisy')
+            with self.assertRaises(exceptions.RateLimitError):
+                await collect('second', 'noisy')
+            await event.publish('quiet', 'quiet')
+            return results, await collect('third', 'quiet')
+
+        with Loop(scenario()) as loop:
+            self.assertTupleEqual(loop.run_until_complete(), ([('collect', 'first')], []))
+
+        self.assertListEqual(received, [('first', 'noisy'), ('quiet', 'quiet')])
+        self.assertEqual(dropping.dropped, 1)
+
+    def test_publisher_drop_batch(self):
+        received = []
+        event = collecting_event('dropping publisher', received)
+        rate_limit = event.limit_publisher(None, RateLimit(10, burst=2, policy=RateLimit.DROP))
+
+        with Loop(event.publish_many(['first', 'second', 'third'])) as loop:
+            self.assertIsNone(loop.run_until_complete())
+        with Loop(event.publish('single', strategy='first')) as loop:
+            self.assertEqual(loop.run_until_complete(), 'single')
+        self.assertListEqual(received, [('single', None)])
+        self.assertEqual(rate_limit.dropped, 3)
+
+        self.assertIsNone(event.limit_publisher(None))
+        with Loop(event.publish_many(['first', 'second', 'third'])) as loop:
+            self.assertEqual(len(loop.run_until_complete()), 3)
+
+    def test_invalid_rate_limit(self):
+        self.assertRaises(exceptions.LimitError, RateLimit, 0)
+        self.assertRaises(exceptions.LimitError, RateLimit, '10')
+        self.assertRaises(exceptions.LimitError, RateLimit, 10, burst=0)
+        self.assertRaises(exceptions.PolicyError, RateLimit, 10, policy='wait')
+        self.assertEqual(RateLimit(0.5).burst, 1)
+
+
+class Connection:
+    def __init__(self, name: str):
+        self.name = name
+
+    # noinspection PyUnusedLocal
+    async def on_message(self, message, publisher, event):
+        return self.name
+
+
+class TestWeakSubscribe(unittest.TestCase):
+    def test_weak_does_not_keep_owner(self):
+        event = Event('weak owner')
+        connection = Connection('first')
+        event.subscribe(weak=True)(connection.on_message)
+        owner = weakref.ref(connection)
+
+        with Loop(event.publish('hello')) as loop:
+            self.assertListEqual(loop.run_until_complete(), ['first'])
+
+        del connection
+        gc.collect()
+
+        self.assertIsNone(owner())
+        self.assertTupleEqual(event.pub_sub, ())
+        with Loop(event.publish('hello')) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+    def test_prune_keeps_other_subscribers(self):
+        event = Event('weak prune')
+        first, second = Connection('first'), Connection('second')
+        event.subscribe('socket', weak=True)(first.on_message)
+        event.subscribe('socket', weak=True)(second.on_message)
+        event.subscribe('socket')(Connection('strong').on_message)
+
+        with Loop(event.publish('hello', 'socket')) as loop:
+            self.assertListEqual(loop.run_until_complete(), ['first', 'second', 'strong'])
+
+        del first
+        gc.collect()
+
+        with Loop(event.publish('hello', 'socket')) as loop:
+            self.assertListEqual(loop.run_until_complete(), ['second', 'strong'])
+
+    def test_weak_decorated_function(self):
+        event = Event('weak decorator')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe(weak=True)
+        async def handler(message, publisher, event):
+            return 'dead'
+
+        self.assertFalse(handler.active)
+        self.assertTupleEqual(event.pub_sub, ())
+        with Loop(event.publish('hello')) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+    def test_weak_process_handler(self):
+        with self.assertRaises(exceptions.ExecutorError):
+            Event('weak process').subscribe(executor='process', weak=True)(cpu_handler)
+
+    def test_strong_keeps_owner(self):
+        event = Event('strong owner')
+        connection = Connection('strong')
+        event.subscribe()(connection.on_message)
+        owner = weakref.ref(connection)
+
+        del connection
+        gc.collect()
+
+        self.assertIsNotNone(owner())
+
+
+class TestSubscription(unittest.TestCase):
+    def test_decorator_returns_subscription(self):
+        event = Event('handle')
+        subscription = event.subscribe('socket')(Sleeper('handle', 0))
+
+        self.assertIsInstance(subscription, Subscription)
+        self.assertIs(subscription.event, event)
+        self.assertEqual(subscription.publisher, 'socket')
+        self.assertTrue(subscription.active)
+        self.assertIs(event.pub_sub[0].subscriber, subscription)
+
+    def test_subscriptions_are_distinct(self):
+        handler = Sleeper('distinct', 0)
+        first, second = Event('first distinct'), Event('second distinct')
+        subscriptions = {first.subscribe()(handler), first.subscribe('socket')(handler),
+                         second.subscribe()(handler)}
+
+        self.assertEqual(len(subscriptions), 3)
+        for subscription in subscriptions:
+            self.assertEqual(subscription, Subscriber(handler))
+            self.assertEqual(Subscriber(handler), subscription)
+            self.assertEqual(subscription, 'distinct')
+            subscription.cancel()
+        self.assertTupleEqual(first.pub_sub + second.pub_sub, ())
+
+    def test_cancel_only_this_subscription(self):
+        event = Event('cancel one')
+        handler = Sleeper('twice', 0)
+        first = event.subscribe()(handler)
+        second = event.subscribe()(handler)
+        event.subscribe()(Sleeper('other', 0))
+
+        first.cancel()
+        first.cancel()
+
+        self.assertFalse(first.active)
+        self.assertTrue(second.active)
+        self.assertListEqual([ps.subscriber.name for ps in event.pub_sub], ['twice', 'other'])
+        with Loop(event.publish('hello')) as loop:
+            self.assertListEqual(loop.run_until_complete(), ['twice', 'other'])
+
+    def test_context_manager(self):
+        event = Event('scoped')
+
+        with event.subscribe('socket')(Sleeper('scoped', 0)) as subscription:
+            with Loop(event.publish('hello', 'socket')) as loop:
+                self.assertListEqual(loop.run_until_complete(), ['scoped'])
+
+        self.assertFalse(subscription.active)
+        self.assertTupleEqual(event.pub_sub, ())
+        with Loop(event.publish('hello', 'socket')) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+    def test_unsubscribe_removes_all_of_handler(self):
+        event = Event('unsubscribe all')
+        handler = Sleeper('twice', 0)
+        first = event.subscribe('socket')(handler)
+        second = event.subscribe('socket')(handler)
+        other = event.subscribe()(handler)
+
+        event.unsubscribe(handler, 'socket')
+
+        self.assertFalse(first.active or second.active)
+        self.assertTrue(other.active)
+
+    def test_subscribe_many(self):
+        event = Event('many')
+        handlers = [Sleeper('handler {}'.format(index), 0) for index in range(5)]
+
+        subscriptions = event.subscribe_many(handlers, 'socket', timeout=1)
+
+        self.assertListEqual([s.name for s in subscriptions], [h.__name__ for h in handlers])
+        self.assertTrue(all(s.timeout == 1 for s in subscriptions))
+        with Loop(event.publish('hello', 'socket')) as loop:
+            self.assertEqual(len(loop.run_until_complete()), 5)
+
+        event.unsubscribe_many(subscriptions[:2])
+        event.unsubscribe_many(handlers[2:4], 'socket')
+
+        self.assertListEqual([ps.subscriber for ps in event.pub_sub], subscriptions[4:])
+
+    def test_subscription_of_other_event(self):
+        event, other = Event('own'), Event('other')
+        handler = Sleeper('shared', 0)
+        event.subscribe()(handler)
+        foreign = other.subscribe()(handler)
+
+        event.unsubscribe_many([foreign])
+
+        self.assertTupleEqual(event.pub_sub, ())
+        self.assertTrue(foreign.active)
+
+    def test_raise_on_not_callable(self):
+        event = Event('not callable')
+
+        with self.assertRaises(exceptions.NotCallableError):
+            event.unsubscribe('handler')
@@ -51,3 +51,23 @@ class TestPublisher(unittest.TestCase):
         self.assertNotEqual(Publisher('None'), None)
         self.assertNotEqual(Publisher('123'), 123)
         self.assertNotEqual(Publisher('\'{"dict": true\'}'), {'dict': True})
+
+    def test_hashable(self):
+        self.assertEqual(hash(Publisher('hashed')), hash(Publisher('hashed')))
+        self.assertEqual(hash(Publisher('hashed')), hash('hashed'))
+        self.assertEqual(len({Publisher('hashed'), Publisher('hashed')}), 1)
+        self.assertEqual({Publisher('key'): 'value'}['key'], 'value')
+
+    def test_intern(self):
+        pub = Publisher.intern('interned')
+        self.assertIs(pub, Publisher.intern('interned'))
+        self.assertIs(pub, Publisher.intern(Publisher('interned')))
+        self.assertEqual(pub, Publisher('interned'))
+
+    def test_intern_raise_naming_error(self):
+        with self.assertRaises(exceptions.NamingError):
+            Publisher.intern(['wrong name'])
+
+    def test_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            Publisher('slots').__dict__
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import gc
 import unittest
 
 from cl import Loop
@@ -90,6 +91,13 @@ class TestSubscriberComparison(unittest.TestCase):
         self.assertEqual(Subscriber(simple_handler), Subscriber(simple_handler))
         self.assertEqual(Subscriber(simple_handler), 'simple_handler')
 
+    def test_hashable(self):
+        async def hashed_handler():
+            pass
+
+        self.assertEqual(hash(Subscriber(hashed_handler)), hash('hashed_handler'))
+        self.assertEqual(len({Subscriber(hashed_handler), Subscriber(hashed_handler)}), 1)
+
 
 class TestSubscriberExecute(unittest.TestCase):
     def test_call_function_handler(self):
@@ -116,3 +124,111 @@ class TestSubscriberExecute(unittest.TestCase):
         self.assertEqual(result[0], 'some message')
         self.assertIsNone(result[1])
         self.assertEqual(result[2], 'test')
+
+
+class TestSubscriberConcurrency(unittest.TestCase):
+    def test_no_limit_by_default(self):
+        async def free_handler():
+            pass
+
+        self.assertIsNone(Subscriber(free_handler).concurrency)
+
+    def test_limit_copied_from_subscriber(self):
+        async def limited_handler():
+            pass
+
+        sub = Subscriber(limited_handler, concurrency=3)
+        self.assertEqual(sub.concurrency, 3)
+        self.assertEqual(Subscriber(sub).concurrency, 3)
+
+    def test_raise_limit_error(self):
+        async def wrong_limit():
+            pass
+
+        with self.assertRaises(exceptions.LimitError):
+            Subscriber(wrong_limit, concurrency=-1)
+
+        with self.assertRaises(exceptions.EeeeValueError):
+            Subscriber(wrong_limit, concurrency='1')
+
+
+class TestSubscriberExecutor(unittest.TestCase):
+    def test_coroutine_runs_on_loop(self):
+        async def loop_handler():
+            pass
+
+        self.assertIsNone(Subscriber(loop_handler).executor)
+
+    def test_sync_handler_in_thread(self):
+        def blocking_handler(message, publisher, event):
+            return [message, publisher, event]
+
+        sub = Subscriber(blocking_handler, executor=Subscriber.THREAD)
+        self.assertEqual(sub.executor, 'thread')
+        self.assertEqual(Subscriber(sub).executor, 'thread')
+
+        with Loop(sub('some message', None, 'test')) as loop:
+            result = loop.run_until_complete()
+
+        self.assertListEqual(result, ['some message', None, 'test'])
+
+    def test_raise_executor_error(self):
+        async def loop_handler():
+            pass
+
+        with self.assertRaises(exceptions.ExecutorError):
+            Subscriber(loop_handler, executor=Subscriber.THREAD)
+
+    def test_raise_unknown_executor(self):
+        def blocking_handler():
+            pass
+
+        with self.assertRaises(exceptions.PolicyError):
+            Subscriber(blocking_handler, executor='fork')
+
+
+class TestSubscriberWeak(unittest.TestCase):
+    def test_strong_by_default(self):
+        async def handler():
+            pass
+
+        sub = Subscriber(handler)
+        self.assertFalse(sub.weak)
+
+    def test_weak_bound_method(self):
+        class Connection:
+            async def on_message(self, message, publisher, event):
+                return message
+
+        connection = Connection()
+        sub = Subscriber(connection.on_message, weak=True)
+        clone = Subscriber(sub)
+        self.assertTrue(sub.weak)
+        self.assertIs(clone.handler, sub.handler)
+        self.assertEqual(sub, 'on_message')
+
+        with Loop(sub('hello', None, 'event')) as loop:
+            self.assertEqual(loop.run_until_complete(), 'hello')
+
+        del connection
+        gc.collect()
+        with Loop(sub('hello', None, 'event')) as loop:
+            self.assertIsNone(loop.run_until_complete())
+
+    def test_weak_sync_handler(self):
+        def handler(message, publisher, event):
+            return message
+
+        sub = Subscriber(handler, executor=Subscriber.THREAD, weak=True)
+        with Loop(sub('sync', None, 'event')) as loop:
+            self.assertEqual(loop.run_until_complete(), 'sync')
+
+    def test_raise_not_weak_referable(self):
+        class Slotted:
+            __slots__ = ()
+
+            async def __call__(self, message, publisher, event):
+                pass
+
+        with self.assertRaises(exceptions.HandlerError):
+            Subscriber(Slotted(), weak=True)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from cl import Loop
+
+from eeee import Event
+from eeee.tracing import Hook, Span, current_span
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class Recorder(Hook):
+    def __init__(self):
+        self.started = []
+        self.finished = []
+
+    def before(self, span):
+        self.started.append(span)
+
+    def after(self, span):
+        self.finished.append(span)
+
+
+# noinspection PyShadowingNames,PyUnusedLocal
+def doubled(message, publisher, event):
+    return message * 2
+
+
+class TestTracing(unittest.TestCase):
+    def test_no_hooks(self):
+        event = Event('untraced')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def handler(message, publisher, event):
+            return current_span()
+
+        with Loop(event.publish('quiet')) as loop:
+            self.assertListEqual(loop.run_until_complete(), [None])
+        # noinspection PyProtectedMember
+        plan = event._plan()
+        self.assertTupleEqual(plan.hooks, ())
+        self.assertIs(plan[0], handler.handler)
+
+    def test_hooks_assigned_to_live_event(self):
+        recorder = Recorder()
+        event = Event('live hooks')
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def handler(message, publisher, event):
+            return message
+
+        with Loop(event.publish('untraced')) as loop:
+            loop.run_until_complete()
+        event.HOOKS = (recorder,)
+        with Loop(event.publish('traced')) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual([span.kind for span in recorder.started], [Span.PUBLISH, Span.CALL])
+        self.assertEqual(recorder.started[0].message, 'traced')
+
+    def test_publish_and_call_spans(self):
+        recorder = Recorder()
+        event = Event('traced')
+        event.HOOKS = (recorder,)
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def first_handler(message, publisher, event):
+            await asyncio.sleep(0.001)
+            return current_span()
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def second_handler(message, publisher, event):
+            return current_span()
+
+        with Loop(event.publish('hello', 'tester')) as loop:
+            first, second = loop.run_until_complete()
+
+        publish = recorder.started[0]
+        self.assertEqual((publish.kind, publish.event, publish.publisher, publish.message),
+                         (Span.PUBLISH, 'traced', 'tester', 'hello'))
+        self.assertIsNone(publish.parent_id)
+        self.assertEqual(first.subscriber, 'first_handler')
+        for span in (first, second):
+            self.assertEqual((span.kind, span.message), (Span.CALL, 'hello'))
+            self.assertEqual(span.parent_id, publish.span_id)
+            self.assertEqual(span.trace_id, publish.span_id)
+        self.assertIs(recorder.finished[-1], publish)
+        self.assertGreaterEqual(publish.duration, first.duration)
+        self.assertEqual(len(recorder.finished), 3)
+
+    def test_nested_publish_forms_tree(self):
+        recorder = Recorder()
+        inner, outer = Event('inner'), Event('outer')
+        inner.HOOKS = outer.HOOKS = (recorder,)
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @inner.subscribe()
+        async def inner_handler(message, publisher, event):
+            return current_span()
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @outer.subscribe()
+        async def outer_handler(message, publisher, event):
+            return current_span(), await inner.publish(message)
+
+        with Loop(outer.publish('chain')) as loop:
+            (outer_call, (inner_call,)), = loop.run_until_complete()
+
+        outer_publish, _, inner_publish, _ = recorder.started
+        self.assertEqual(outer_call.parent_id, outer_publish.span_id)
+        self.assertEqual(inner_publish.parent_id, outer_call.span_id)
+        self.assertEqual(inner_call.parent_id, inner_publish.span_id)
+        self.assertEqual({span.trace_id for span in recorder.finished}, {outer_publish.span_id})
+        self.assertIsNone(current_span())
+
+    def test_error_is_recorded(self):
+        recorder = Recorder()
+        event = Event('traced failure')
+        event.HOOKS = (recorder,)
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def failing_handler(message, publisher, event):
+            raise ValueError(message)
+
+        with Loop(event.publish('boom')) as loop:
+            self.assertRaises(ValueError, loop.run_until_complete)
+
+        call, publish = recorder.finished
+        self.assertIsInstance(call.error, ValueError)
+        self.assertIs(publish.error, call.error)
+        self.assertIsNotNone(publish.end)
+
+    def test_empty_plan_is_traced(self):
+        recorder = Recorder()
+        event = Event('traced empty')
+        event.HOOKS = (recorder,)
+
+        with Loop(event.publish('void')) as loop:
+            self.assertListEqual(loop.run_until_complete(), [])
+
+        publish, = recorder.finished
+        self.assertEqual(publish.kind, Span.PUBLISH)
+
+    def test_process_call_span_records_message(self):
+        recorder = Recorder()
+        event = Event('traced process')
+        event.HOOKS = (recorder,)
+        event.subscribe(executor='process')(doubled)
+        event.subscribe(executor='process')(doubled)
+
+        with Loop(event.publish(21)) as loop:
+            self.assertListEqual(loop.run_until_complete(), [42, 42])
+
+        calls = [span for span in recorder.finished if span.kind == Span.CALL]
+        self.assertListEqual([span.message for span in calls], [21, 21])
+
+    def test_strategy_and_batch_spans(self):
+        recorder = Recorder()
+        event = Event('traced policies')
+        event.HOOKS = (recorder,)
+
+        # noinspection PyShadowingNames,PyUnusedLocal
+        @event.subscribe()
+        async def handler(message, publisher, event):
+            return current_span()
+
+        async def scenario():
+            first = await event.publish('first', strategy='first')
+            batch = await event.publish_many(['one', 'two'], 'batcher')
+            return first, batch
+
+        with Loop(scenario()) as loop:
+            first, ((one,), (two,)) = loop.run_until_complete()
+
+        reduced, _, many, _, _ = recorder.started
+        self.assertEqual((reduced.kind, reduced.message, reduced.batch),
+                         (Span.PUBLISH, 'first', False))
+        self.assertEqual(first.parent_id, reduced.span_id)
+        self.assertEqual((many.kind, many.publisher, many.message, many.batch),
+                         (Span.PUBLISH, 'batcher', ['one', 'two'], True))
+        self.assertEqual({one.parent_id, two.parent_id}, {many.span_id})
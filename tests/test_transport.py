@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+from cl import Loop
+
+from eeee import Coalescer, exceptions
+from eeee.transport import (BrokerServer, LoopbackBroker, LoopbackTransport, Relay,
+                            StreamTransport, Transport)
+from tests.helpers import collecting_event, until
+
+__author__ = 'Paweł Zadrożny'
+__copyright__ = 'Copyright (c) 2018, Pawelzny'
+
+
+class RelayScenario:
+    """Two nodes relaying event of the same name through given transports."""
+
+    def __init__(self, first: Transport, second: Transport):
+        self.first_received, self.second_received = [], []
+        self.first = collecting_event('orders', self.first_received)
+        self.second = collecting_event('orders', self.second_received)
+        self.first_relay = Relay(first, [self.first])
+        self.second_relay = Relay(second, [self.second])
+
+    async def run(self, messages: int = 100):
+        await self.first_relay.start()
+        await self.second_relay.start()
+        await self.first_relay.transport.flush()
+        await self.second_relay.transport.flush()
+        await asyncio.sleep(0.01)
+        for index in range(messages):
+            await self.first.publish(index, 'first')
+        await until(lambda: len(self.second_received) == messages)
+        await self.second.publish('reply')
+        await until(lambda: len(self.first_received) == messages + 1)
+        await asyncio.sleep(0.02)
+        await self.first_relay.close()
+        await self.second_relay.close()
+
+
+class TestTransport(unittest.TestCase):
+    def test_interface(self):
+        class Incomplete(Transport):
+            def send(self, event, payload):
+                pass
+
+        with self.assertRaises(TypeError):
+            Transport()
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class RelayAssertions:
+    # noinspection PyUnresolvedReferences
+    def assert_relayed(self, scenario: RelayScenario, messages: int = 100):
+        self.assertListEqual(scenario.second_received,
+                             [(index, 'first') for index in range(messages)] + [('reply', None)])
+        self.assertListEqual(scenario.first_received,
+                             [(index, 'first') for index in range(messages)] + [('reply', None)])
+        self.assertEqual((scenario.first_relay.sent, scenario.first_relay.received),
+                         (messages, 1))
+        self.assertEqual((scenario.second_relay.sent, scenario.second_relay.received),
+                         (1, messages))
+        self.assertTupleEqual(scenario.first.HOOKS, ())
+
+
+class TestLoopbackTransport(RelayAssertions, unittest.TestCase):
+    def test_relay(self):
+        broker = LoopbackBroker()
+        scenario = RelayScenario(LoopbackTransport(broker), LoopbackTransport(broker))
+
+        with Loop(scenario.run()) as loop:
+            loop.run_until_complete()
+
+        self.assert_relayed(scenario)
+
+    def test_coalesced_relay_without_echo(self):
+        broker = LoopbackBroker()
+        scenario = RelayScenario(LoopbackTransport(broker), LoopbackTransport(broker))
+        scenario.first.COALESCE = Coalescer(window=0.01)
+        scenario.second.COALESCE = Coalescer(window=0.01)
+
+        async def run():
+            await scenario.first_relay.start()
+            await scenario.second_relay.start()
+            await scenario.first.publish('one', 'first')
+            await until(lambda: scenario.second_received)
+            await asyncio.sleep(0.1)
+            await scenario.first_relay.close()
+            await scenario.second_relay.close()
+
+        with Loop(run()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(scenario.first_received, [('one', 'first')])
+        self.assertListEqual(scenario.second_received, [('one', 'first')])
+        self.assertEqual((scenario.first_relay.sent, scenario.first_relay.received), (1, 0))
+        self.assertEqual((scenario.second_relay.sent, scenario.second_relay.received), (0, 1))
+
+    def test_relay_strategy_and_batch(self):
+        broker = LoopbackBroker()
+        scenario = RelayScenario(LoopbackTransport(broker), LoopbackTransport(broker))
+
+        async def run():
+            await scenario.first_relay.start()
+            await scenario.second_relay.start()
+            await scenario.first.publish('reduced', 'first', strategy='all')
+            await scenario.first.publish_many(['one', 'two'], 'first')
+            await until(lambda: len(scenario.second_received) == 3)
+            await scenario.first_relay.close()
+            await scenario.second_relay.close()
+
+        with Loop(run()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(scenario.second_received,
+                             [('reduced', 'first'), ('one', 'first'), ('two', 'first')])
+        self.assertEqual(scenario.first_relay.sent, 3)
+
+    def test_payload_is_not_copied(self):
+        broker = LoopbackBroker()
+        sender, receiver = LoopbackTransport(broker), LoopbackTransport(broker)
+        payload = [b'x' * 1024]
+        received = []
+
+        # noinspection PyUnusedLocal
+        async def receive(event, data):
+            received.append(data)
+
+        async def scenario():
+            receiver.subscribe('event', receive)
+            await receiver.start()
+            await sender.start()
+            sender.send('event', payload)
+            sender.send('other', payload)
+            await sender.flush()
+            await until(lambda: received)
+            await sender.close()
+            await receiver.close()
+
+        with Loop(scenario()) as loop:
+            loop.run_until_complete()
+
+        self.assertEqual(len(received), 1)
+        self.assertIs(received[0], payload)
+
+    def test_send_before_start(self):
+        with self.assertRaises(exceptions.TransportClosedError):
+            LoopbackTransport(LoopbackBroker()).send('event', [b'payload'])
+
+
+class TestStreamTransport(RelayAssertions, unittest.TestCase):
+    def test_tcp_relay_with_pool(self):
+        server = BrokerServer('127.0.0.1', 0)
+        scenarios = []
+
+        async def run():
+            await server.start()
+            scenario = RelayScenario(StreamTransport('127.0.0.1', server.port, pool_size=3),
+                                     StreamTransport('127.0.0.1', server.port, pool_size=2))
+            scenarios.append(scenario)
+            await scenario.run()
+            await server.close()
+
+        with Loop(run()) as loop:
+            loop.run_until_complete()
+
+        self.assert_relayed(scenarios[0])
+        self.assertFalse(server.is_running)
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix domain sockets are not supported')
+    def test_unix_relay(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'broker.sock')
+        server = BrokerServer(path=path)
+        scenario = RelayScenario(StreamTransport(path=path), StreamTransport(path=path))
+
+        async def run():
+            await server.start()
+            await scenario.run()
+            await server.close()
+
+        with Loop(run()) as loop:
+            loop.run_until_complete()
+
+        self.assert_relayed(scenario)
+
+    def test_pipelined_batch(self):
+        server = BrokerServer('127.0.0.1', 0)
+        received = []
+        writes = []
+
+        # noinspection PyUnusedLocal
+        async def receive(event, payload):
+            received.append(bytes(payload))
+
+        async def run():
+            await server.start()
+            receiver = StreamTransport('127.0.0.1', server.port)
+            receiver.subscribe('event', receive)
+            await receiver.start()
+            await receiver.flush()
+            sender = StreamTransport('127.0.0.1', server.port)
+            await sender.start()
+            # noinspection PyProtectedMember
+            writer = sender._channels[0].writer
+            writelines = writer.writelines
+            writer.writelines = lambda data: writes.append(data) or writelines(data)
+            for index in range(50):
+                sender.send('event', [str(index).encode()])
+            await asyncio.sleep(0)
+            await until(lambda: len(received) == 50)
+            await sender.close()
+            await receiver.close()
+            await server.close()
+
+        with Loop(run()) as loop:
+            loop.run_until_complete()
+
+        self.assertEqual(len(writes), 1)
+        self.assertListEqual(received, [str(index).encode() for index in range(50)])
+
+    def test_unsubscribe(self):
+        server = BrokerServer('127.0.0.1', 0)
+        received = []
+
+        # noinspection PyUnusedLocal
+        async def receive(event, payload):
+            received.append(bytes(payload))
+
+        async def run():
+            await server.start()
+            receiver = StreamTransport('127.0.0.1', server.port)
+            sender = StreamTransport('127.0.0.1', server.port)
+            receiver.subscribe('event', receive)
+            await receiver.start()
+            await sender.start()
+            await receiver.flush()
+            await asyncio.sleep(0.01)
+            sender.send('event', [b'first'])
+            await until(lambda: received)
+            receiver.unsubscribe('event')
+            await receiver.flush()
+            await asyncio.sleep(0.01)
+            sender.send('event', [b'second'])
+            await sender.flush()
+            await asyncio.sleep(0.02)
+            await sender.close()
+            await receiver.close()
+            await server.close()
+
+        with Loop(run()) as loop:
+            loop.run_until_complete()
+
+        self.assertListEqual(received, [b'first'])
+
+    def test_send_before_start(self):
+        with self.assertRaises(exceptions.TransportClosedError):
+            StreamTransport('127.0.0.1', 1).send('event', [b'payload'])
+
+    def test_pool_size(self):
+        with self.assertRaises(exceptions.LimitError):
+            StreamTransport('127.0.0.1', 1, pool_size=0)